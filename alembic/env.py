@@ -9,6 +9,7 @@ from alembic import context
 from dotenv import load_dotenv
 
 from server.backend.database import Base
+from server.backend.partitions import is_partition
 from server.models import user, seat, reservation, ticket
 load_dotenv()
 
@@ -26,12 +27,22 @@ config.set_main_option("sqlalchemy.url", database_url)
 target_metadata = Base.metadata
 
 
+def include_object(object, name, type_, reflected, compare_to):
+    # Месячные партиции reservations создаются приложением, а не миграциями
+    if type_ == "table":
+        return not is_partition(name)
+    if type_ == "index":
+        return not is_partition(object.table.name)
+    return True
+
+
 def run_migrations_offline():
     """Запуск миграций в оффлайн режиме (синхронно)."""
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -45,6 +56,7 @@ def do_run_migrations(connection):
     context.configure(
         connection=connection,
         target_metadata=target_metadata,
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -0,0 +1,36 @@
+"""Ticket queue indexes
+
+Revision ID: 3b7e91c0d4a2
+Revises: 451a2a832929
+Create Date: 2026-10-19 12:14:03.518207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7e91c0d4a2'
+down_revision: Union[str, None] = '451a2a832929'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_tickets_made_on_id', 'tickets', ['made_on', 'id'], unique=False)
+    op.create_index('ix_tickets_status_made_on_id', 'tickets', ['status', 'made_on', 'id'], unique=False)
+    op.create_index('ix_tickets_theme_made_on_id', 'tickets', ['theme', 'made_on', 'id'], unique=False)
+    op.create_index('ix_tickets_unanswered_made_on_id', 'tickets', ['made_on', 'id'], unique=False,
+                    postgresql_where=sa.text("status IS NULL OR status = 'active'"))
+    op.create_index('ix_tickets_answered_made_on_id', 'tickets', ['made_on', 'id'], unique=False,
+                    postgresql_where=sa.text("status IS NOT NULL AND status != 'active'"))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tickets_answered_made_on_id', table_name='tickets')
+    op.drop_index('ix_tickets_unanswered_made_on_id', table_name='tickets')
+    op.drop_index('ix_tickets_theme_made_on_id', table_name='tickets')
+    op.drop_index('ix_tickets_status_made_on_id', table_name='tickets')
+    op.drop_index('ix_tickets_made_on_id', table_name='tickets')
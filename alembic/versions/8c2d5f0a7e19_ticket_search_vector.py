@@ -0,0 +1,49 @@
+"""Ticket full-text search
+
+Revision ID: 8c2d5f0a7e19
+Revises: 3b7e91c0d4a2
+Create Date: 2026-10-19 14:02:41.270519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c2d5f0a7e19'
+down_revision: Union[str, None] = '3b7e91c0d4a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('tickets', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+    op.execute("""
+        CREATE OR REPLACE FUNCTION tickets_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector :=
+                setweight(to_tsvector('russian', coalesce(NEW.theme, '')), 'A') ||
+                setweight(to_tsvector('russian', coalesce(NEW.message, '')), 'B');
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER tickets_search_vector_update
+            BEFORE INSERT OR UPDATE OF theme, message ON tickets
+            FOR EACH ROW EXECUTE FUNCTION tickets_search_vector_update()
+    """)
+    # Заполняем существующие тикеты через тот же триггер
+    op.execute("UPDATE tickets SET theme = theme")
+    op.create_index('ix_tickets_search_vector', 'tickets', ['search_vector'], unique=False,
+                    postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tickets_search_vector', table_name='tickets', postgresql_using='gin')
+    op.execute("DROP TRIGGER IF EXISTS tickets_search_vector_update ON tickets")
+    op.execute("DROP FUNCTION IF EXISTS tickets_search_vector_update()")
+    op.drop_column('tickets', 'search_vector')
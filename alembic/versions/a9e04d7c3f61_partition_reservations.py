@@ -0,0 +1,105 @@
+"""Partition reservations by month
+
+Revision ID: a9e04d7c3f61
+Revises: f17a3c9e52b8
+Create Date: 2026-10-19 19:48:30.112674
+
+Переписывает всю таблицу reservations под эксклюзивной блокировкой: запускать в окно обслуживания.
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9e04d7c3f61'
+down_revision: Union[str, None] = 'f17a3c9e52b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PARTITIONS_AHEAD = 12
+# Поиск пересечений смотрит только брони, начавшиеся не раньше чем за столько дней до окна
+MAX_DURATION_DAYS = 31
+
+# (имя, колонки, условие частичного индекса)
+INDEXES = [
+    ('ix_reservations_seat_id_start_end', ['seat_id', 'start', 'end'], None),
+    ('ix_reservations_user_id_start', ['user_id', 'start'], None),
+    ('ix_reservations_user_id_end_not_closed', ['user_id', 'end'], "status <> 'closed'"),
+    ('ix_reservations_start', ['start'], None),
+    ('ix_reservations_end', ['end'], None),
+]
+PARTITIONED_INDEXES = INDEXES + [('ix_reservations_end_future', ['end'], "status = 'future'")]
+
+COLUMNS = 'id, user_id, seat_id, start, "end", status'
+
+
+def _month(value: date, months: int = 0) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _create_table(partitioned: bool) -> None:
+    op.execute(f"""
+        CREATE TABLE reservations (
+            id UUID NOT NULL,
+            user_id UUID NOT NULL CONSTRAINT reservations_user_id_fkey REFERENCES users (id),
+            seat_id UUID NOT NULL CONSTRAINT reservations_seat_id_fkey REFERENCES seats (id),
+            start TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            "end" TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            status VARCHAR NOT NULL,
+            PRIMARY KEY ({'id, start' if partitioned else 'id'})
+        ){' PARTITION BY RANGE (start)' if partitioned else ''}
+    """)
+
+
+def _rename_old_table(new_name: str, indexes: list) -> None:
+    op.execute(f"ALTER TABLE reservations RENAME TO {new_name}")
+    for name in [index[0] for index in indexes] + ['reservations_pkey', 'reservations_id_key']:
+        op.execute(f"ALTER INDEX IF EXISTS {name} RENAME TO {name.replace('reservations', new_name, 1)}")
+
+
+def _create_indexes(indexes: list) -> None:
+    for name, columns, where in indexes:
+        op.create_index(name, 'reservations', columns, unique=False,
+                        postgresql_where=sa.text(where) if where else None)
+
+
+def upgrade() -> None:
+    too_long = op.get_bind().execute(sa.text(
+        f"SELECT count(*) FROM reservations WHERE \"end\" - start > interval '{MAX_DURATION_DAYS} days'"
+    )).scalar()
+    if too_long:
+        raise RuntimeError(f"{too_long} reservations are longer than {MAX_DURATION_DAYS} days: "
+                           f"shorten or split them before partitioning")
+
+    _rename_old_table('reservations_unpartitioned', INDEXES)
+    _create_table(partitioned=True)
+    op.execute(f"ALTER TABLE reservations ADD CONSTRAINT ck_reservations_max_duration "
+               f"CHECK (\"end\" - start <= interval '{MAX_DURATION_DAYS} days')")
+
+    first, last = op.get_bind().execute(sa.text("SELECT min(start), max(start) FROM reservations_unpartitioned")).one()
+    today = date.today()
+    month = _month(min(first.date(), today) if first else today)
+    last = max(_month(last) if last else today, _month(today, PARTITIONS_AHEAD))
+    while month <= last:
+        op.execute(f"CREATE TABLE reservations_y{month.year:04d}m{month.month:02d} PARTITION OF reservations "
+                   f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_month(month, 1).isoformat()}')")
+        month = _month(month, 1)
+    op.execute("CREATE TABLE reservations_default PARTITION OF reservations DEFAULT")
+
+    op.execute(f"INSERT INTO reservations ({COLUMNS}) SELECT {COLUMNS} FROM reservations_unpartitioned")
+    op.execute("DROP TABLE reservations_unpartitioned")
+    _create_indexes(PARTITIONED_INDEXES)
+    op.execute("ANALYZE reservations")
+
+
+def downgrade() -> None:
+    _rename_old_table('reservations_partitioned', PARTITIONED_INDEXES)
+    _create_table(partitioned=False)
+    op.execute(f"INSERT INTO reservations ({COLUMNS}) SELECT {COLUMNS} FROM reservations_partitioned")
+    # Вместе с партициями
+    op.execute("DROP TABLE reservations_partitioned")
+    _create_indexes(INDEXES)
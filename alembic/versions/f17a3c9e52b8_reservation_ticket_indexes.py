@@ -0,0 +1,44 @@
+"""Reservation and ticket indexes
+
+Revision ID: f17a3c9e52b8
+Revises: d41f6b2e9a07
+Create Date: 2026-10-19 17:21:55.640392
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f17a3c9e52b8'
+down_revision: Union[str, None] = 'd41f6b2e9a07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (имя, таблица, колонки, условие частичного индекса)
+INDEXES = [
+    ('ix_reservations_seat_id_start_end', 'reservations', ['seat_id', 'start', 'end'], None),
+    ('ix_reservations_user_id_start', 'reservations', ['user_id', 'start'], None),
+    ('ix_reservations_user_id_end_not_closed', 'reservations', ['user_id', 'end'], "status <> 'closed'"),
+    ('ix_reservations_start', 'reservations', ['start'], None),
+    ('ix_reservations_end', 'reservations', ['end'], None),
+    ('ix_tickets_user_id_made_on', 'tickets', ['user_id', 'made_on'], None),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY не блокирует запись в таблицы, но не может выполняться внутри транзакции.
+    # Если построение прервалось, индекс остаётся INVALID: удалите его (downgrade) и повторите миграцию.
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(name, table, columns, unique=False, if_not_exists=True,
+                            postgresql_concurrently=True,
+                            postgresql_where=sa.text(where) if where else None)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,144 @@
+import random
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+# bcrypt("password123"): hashing per user would dominate the seeding time, so every user shares one hash
+PASSWORD_HASH = "$2b$12$BLJfrd4sI0JAqhWnrxfK8OoJ/T3IY/Pps4LfZWXJKoo85qc445TJ."
+
+SEAT_TYPES = ["desk", "desk", "desk", "meeting_room", "quiet_zone"]
+TICKET_THEMES = ["failure", "wish", "other"]
+TICKET_STATUSES = ["active", "closed", None]
+
+
+@dataclass(frozen=True)
+class DatasetSize:
+    name: str
+    seats: int
+    users: int
+    reservations: int
+    tickets: int
+
+
+SIZES = {
+    "tiny": DatasetSize("tiny", seats=50, users=500, reservations=10_000, tickets=500),
+    "small": DatasetSize("small", seats=500, users=5_000, reservations=200_000, tickets=5_000),
+    "medium": DatasetSize("medium", seats=2_000, users=20_000, reservations=800_000, tickets=20_000),
+    "large": DatasetSize("large", seats=5_000, users=50_000, reservations=2_000_000, tickets=50_000),
+}
+
+
+class SyntheticOffice:
+    """
+    Reproducible synthetic office: the same seed, size and anchor date always produce
+    the same rows, so results of different commits are measured on identical data.
+    Reservations are spread over HISTORY_DAYS before and FUTURE_DAYS after the anchor and
+    are generated in independent chunks, so that chunks can be loaded in parallel.
+    """
+
+    HISTORY_DAYS = 180
+    FUTURE_DAYS = 30
+    RESERVATION_CHUNK = 100_000
+
+    def __init__(self, size: DatasetSize, seed: int = 42, anchor: datetime | None = None,
+                 password_hash: str = PASSWORD_HASH):
+        self.size = size
+        self.seed = seed
+        self.password_hash = password_hash
+        self.anchor = (anchor or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+        self.rng = random.Random(f"{seed}:{size.name}")
+        self.admin_id = None
+        self.seat_ids = []
+        self.user_ids = []
+
+    def _uuid(self, rng: random.Random | None = None) -> uuid.UUID:
+        return uuid.UUID(int=(rng or self.rng).getrandbits(128), version=4)
+
+    def users(self):
+        self.admin_id = self._uuid()
+        self.user_ids = []
+        yield {
+            "id": self.admin_id,
+            "email": "bench_admin@example.com",
+            "login": "bench_admin@example.com",
+            "first_name": "Bench Admin",
+            "hashed_password": self.password_hash,
+            "role": "admin",
+            "verified": True,
+        }
+        for i in range(self.size.users):
+            user_id = self._uuid()
+            self.user_ids.append(user_id)
+            yield {
+                "id": user_id,
+                "email": f"bench_user_{i}@example.com",
+                "login": f"bench_user_{i}@example.com",
+                "first_name": f"User {i}",
+                "hashed_password": self.password_hash,
+                "role": "user",
+                "verified": self.rng.random() < 0.8,
+            }
+
+    def seats(self):
+        self.seat_ids = []
+        columns = max(1, int(self.size.seats ** 0.5))
+        for i in range(self.size.seats):
+            seat_id = self._uuid()
+            self.seat_ids.append(seat_id)
+            yield {
+                "id": seat_id,
+                "name": f"Место {i + 1}",
+                "type": self.rng.choice(SEAT_TYPES),
+                "x": float(i % columns) * 1.5,
+                "y": float(i // columns) * 1.5,
+                "has_computer": self.rng.random() < 0.5,
+                "has_water": self.rng.random() < 0.3,
+                "has_kitchen": self.rng.random() < 0.1,
+                "has_smart_desk": self.rng.random() < 0.2,
+                "is_quite": self.rng.random() < 0.3,
+                "is_talk_room": self.rng.random() < 0.05,
+            }
+
+    def reservation_chunks(self) -> int:
+        return -(-self.size.reservations // self.RESERVATION_CHUNK)
+
+    def reservations(self, chunk: int | None = None):
+        """Must be consumed after users() and seats(). Yields all chunks when `chunk` is None."""
+        chunks = range(self.reservation_chunks()) if chunk is None else [chunk]
+        for index in chunks:
+            rng = random.Random(f"{self.seed}:{self.size.name}:reservations:{index}")
+            count = min(self.RESERVATION_CHUNK, self.size.reservations - index * self.RESERVATION_CHUNK)
+            for _ in range(count):
+                day = self.anchor + timedelta(days=rng.randint(-self.HISTORY_DAYS, self.FUTURE_DAYS))
+                start = day + timedelta(hours=rng.randint(8, 17))
+                end = start + timedelta(hours=rng.randint(1, 4))
+                if end <= self.anchor:
+                    status = "closed" if rng.random() < 0.85 else "did_not_come"
+                elif start <= self.anchor:
+                    status = "active"
+                else:
+                    status = "future"
+                yield {
+                    "id": self._uuid(rng),
+                    "user_id": rng.choice(self.user_ids),
+                    "seat_id": rng.choice(self.seat_ids),
+                    "start": start,
+                    "end": end,
+                    "status": status,
+                }
+
+    def tickets(self):
+        """Must be consumed after users() and seats()."""
+        for i in range(self.size.tickets):
+            seat_index = self.rng.randrange(len(self.seat_ids))
+            yield {
+                "id": self._uuid(),
+                "user_id": self.rng.choice(self.user_ids),
+                "reservation_id": None,
+                "seat_id": self.seat_ids[seat_index],
+                "seat_name": f"Место {seat_index + 1}",
+                "theme": self.rng.choice(TICKET_THEMES),
+                "message": f"Синтетический тикет {i}",
+                "status": self.rng.choice(TICKET_STATUSES),
+                "made_on": self.anchor - timedelta(minutes=self.rng.randint(0, self.HISTORY_DAYS * 24 * 60)),
+            }
@@ -0,0 +1,131 @@
+import contextlib
+import os
+from contextlib import contextmanager
+from datetime import timedelta, timezone
+from typing import Awaitable, Callable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from benchmarks.dataset import SyntheticOffice
+from server.backend.partitions import PARTITIONED_TABLE, is_partition
+from server.repositories.reservation import ReservationRepository
+from server.repositories.seat import SeatRepository
+from server.repositories.ticket import TicketRepository
+from server.services.reservation import ReservationManager
+from server.services.seats_manager import SeatsManager
+
+# Таблицы, которые растут вместе с историей: полный проход по ним в горячем запросе - регрессия
+GROWING_TABLES = ("reservations", "tickets")
+# Запросы по окну времени должны читать только партиции reservations соседних месяцев
+PRUNED_QUERIES = {
+    "SeatsManager.is_available": 3,
+    "SeatRepository.get_all": 3,
+    "SeatRepository.list_with_availability": 3,
+}
+
+
+def hot_queries(office: SyntheticOffice) -> dict[str, Callable[[AsyncSession], Awaitable]]:
+    window_start = (office.anchor + timedelta(days=1, hours=9)).replace(tzinfo=timezone.utc)
+    window_end = window_start + timedelta(hours=9)
+    seat_id = office.seat_ids[0]
+    user_id = office.user_ids[0]
+
+    return {
+        "SeatsManager.is_available": lambda db: SeatsManager(db).is_available(seat_id, window_start, window_end),
+        "SeatRepository.get_all": lambda db: SeatRepository(db).get_all(window_start, window_end),
+        "SeatRepository.list_with_availability":
+            lambda db: SeatRepository(db).list_with_availability(window_start, window_end),
+        "ReservationManager.does_user_have_active_reservation":
+            lambda db: ReservationManager(db).does_user_have_active_reservation(user_id),
+        "ReservationManager.get_maximum_available_time":
+            lambda db: ReservationManager(db).get_maximum_available_time(user_id, window_start.replace(tzinfo=None)),
+        "ReservationRepository.get_reservations_by_user_id":
+            lambda db: ReservationRepository(db).get_reservations_by_user_id(user_id),
+        "ReservationRepository.list_with_seat_names":
+            lambda db: ReservationRepository(db).list_with_seat_names(user_id),
+        "TicketRepository.get_user_tickets": lambda db: TicketRepository(db).get_user_tickets(user_id),
+        "TicketRepository.get_tickets_page": lambda db: TicketRepository(db).get_tickets_page(50, status="active"),
+        "TicketRepository.get_unanswered_tickets": lambda db: TicketRepository(db).get_unanswered_tickets(50),
+    }
+
+
+@contextmanager
+def capture_statements(engine: AsyncEngine):
+    """Collects (statement, parameters) of every SELECT executed on `engine`"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+def _table(relation: str) -> str:
+    return PARTITIONED_TABLE if is_partition(relation) else relation
+
+
+def seq_scans(plan: dict, tables=GROWING_TABLES, empty: frozenset[str] = frozenset()) -> list[str]:
+    """
+    Tables of `tables` read with a Seq Scan anywhere in an EXPLAIN (FORMAT JSON) plan node.
+    A scanned partition is reported as its partition name; `empty` relations (future months) are skipped.
+    """
+    found = []
+    relation = plan.get("Relation Name", "")
+    if plan.get("Node Type") == "Seq Scan" and _table(relation) in tables and relation not in empty:
+        found.append(relation)
+    for child in plan.get("Plans", []):
+        found += seq_scans(child, tables, empty)
+    return found
+
+
+def partitions(plan: dict) -> set[str]:
+    """Partitions of reservations left in the plan after pruning"""
+    found = {plan["Relation Name"]} if is_partition(plan.get("Relation Name", "")) else set()
+    for child in plan.get("Plans", []):
+        found |= partitions(child)
+    return found
+
+
+async def explain_hot_queries(engine: AsyncEngine, office: SyntheticOffice) -> dict[str, list[dict]]:
+    """
+    Runs every hot query on the seeded office and EXPLAINs the statements it issued.
+    Returns {query name: [{"statement", "seq_scans", "partitions", "plan"}, ...]}.
+    """
+    session_factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    async with engine.begin() as connection:
+        await connection.exec_driver_sql("ANALYZE")
+        # Пустые партиции будущих месяцев планировщик честно читает полным проходом
+        result = await connection.exec_driver_sql("SELECT relname FROM pg_class WHERE relkind = 'r' AND relpages = 0")
+        empty = frozenset(result.scalars())
+
+    report = {}
+    for name, query in hot_queries(office).items():
+        with capture_statements(engine) as statements:
+            async with session_factory() as db:
+                # Repositories print debug output for every row
+                with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                    await query(db)
+
+        report[name] = []
+        async with engine.connect() as connection:
+            for statement, parameters in _unique(statements):
+                result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+                plan = result.scalar()[0]["Plan"]
+                report[name].append({"statement": statement, "seq_scans": seq_scans(plan, empty=empty),
+                                     "partitions": sorted(partitions(plan)), "plan": plan})
+    return report
+
+
+def _unique(statements: list[tuple]) -> list[tuple]:
+    seen, unique = set(), []
+    for statement, parameters in statements:
+        if statement not in seen:
+            seen.add(statement)
+            unique.append((statement, parameters))
+    return unique
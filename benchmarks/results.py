@@ -0,0 +1,80 @@
+import json
+import platform
+import statistics
+import subprocess
+from datetime import datetime
+
+
+def summarize(timings: list[float]) -> dict:
+    ordered = sorted(timings)
+    return {
+        "runs": len(ordered),
+        "min": ordered[0],
+        "median": statistics.median(ordered),
+        "mean": statistics.fmean(ordered),
+        "p95": ordered[min(len(ordered) - 1, round(0.95 * (len(ordered) - 1)))],
+        "max": ordered[-1],
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def metadata(seed: int) -> dict:
+    return {
+        "commit": git_commit(),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "seed": seed,
+    }
+
+
+def save(path: str, results: dict):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+def load(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.2, metric: str = "median") -> list[dict]:
+    """
+    Compares the chosen statistic of every case present in both result files.
+    A case is a regression when it became slower by more than `threshold` (0.2 = 20%).
+    """
+    rows = []
+    for size, size_results in current["sizes"].items():
+        baseline_cases = baseline.get("sizes", {}).get(size, {}).get("cases", {})
+        for case, stats in size_results["cases"].items():
+            if case not in baseline_cases:
+                continue
+            before = baseline_cases[case][metric]
+            after = stats[metric]
+            ratio = after / before if before else float("inf")
+            rows.append({
+                "size": size,
+                "case": case,
+                "before": before,
+                "after": after,
+                "ratio": ratio,
+                "regression": ratio > 1 + threshold,
+            })
+    return rows
+
+
+def format_comparison(rows: list[dict]) -> str:
+    lines = [f"{'size':<8} {'case':<48} {'before, ms':>12} {'after, ms':>12} {'ratio':>7}"]
+    for row in rows:
+        mark = "  REGRESSION" if row["regression"] else ""
+        lines.append(
+            f"{row['size']:<8} {row['case']:<48} {row['before'] * 1000:>12.2f} "
+            f"{row['after'] * 1000:>12.2f} {row['ratio']:>7.2f}{mark}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,138 @@
+import contextlib
+import os
+import time
+import tracemalloc
+from datetime import timedelta, timezone
+
+import httpx
+from fastapi import FastAPI
+
+from benchmarks.dataset import SyntheticOffice
+from benchmarks.results import summarize
+from benchmarks.seed import copy_seed
+from server.backend.database import AsyncSessionLocal, Base, engine
+from server.dependencies.auth_dependencies import get_current_user_from_cookie
+from server.repositories.reservation import ReservationRepository
+from server.repositories.seat import SeatRepository
+from server.routers.admin_panel import router as admin_panel_router
+from server.schemas.user import UserOut
+from server.services.seats_manager import SeatsManager
+
+
+async def seed(office: SyntheticOffice):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    await copy_seed(engine, office)
+
+
+def admin_client(office: SyntheticOffice) -> httpx.AsyncClient:
+    app = FastAPI()
+    app.include_router(admin_panel_router, prefix="/api")
+    admin = UserOut(id=office.admin_id, email="bench_admin@example.com", role="admin", verified=True)
+    app.dependency_overrides[get_current_user_from_cookie] = lambda: admin
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark")
+
+
+def build_cases(office: SyntheticOffice, client: httpx.AsyncClient) -> dict:
+    workday_start = (office.anchor + timedelta(days=1, hours=9)).replace(tzinfo=timezone.utc)
+    workday_end = workday_start + timedelta(hours=9)
+    seat_id = office.seat_ids[0]
+    user_id = office.user_ids[0]
+
+    async def seats_get_all():
+        async with AsyncSessionLocal() as db:
+            await SeatRepository(db).get_all(workday_start, workday_end)
+
+    async def seats_list_with_availability():
+        async with AsyncSessionLocal() as db:
+            await SeatRepository(db).list_with_availability(workday_start, workday_end)
+
+    async def seats_is_available():
+        async with AsyncSessionLocal() as db:
+            await SeatsManager(db).is_available(seat_id, workday_start, workday_end)
+
+    async def reservations_by_user():
+        async with AsyncSessionLocal() as db:
+            await ReservationRepository(db).get_reservations_by_user_id(user_id)
+
+    async def reservations_get_all():
+        async with AsyncSessionLocal() as db:
+            await ReservationRepository(db).get_all_reservations()
+
+    async def reservations_list_with_seat_names():
+        async with AsyncSessionLocal() as db:
+            await ReservationRepository(db).list_with_seat_names()
+
+    async def reservations_update_statuses():
+        async with AsyncSessionLocal() as db:
+            await ReservationRepository(db).update_statuses()
+
+    def route(path):
+        async def call():
+            response = await client.get(path)
+            response.raise_for_status()
+        return call
+
+    return {
+        "SeatRepository.get_all": seats_get_all,
+        "SeatRepository.list_with_availability": seats_list_with_availability,
+        "SeatsManager.is_available": seats_is_available,
+        "ReservationRepository.get_reservations_by_user_id": reservations_by_user,
+        "ReservationRepository.get_all_reservations": reservations_get_all,
+        "ReservationRepository.list_with_seat_names": reservations_list_with_seat_names,
+        "ReservationRepository.update_statuses": reservations_update_statuses,
+        "GET /api/admin/reservations": route("/api/admin/reservations"),
+        "GET /api/admin/tickets": route("/api/admin/tickets"),
+        "GET /api/admin/users": route("/api/admin/users"),
+    }
+
+
+async def measure(case, repeat: int, warmup: int = 1) -> dict:
+    for _ in range(warmup):
+        await case()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await case()
+        timings.append(time.perf_counter() - start)
+    summary = summarize(timings)
+
+    # Отдельный прогон: tracemalloc заметно замедляет выполнение
+    tracemalloc.start()
+    try:
+        await case()
+        summary["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return summary
+
+
+async def run_size(office: SyntheticOffice, repeat: int, cases: list[str] | None = None) -> dict:
+    seed_start = time.perf_counter()
+    await seed(office)
+    seed_time = time.perf_counter() - seed_start
+    print(f"[{office.size.name}] seeded in {seed_time:.1f}s")
+
+    results = {}
+    async with admin_client(office) as client:
+        for name, case in build_cases(office, client).items():
+            if cases and name not in cases:
+                continue
+            # Repositories print debug output for every row
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                results[name] = await measure(case, repeat)
+            print(f"[{office.size.name}] {name}: median {results[name]['median'] * 1000:.2f} ms, "
+                  f"peak {results[name]['peak_memory_bytes'] / 2 ** 20:.1f} MiB")
+
+    return {
+        "dataset": {
+            "seats": office.size.seats,
+            "users": office.size.users,
+            "reservations": office.size.reservations,
+            "tickets": office.size.tickets,
+            "anchor": office.anchor.isoformat(),
+        },
+        "seed_seconds": seed_time,
+        "cases": results,
+    }
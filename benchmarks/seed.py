@@ -0,0 +1,134 @@
+import asyncio
+import os
+import time
+from datetime import timedelta
+from concurrent.futures import ProcessPoolExecutor
+
+import asyncpg
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from benchmarks.dataset import SyntheticOffice
+from server.backend.partitions import ensure_partitions
+from server.models.reservation import Reservation
+from server.models.seat import Seat
+from server.models.ticket import Ticket
+from server.models.user import User
+
+TABLES = [User.__table__, Seat.__table__, Reservation.__table__, Ticket.__table__]
+
+_worker_office: SyntheticOffice | None = None
+
+
+async def copy_rows(connection, table, rows) -> int:
+    """
+    Streams rows into `table` with the binary COPY protocol of asyncpg.
+    Missing keys are written as NULL. tsvector columns are filled by triggers and have no binary encoder in asyncpg.
+    """
+    columns = [column.name for column in table.columns if not isinstance(column.type, TSVECTOR)]
+    count = 0
+
+    def records():
+        nonlocal count
+        for row in rows:
+            count += 1
+            yield tuple(row.get(column) for column in columns)
+
+    await connection.copy_records_to_table(table.name, records=records(), columns=columns)
+    return count
+
+
+async def drop_foreign_keys(connection, table) -> list[tuple[str, str]]:
+    """Drops FK constraints of `table` and returns them so they can be restored after the load."""
+    constraints = await connection.fetch(
+        "SELECT conname, pg_get_constraintdef(oid) AS definition FROM pg_constraint "
+        "WHERE conrelid = $1::regclass AND contype = 'f'",
+        table.name
+    )
+    for constraint in constraints:
+        await connection.execute(f'ALTER TABLE {table.name} DROP CONSTRAINT "{constraint["conname"]}"')
+    return [(constraint["conname"], constraint["definition"]) for constraint in constraints]
+
+
+async def restore_foreign_keys(connection, table, constraints: list[tuple[str, str]]):
+    for name, definition in constraints:
+        await connection.execute(f'ALTER TABLE {table.name} ADD CONSTRAINT "{name}" {definition}')
+
+
+def _init_worker(size, seed, anchor):
+    global _worker_office
+    # A fresh office with the same seed regenerates the user and seat ids of the parent process
+    _worker_office = SyntheticOffice(size, seed=seed, anchor=anchor)
+    for _ in _worker_office.users():
+        pass
+    for _ in _worker_office.seats():
+        pass
+
+
+def _copy_reservation_chunk(dsn: str, chunk: int) -> int:
+    async def copy():
+        connection = await asyncpg.connect(dsn)
+        try:
+            await connection.execute("SET synchronous_commit = off")
+            return await copy_rows(connection, Reservation.__table__, _worker_office.reservations(chunk))
+        finally:
+            await connection.close()
+
+    return asyncio.run(copy())
+
+
+async def copy_seed(engine: AsyncEngine, office: SyntheticOffice, truncate: bool = False,
+                    workers: int | None = None) -> dict:
+    """
+    Loads users, seats, reservations and tickets of the synthetic office with COPY.
+    Reservation chunks are generated and copied by `workers` processes over their own
+    connections. Foreign keys are dropped for the load and re-created afterwards:
+    one validating scan is much cheaper than a per-row RI trigger. Returns {table: (rows, seconds)}.
+    """
+    workers = workers or os.cpu_count() or 1
+    dsn = engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+    timings = {}
+
+    async with engine.begin() as conn:
+        connection = (await conn.get_raw_connection()).driver_connection
+        await connection.execute("SET LOCAL synchronous_commit = off")
+        if truncate:
+            await connection.execute(f"TRUNCATE {', '.join(table.name for table in TABLES)} CASCADE")
+        foreign_keys = {table.name: await drop_foreign_keys(connection, table) for table in TABLES}
+        for table, rows in [(User.__table__, office.users()), (Seat.__table__, office.seats())]:
+            start = time.perf_counter()
+            timings[table.name] = (await copy_rows(connection, table, rows), time.perf_counter() - start)
+
+    async with engine.begin() as conn:
+        # reservations партиционирована по месяцам start: история офиса уходит дальше, чем создает приложение
+        await ensure_partitions(conn, office.anchor - timedelta(days=office.HISTORY_DAYS),
+                                office.anchor + timedelta(days=office.FUTURE_DAYS))
+
+    try:
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(office.size, office.seed, office.anchor)) as pool:
+            counts = await asyncio.gather(*(
+                loop.run_in_executor(pool, _copy_reservation_chunk, dsn, chunk)
+                for chunk in range(office.reservation_chunks())
+            ))
+        timings[Reservation.__tablename__] = (sum(counts), time.perf_counter() - start)
+
+        async with engine.begin() as conn:
+            connection = (await conn.get_raw_connection()).driver_connection
+            start = time.perf_counter()
+            timings[Ticket.__tablename__] = (
+                await copy_rows(connection, Ticket.__table__, office.tickets()),
+                time.perf_counter() - start
+            )
+    finally:
+        async with engine.begin() as conn:
+            connection = (await conn.get_raw_connection()).driver_connection
+            start = time.perf_counter()
+            for table in TABLES:
+                # Without statistics the validation query of ADD CONSTRAINT may pick a nested loop
+                await connection.execute(f"ANALYZE {table.name}")
+            for table in TABLES:
+                await restore_foreign_keys(connection, table, foreign_keys[table.name])
+            timings["foreign keys"] = (0, time.perf_counter() - start)
+    return timings
@@ -0,0 +1,77 @@
+import asyncio
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from benchmarks.results import summarize
+from server.schemas.reservation import ReservationOut
+from server.schemas.ticket import TicketBase
+from server.schemas.user import UserOut
+from server.utils.responses import FastJSONResponse, ModelListResponse
+
+
+def _uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def build_items(model, count: int, seed: int = 42) -> list[dict]:
+    """Rows in the shape the repositories' lean read path returns"""
+    rng = random.Random(f"{seed}:{model.__name__}")
+    anchor = datetime(2025, 3, 1, 9, 0)
+    items = []
+    for i in range(count):
+        if model is ReservationOut:
+            start = anchor + timedelta(hours=rng.randrange(24 * 60))
+            items.append({"id": _uuid(rng), "user_id": _uuid(rng), "seat_id": _uuid(rng), "start": start,
+                          "end": start + timedelta(hours=rng.randint(1, 9)),
+                          "status": rng.choice(["future", "active", "closed", "did_not_come"]),
+                          "seat_name": f"A-{i % 500}"})
+        elif model is UserOut:
+            items.append({"id": _uuid(rng), "email": f"user{i}@example.com", "first_name": f"User {i}",
+                          "role": "user", "verified": rng.random() < 0.5})
+        else:
+            items.append({"id": _uuid(rng), "user_id": _uuid(rng), "reservation_id": _uuid(rng),
+                          "seat_id": _uuid(rng), "theme": rng.choice(["failure", "wish", "other"]),
+                          "message": "Не работает розетка у места " * 3, "status": "active",
+                          "made_on": anchor + timedelta(minutes=i), "seat_name": f"A-{i % 500}"})
+    return items
+
+
+def build_cases(model, items: list[dict]) -> dict:
+    field = create_model_field(name="Response", type_=list[model], mode="serialization")
+
+    def response_model(response_class):
+        # То, что делает FastAPI для эндпоинта с response_model
+        def call():
+            content = asyncio.run(serialize_response(field=field, response_content=items, is_coroutine=True))
+            return response_class(content).body
+        return call
+
+    return {
+        f"{model.__name__} jsonable_encoder": lambda: JSONResponse(jsonable_encoder(items)).body,
+        f"{model.__name__} response_model + JSONResponse": response_model(JSONResponse),
+        f"{model.__name__} response_model + FastJSONResponse": response_model(FastJSONResponse),
+        f"{model.__name__} ModelListResponse": lambda: ModelListResponse(model, items).body,
+    }
+
+
+def run_serialization(count: int = 10_000, repeat: int = 5, seed: int = 42) -> dict:
+    results = {}
+    for model in (ReservationOut, UserOut, TicketBase):
+        items = build_items(model, count, seed)
+        for name, case in build_cases(model, items).items():
+            case()
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                case()
+                timings.append(time.perf_counter() - start)
+            results[name] = summarize(timings)
+            print(f"[{count}] {name}: median {results[name]['median'] * 1000:.2f} ms")
+    return {"dataset": {"items": count}, "cases": results}
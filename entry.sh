@@ -8,7 +8,11 @@ done
 
 alembic upgrade head
 
+export PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR:-/tmp/prometheus_multiproc}"
+mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+
 exec gunicorn server.__main__:app \
+  --config gunicorn.conf.py \
   --worker-class uvicorn.workers.UvicornWorker \
   --bind "0.0.0.0:${PORT}" \
   --access-logfile -
@@ -0,0 +1,22 @@
+import os
+import shutil
+
+from prometheus_client import multiprocess
+
+# Адреса прокси, которым верим X-Forwarded-For: по нему uvicorn подставляет адрес клиента, а лимиты по IP
+# считают его. Без своего прокси в списке все клиенты за ним делят один лимит
+forwarded_allow_ips = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+
+
+def on_starting(server):
+    """Очищает каталог метрик от файлов предыдущего запуска."""
+    path = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    """Удаляет live-gauge файлы завершившегося воркера."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,58 @@
+"""
+Нагрузочный тест API: виртуальные пользователи логинятся, смотрят места, бронируют,
+проверяют активную бронь, иногда создают тикет и отменяют бронь.
+
+    # закрытая модель: 50 пользователей в цикле с паузой ~1 с
+    python -m loadtest --users 50 --duration 60 --html report.html
+    # открытая модель: 20 сценариев в секунду независимо от скорости ответа
+    python -m loadtest --arrival-rate 20 --max-in-flight 200 --duration 60 --json report.json
+"""
+import argparse
+import asyncio
+
+from loadtest.report import format_table, save_html, save_json
+from loadtest.runner import run
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m loadtest")
+    parser.add_argument("--base-url", default="http://localhost:8080/api")
+    parser.add_argument("--users", type=int, default=10, help="virtual users (closed model)")
+    parser.add_argument("--duration", type=float, default=30, help="seconds")
+    parser.add_argument("--ramp-up", type=float, default=0, help="seconds to start all users")
+    parser.add_argument("--think-time", type=float, default=1.0, help="mean pause between iterations")
+    parser.add_argument("--arrival-rate", type=float, default=0,
+                        help="iterations per second; enables the open model")
+    parser.add_argument("--max-in-flight", type=int, default=100, help="open model concurrency cap")
+    parser.add_argument("--connections", type=int, default=100, help="HTTP connection pool size")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--insecure", action="store_true", help="do not verify TLS certificates")
+    parser.add_argument("--json", dest="json_path")
+    parser.add_argument("--html", dest="html_path")
+    args = parser.parse_args()
+
+    config = {
+        "base_url": args.base_url,
+        "users": args.users,
+        "duration": args.duration,
+        "ramp_up": args.ramp_up,
+        "think_time": args.think_time,
+        "arrival_rate": args.arrival_rate,
+        "max_in_flight": args.max_in_flight,
+        "connections": args.connections,
+        "timeout": args.timeout,
+        "seed": args.seed,
+        "verify_ssl": not args.insecure,
+    }
+    report = asyncio.run(run(config))
+
+    print(format_table(report))
+    if args.json_path:
+        save_json(report, args.json_path)
+    if args.html_path:
+        save_html(report, args.html_path)
+
+
+if __name__ == "__main__":
+    main()
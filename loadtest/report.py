@@ -0,0 +1,64 @@
+import html
+import json
+
+
+def save_json(report: dict, path: str):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+def format_table(report: dict) -> str:
+    lines = [f"{'endpoint':<28} {'reqs':>7} {'rps':>8} {'fail':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"]
+    rows = list(report["endpoints"].items()) + [("TOTAL", report["total"])]
+    for name, stats in rows:
+        latency = stats["latency_ms"]
+        lines.append(
+            f"{name:<28} {stats['requests']:>7} {stats['throughput_rps']:>8.1f} {stats['failures']:>6} "
+            f"{latency['p50']:>9.1f} {latency['p95']:>9.1f} {latency['p99']:>9.1f}"
+        )
+    return "\n".join(lines)
+
+
+def save_html(report: dict, path: str):
+    config = report["config"]
+    rows = []
+    for name, stats in list(report["endpoints"].items()) + [("TOTAL", report["total"])]:
+        latency = stats["latency_ms"]
+        statuses = ", ".join(f"{status}: {count}" for status, count in stats["statuses"].items())
+        rows.append(
+            "<tr>"
+            f"<td>{html.escape(name)}</td><td>{stats['requests']}</td><td>{stats['throughput_rps']:.1f}</td>"
+            f"<td>{stats['failures']}</td><td>{latency['p50']:.1f}</td><td>{latency['p95']:.1f}</td>"
+            f"<td>{latency['p99']:.1f}</td><td>{latency['max']:.1f}</td><td>{html.escape(statuses)}</td>"
+            "</tr>"
+        )
+    settings = "".join(
+        f"<li>{html.escape(str(key))}: {html.escape(str(value))}</li>" for key, value in config.items()
+    )
+    document = f"""<!DOCTYPE html>
+<html lang="ru">
+<head>
+<meta charset="utf-8">
+<title>Нагрузочный тест</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em; }}
+table {{ border-collapse: collapse; }}
+th, td {{ border: 1px solid #ccc; padding: 4px 10px; text-align: right; }}
+td:first-child, td:last-child {{ text-align: left; }}
+</style>
+</head>
+<body>
+<h1>Нагрузочный тест</h1>
+<p>Длительность: {report['duration_s']:.1f} с, итераций сценария: {report['iterations']},
+отброшено прибытий: {report.get('dropped_arrivals', 0)}</p>
+<ul>{settings}</ul>
+<table>
+<tr><th>Эндпоинт</th><th>Запросов</th><th>RPS</th><th>Ошибок</th><th>p50, мс</th><th>p95, мс</th>
+<th>p99, мс</th><th>max, мс</th><th>Статусы</th></tr>
+{''.join(rows)}
+</table>
+</body>
+</html>
+"""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(document)
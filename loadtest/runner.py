@@ -0,0 +1,106 @@
+import asyncio
+import random
+import time
+
+import httpx
+
+from loadtest.scenario import VirtualUser
+from loadtest.stats import LoadStats
+
+
+async def prepare_users(client: httpx.AsyncClient, stats: LoadStats, count: int, seed: int,
+                        concurrency: int = 20) -> list[VirtualUser]:
+    """Registers (or logs in) the pool of accounts before the measured phase."""
+    semaphore = asyncio.Semaphore(concurrency)
+    users = [VirtualUser(i, client, stats, random.Random(seed + i)) for i in range(count)]
+
+    async def login(user):
+        async with semaphore:
+            return await user.login()
+
+    results = await asyncio.gather(*(login(user) for user in users))
+    return [user for user, ok in zip(users, results) if ok]
+
+
+async def run_closed(users: list[VirtualUser], stats: LoadStats, duration: float,
+                     think_time: float, ramp_up: float):
+    """Closed model: every virtual user loops `iteration -> think time` until the deadline."""
+    deadline = time.perf_counter() + duration
+
+    async def loop(user, delay):
+        await asyncio.sleep(delay)
+        while time.perf_counter() < deadline:
+            await user.run_iteration()
+            stats.iterations += 1
+            if think_time:
+                await asyncio.sleep(user.rng.expovariate(1 / think_time))
+
+    step = ramp_up / len(users) if users else 0
+    await asyncio.gather(*(loop(user, i * step) for i, user in enumerate(users)))
+
+
+async def run_open(users: list[VirtualUser], stats: LoadStats, duration: float,
+                   arrival_rate: float, max_in_flight: int, seed: int):
+    """
+    Open model: iterations arrive as a Poisson process with `arrival_rate` per second,
+    independent of how fast the server answers. Arrivals beyond `max_in_flight`
+    concurrent iterations are dropped and counted, so an overloaded server shows up
+    in the report instead of silently lowering the offered load.
+    """
+    rng = random.Random(seed)
+    idle = asyncio.Queue()
+    for user in users:
+        idle.put_nowait(user)
+    in_flight = set()
+    dropped = 0
+
+    async def iteration(user):
+        try:
+            await user.run_iteration()
+            stats.iterations += 1
+        finally:
+            idle.put_nowait(user)
+
+    deadline = time.perf_counter() + duration
+    next_arrival = time.perf_counter()
+    while next_arrival < deadline:
+        await asyncio.sleep(max(0.0, next_arrival - time.perf_counter()))
+        next_arrival += rng.expovariate(arrival_rate)
+        if len(in_flight) >= max_in_flight or idle.empty():
+            dropped += 1
+            continue
+        task = asyncio.create_task(iteration(idle.get_nowait()))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+
+    if in_flight:
+        await asyncio.gather(*in_flight)
+    return dropped
+
+
+async def run(config: dict) -> dict:
+    limits = httpx.Limits(max_connections=config["connections"], max_keepalive_connections=config["connections"])
+    async with httpx.AsyncClient(base_url=config["base_url"], limits=limits,
+                                 timeout=config["timeout"], verify=config["verify_ssl"]) as client:
+        setup_stats = LoadStats()
+        pool_size = config["users"] if not config["arrival_rate"] else max(config["users"], config["max_in_flight"])
+        users = await prepare_users(client, setup_stats, pool_size, config["seed"])
+        if not users:
+            raise RuntimeError("Не удалось авторизовать ни одного пользователя")
+
+        stats = LoadStats()
+        for user in users:
+            user.stats = stats
+        stats.start()
+        dropped = 0
+        if config["arrival_rate"]:
+            dropped = await run_open(users, stats, config["duration"], config["arrival_rate"],
+                                     config["max_in_flight"], config["seed"])
+        else:
+            await run_closed(users, stats, config["duration"], config["think_time"], config["ramp_up"])
+        stats.finish()
+
+    report = stats.report({**config, "model": "open" if config["arrival_rate"] else "closed",
+                           "virtual_users": len(users)})
+    report["dropped_arrivals"] = dropped
+    return report
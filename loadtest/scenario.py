@@ -0,0 +1,88 @@
+import random
+import time
+from datetime import datetime, timedelta
+
+import httpx
+
+from loadtest.stats import LoadStats
+
+PASSWORD = "loadpass1234"
+TICKET_THEMES = ["failure", "wish", "other"]
+
+
+class VirtualUser:
+    """
+    One office worker. All users share a single pooled httpx.AsyncClient and are
+    authenticated with a Bearer token instead of per-user cookie jars.
+    """
+
+    def __init__(self, index: int, client: httpx.AsyncClient, stats: LoadStats, rng: random.Random):
+        self.email = f"load_user_{index}@example.com"
+        self.client = client
+        self.stats = stats
+        self.rng = rng
+        self.user_id = None
+        self.headers = {}
+
+    async def request(self, method: str, endpoint: str, url: str, **kwargs) -> httpx.Response | None:
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, headers=self.headers, **kwargs)
+        except httpx.HTTPError as e:
+            self.stats.record_error(endpoint, e)
+            return None
+        self.stats.record(endpoint, time.perf_counter() - start, response.status_code)
+        return response
+
+    async def login(self) -> bool:
+        credentials = {"email": self.email, "password": PASSWORD}
+        response = await self.request("POST", "POST /auth/login", "/auth/login", json=credentials)
+        if response is None or response.status_code != 200:
+            response = await self.request(
+                "POST", "POST /auth/register", "/auth/register",
+                json={**credentials, "first_name": "Load User", "role": "user"}
+            )
+        if response is None or response.status_code != 200:
+            return False
+        body = response.json()
+        self.user_id = body["user"]["id"]
+        self.headers = {"Authorization": f"Bearer {body['access_token']}"}
+        return True
+
+    def _window(self) -> tuple[datetime, datetime]:
+        day = datetime.now() + timedelta(days=self.rng.randint(1, 60))
+        start = day.replace(hour=self.rng.randint(8, 15), minute=0, second=0, microsecond=0)
+        return start, start + timedelta(hours=self.rng.randint(1, 3))
+
+    async def run_iteration(self):
+        """Browse seats, book a free one, check the active reservation, maybe file a ticket, cancel."""
+        start, end = self._window()
+        params = {"start": start.isoformat(), "end": end.isoformat()}
+        seats = await self.request("GET", "GET /seat", "/seat", params=params)
+        if seats is None or seats.status_code != 200:
+            return
+
+        free = [seat for seat in seats.json() if seat.get("is_available")]
+        if not free:
+            return
+        seat = self.rng.choice(free)
+
+        booking = await self.request("POST", "POST /reservations", "/reservations", json={
+            "user_id": self.user_id,
+            "seat_id": seat["id"],
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+        })
+
+        await self.request("GET", "GET /reservations/active", "/reservations/active")
+
+        if self.rng.random() < 0.1:
+            await self.request("POST", "POST /ticket", "/ticket", json={
+                "theme": self.rng.choice(TICKET_THEMES),
+                "message": "Нагрузочный тест",
+            })
+
+        if booking is not None and booking.status_code == 201:
+            reservation_id = booking.json()["id"]
+            await self.request("PATCH", "PATCH /reservations/{id}", f"/reservations/{reservation_id}",
+                               json={"status": "closed"})
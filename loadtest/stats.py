@@ -0,0 +1,84 @@
+import math
+import time
+from collections import Counter, defaultdict
+
+
+def percentile(ordered: list[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, math.ceil(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class EndpointStats:
+    def __init__(self):
+        self.latencies = []
+        self.statuses = Counter()
+        self.errors = Counter()
+
+    def summary(self, duration: float) -> dict:
+        ordered = sorted(self.latencies)
+        count = len(ordered)
+        failures = sum(self.errors.values()) + sum(n for status, n in self.statuses.items() if status >= 500)
+        return {
+            "requests": count + sum(self.errors.values()),
+            "throughput_rps": count / duration if duration else 0.0,
+            "failures": failures,
+            "statuses": {str(status): n for status, n in sorted(self.statuses.items())},
+            "errors": dict(self.errors),
+            "latency_ms": {
+                "min": ordered[0] * 1000 if ordered else 0.0,
+                "mean": sum(ordered) / count * 1000 if ordered else 0.0,
+                "p50": percentile(ordered, 50) * 1000,
+                "p95": percentile(ordered, 95) * 1000,
+                "p99": percentile(ordered, 99) * 1000,
+                "max": ordered[-1] * 1000 if ordered else 0.0,
+            },
+        }
+
+
+class LoadStats:
+    """Latencies and status codes grouped by endpoint template (e.g. "PATCH /reservations/{id}")."""
+
+    def __init__(self):
+        self.endpoints = defaultdict(EndpointStats)
+        self.iterations = 0
+        self.started_at = None
+        self.finished_at = None
+
+    def start(self):
+        self.started_at = time.perf_counter()
+
+    def finish(self):
+        self.finished_at = time.perf_counter()
+
+    @property
+    def duration(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+    def record(self, endpoint: str, latency: float, status: int):
+        stats = self.endpoints[endpoint]
+        stats.latencies.append(latency)
+        stats.statuses[status] += 1
+
+    def record_error(self, endpoint: str, error: Exception):
+        self.endpoints[endpoint].errors[type(error).__name__] += 1
+
+    def report(self, config: dict) -> dict:
+        duration = self.duration
+        endpoints = {name: stats.summary(duration) for name, stats in sorted(self.endpoints.items())}
+        total = EndpointStats()
+        for stats in self.endpoints.values():
+            total.latencies.extend(stats.latencies)
+            total.statuses.update(stats.statuses)
+            total.errors.update(stats.errors)
+        return {
+            "config": config,
+            "duration_s": duration,
+            "iterations": self.iterations,
+            "total": total.summary(duration),
+            "endpoints": endpoints,
+        }
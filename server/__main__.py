@@ -1,3 +1,11 @@
+import asyncio
+from contextlib import asynccontextmanager
+from functools import partial
+
+from botocore.exceptions import BotoCoreError, ClientError
+from redis.exceptions import RedisError
+from sqlalchemy.exc import SQLAlchemyError
+
 from fastapi import APIRouter
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
@@ -15,12 +23,62 @@ from server.routers.telegram_connect import router as telegram_router
 from server.routers.metrics import router as metrics_router
 from server.routers.avatar import router as avatar_router
 from server.routers.stats import router as stats_router
+from server.routers.profiler import router as profiler_router
+from server.routers.health import router as health_router
+from server.middleware.metrics import PrometheusMiddleware
+from server.utils.responses import FastJSONResponse
+from server.utils.pagination import NEXT_CURSOR_HEADER
+from server.middleware.query_stats import QueryStatsMiddleware
+from server.middleware.read_your_writes import ReadYourWritesMiddleware
+from server.middleware.rate_limit import RateLimitMiddleware
+from server.backend.database import engine, replica_router
+from server.backend.partitions import run_partition_maintenance
+from server.backend.rate_limit import RATE_LIMIT_ENABLED
+from server.backend.startup import check_database, check_redis, wait_ready
+from server.services.health import HealthChecker, check_bucket
+from server.services.image_storage import ImageStorage
+from server.services.telegram import check_telegram_service
+from server.services.seat_availability import SEAT_AVAILABILITY_CACHE_TTL
+from server.services.reservation_archive import ARCHIVE_AFTER, ReservationArchive, run_reservation_archival
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Хранилища без обращений к S3: клиент создается при первом запросе, бакеты проверяются в фоне
+    app.state.image_storage = ImageStorage()
+    app.state.reservation_archive = ReservationArchive()
+    app.state.health = HealthChecker({
+        "database": partial(check_database, engine),
+        "redis": check_redis,
+        "s3": partial(check_bucket, app.state.image_storage),
+        "telegram": check_telegram_service,
+    })
+    tasks = [
+        asyncio.create_task(wait_ready("database", lambda: check_database(engine), (SQLAlchemyError, OSError))),
+        asyncio.create_task(wait_ready("redis", check_redis, (RedisError, OSError, ValueError))),
+    ]
+    for storage in (app.state.image_storage, app.state.reservation_archive):
+        tasks.append(asyncio.create_task(wait_ready(
+            f"s3:{storage.bucket_name}", partial(asyncio.to_thread, storage.ensure_bucket), (BotoCoreError, ClientError)
+        )))
+    # Партиции reservations на месяцы вперед, проверка раз в сутки
+    tasks.append(asyncio.create_task(run_partition_maintenance(engine)))
+    # Завершенные брони старше RESERVATION_ARCHIVE_AFTER_DAYS уезжают в S3
+    if ARCHIVE_AFTER:
+        tasks.append(asyncio.create_task(run_reservation_archival(engine, app.state.reservation_archive)))
+    yield
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
 
 app = FastAPI(
     title="Final PROD",
     version="0.0.1",
     docs_url="/api/docs",
-    openapi_url="/api/openapi.json"
+    openapi_url="/api/openapi.json",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan
 )
 
 origins = [
@@ -28,13 +86,22 @@ origins = [
     "https://prod-team-17-61ojpp1i.final.prodcontest.ru"
 ]
 
+# Добавлен раньше CORS, чтобы ответы 429 тоже получали CORS-заголовки
+if RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
+# Метка о недавней записи уводит чтения клиента с реплик и мимо общего кеша доступности мест
+if replica_router is not None or SEAT_AVAILABILITY_CACHE_TTL:
+    app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(PrometheusMiddleware)
 
 
 @app.get("/")
@@ -79,6 +146,8 @@ api_router.include_router(telegram_router)
 api_router.include_router(metrics_router)
 api_router.include_router(avatar_router)
 api_router.include_router(stats_router)
+api_router.include_router(profiler_router)
+api_router.include_router(health_router)
 
 app.include_router(api_router)
 
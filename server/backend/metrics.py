@@ -1,12 +1,95 @@
-from prometheus_client import Counter, Gauge
+import os
+
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, multiprocess
+
+# Переменная приходит и из .env: pytest, alembic и бенчмарки запускаются без entry.sh, который создает каталог
+if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+    os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
 
 user_registrations_total = Counter('user_registrations_total', 'Total number of user registrations')
 user_logins_total = Counter('user_logins_total', 'Total number of user logins')
 
-active_users = Gauge('active_users', 'Number of active users')
-session_duration_seconds = Gauge('session_duration_seconds', 'Duration of user sessions in seconds')
+active_users = Gauge('active_users', 'Number of active users', multiprocess_mode='livemostrecent')
+session_duration_seconds = Gauge('session_duration_seconds', 'Duration of user sessions in seconds',
+                                 multiprocess_mode='livemostrecent')
 
 api_errors_total = Counter('api_errors_total', 'Total number of API errors', ['endpoint'])
 
 bookings_total = Counter('bookings_total', 'Total number of bookings')
-average_booking_time_seconds = Gauge('average_booking_time_seconds', 'Average booking time in seconds')
\ No newline at end of file
+average_booking_time_seconds = Gauge('average_booking_time_seconds', 'Average booking time in seconds',
+                                     multiprocess_mode='livemostrecent')
+
+http_request_duration_seconds = Histogram(
+    'http_request_duration_seconds',
+    'HTTP request latency in seconds',
+    ['method', 'route', 'status'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+)
+http_requests_in_progress = Gauge(
+    'http_requests_in_progress',
+    'Number of HTTP requests being processed',
+    ['method', 'route'],
+    multiprocess_mode='livesum'
+)
+http_response_size_bytes = Histogram(
+    'http_response_size_bytes',
+    'HTTP response body size in bytes',
+    ['method', 'route', 'status'],
+    buckets=(100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+)
+
+db_queries_per_request = Histogram(
+    'db_queries_per_request',
+    'Number of SQL statements executed per HTTP request',
+    ['method', 'route'],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+)
+db_time_per_request_seconds = Histogram(
+    'db_time_per_request_seconds',
+    'Total time spent in SQL statements per HTTP request',
+    ['method', 'route'],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+
+# pool - primary или replica1, replica2... в порядке READ_REPLICA_URLS
+db_pool_checkout_wait_seconds = Histogram(
+    'db_pool_checkout_wait_seconds',
+    'Time spent waiting for a free connection in the SQLAlchemy pool',
+    ['pool'],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0)
+)
+db_pool_checkout_timeouts_total = Counter('db_pool_checkout_timeouts_total',
+                                          'Pool checkouts that failed with a timeout', ['pool'])
+db_pool_connections_in_use = Gauge('db_pool_connections_in_use', 'Connections checked out from the pool',
+                                   ['pool'], multiprocess_mode='livesum')
+db_pool_capacity = Gauge('db_pool_capacity', 'Maximum connections of the pool (size + overflow)',
+                         ['pool'], multiprocess_mode='livesum')
+
+startup_dependency_seconds = Gauge('startup_dependency_seconds',
+                                   'Seconds from worker start until a dependency first answered',
+                                   ['dependency'], multiprocess_mode='liveall')
+
+seat_availability_requests_total = Counter('seat_availability_requests_total',
+                                          'Seat availability lookups by where the rows came from',
+                                          ['source'])
+
+rate_limited_requests_total = Counter('rate_limited_requests_total',
+                                      'Requests rejected with 429 by the rate limiter',
+                                      ['method', 'route', 'source'])
+rate_limit_redis_calls_total = Counter('rate_limit_redis_calls_total',
+                                       'Rate limiter round trips to Redis', ['result'])
+
+
+def build_registry():
+    """
+    Returns the registry exported by /metrics. Under gunicorn with
+    PROMETHEUS_MULTIPROC_DIR set, values of all workers are aggregated from the shared directory.
+    """
+    if not os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+metrics_registry = build_registry()
@@ -0,0 +1,148 @@
+import asyncio
+import logging
+import os
+import re
+from datetime import date, datetime
+from typing import NamedTuple
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# reservations разбита по месяцам на start: reservations_y2025m03 хранит брони, начинающиеся в марте 2025
+PARTITIONED_TABLE = "reservations"
+# На сколько месяцев вперед держать готовые партиции: бронь на месяц без партиции не вставится
+PARTITIONS_AHEAD = int(os.getenv("RESERVATION_PARTITIONS_AHEAD", "12"))
+PARTITION_CHECK_INTERVAL = float(os.getenv("RESERVATION_PARTITION_CHECK_INTERVAL", str(24 * 60 * 60)))
+
+# Брони вне месячных партиций (дальше PARTITIONS_AHEAD или в уже снятом месяце) попадают сюда, а не в ошибку вставки
+DEFAULT_PARTITION = f"{PARTITIONED_TABLE}_default"
+
+_PARTITION_NAME = re.compile(rf"^{PARTITIONED_TABLE}_y(\d{{4}})m(\d{{2}})$")
+
+
+class Partition(NamedTuple):
+    name: str
+    month: date
+
+
+def month_start(value: date | datetime, months: int = 0) -> date:
+    """First day of the month `months` months after the month of `value`"""
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARTITIONED_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def is_partition(table_name: str) -> bool:
+    return _PARTITION_NAME.match(table_name) is not None
+
+
+def create_partition_sql(month: date) -> str:
+    return (f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF {PARTITIONED_TABLE} "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{month_start(month, 1).isoformat()}')")
+
+
+def create_default_partition_sql() -> str:
+    return f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {PARTITIONED_TABLE} DEFAULT"
+
+
+def months_between(start: date | datetime, end: date | datetime) -> list[date]:
+    months, month, last = [], month_start(start), month_start(end)
+    while month <= last:
+        months.append(month)
+        month = month_start(month, 1)
+    return months
+
+
+async def list_partitions(connection: AsyncConnection) -> list[Partition]:
+    """Monthly partitions currently attached to the reservations table, oldest first"""
+    result = await connection.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE parent.relname = :table"
+    ), {"table": PARTITIONED_TABLE})
+    partitions = []
+    for name in result.scalars():
+        match = _PARTITION_NAME.match(name)
+        if match:
+            partitions.append(Partition(name, date(int(match[1]), int(match[2]), 1)))
+    return sorted(partitions, key=lambda partition: partition.month)
+
+
+async def create_partition(connection: AsyncConnection, month: date) -> str:
+    """
+    Creates the partition of `month` and moves the month's reservations into it from the default partition:
+    Postgres refuses to add a range for which the default partition already holds rows.
+    """
+    name, bounds = partition_name(month), {"start": month, "end": month_start(month, 1)}
+    await connection.execute(text(
+        f"CREATE TABLE {name} (LIKE {PARTITIONED_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    ))
+    await connection.execute(text(
+        f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE start >= :start AND start < :end RETURNING *) "
+        f"INSERT INTO {name} SELECT * FROM moved"
+    ), bounds)
+    # Индексы и внешние ключи партиция получает от reservations при подключении
+    await connection.execute(text(
+        f"ALTER TABLE {PARTITIONED_TABLE} ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{month_start(month, 1).isoformat()}')"
+    ))
+    return name
+
+
+async def ensure_partitions(connection: AsyncConnection, start: date | datetime, end: date | datetime) -> list[str]:
+    """Creates the missing monthly partitions for every month from `start` to `end` inclusive"""
+    # Несколько воркеров приложения проверяют партиции одновременно
+    await connection.execute(text("SELECT pg_advisory_xact_lock(hashtext(:table))"), {"table": PARTITIONED_TABLE})
+    existing = {partition.month for partition in await list_partitions(connection)}
+    created = []
+    for month in months_between(start, end):
+        if month not in existing:
+            created.append(await create_partition(connection, month))
+    return created
+
+
+async def detach_partition(connection: AsyncConnection, month: date) -> str:
+    """
+    Detaches the partition of `month` into a standalone table: a catalog update, no rows are read or moved.
+    The table can then be archived and dropped without touching reservations.
+    """
+    name = partition_name(month_start(month))
+    await connection.execute(text(f"ALTER TABLE {PARTITIONED_TABLE} DETACH PARTITION {name}"))
+    return name
+
+
+async def drop_partitions_before(connection: AsyncConnection, month: date) -> list[str]:
+    """Drops whole months of reservations older than `month`, each one is a DROP TABLE"""
+    dropped = []
+    for partition in await list_partitions(connection):
+        if partition.month < month_start(month):
+            await connection.execute(text(f"DROP TABLE {partition.name}"))
+            dropped.append(partition.name)
+    return dropped
+
+
+async def maintain_partitions(engine: AsyncEngine, ahead: int = PARTITIONS_AHEAD) -> list[str]:
+    """Keeps partitions from the current month up to `ahead` months in advance"""
+    today = date.today()
+    async with engine.begin() as connection:
+        created = await ensure_partitions(connection, today, month_start(today, ahead))
+    if created:
+        logger.info("Created reservation partitions: %s", ", ".join(created))
+    return created
+
+
+async def run_partition_maintenance(engine: AsyncEngine, interval: float = PARTITION_CHECK_INTERVAL):
+    """Background task: `maintain_partitions` every `interval` seconds"""
+    while True:
+        try:
+            await maintain_partitions(engine)
+        except (SQLAlchemyError, OSError) as e:
+            logger.warning("Reservation partition maintenance failed: %s", e)
+        await asyncio.sleep(interval)
@@ -0,0 +1,102 @@
+import logging
+import os
+import time
+from uuid import uuid4
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from server.backend.metrics import (db_pool_checkout_timeouts_total, db_pool_checkout_wait_seconds,
+                                    db_pool_connections_in_use, db_pool_capacity)
+
+logger = logging.getLogger(__name__)
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that measures how long a request waited for a free connection.
+    Metrics are labelled with the pool's logging name (`engine_options(name)`), which survives `recreate`.
+    """
+
+    @property
+    def metrics_label(self) -> str:
+        return self.logging_name or "primary"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            db_pool_checkout_timeouts_total.labels(self.metrics_label).inc()
+            logger.warning("DB pool %s exhausted: no connection after %.1fs (size=%d, overflow=%d)",
+                           self.metrics_label, time.perf_counter() - start, self.size(), self._max_overflow)
+            raise
+        db_pool_checkout_wait_seconds.labels(self.metrics_label).observe(time.perf_counter() - start)
+        return connection
+
+
+def engine_options(name: str = "primary") -> dict:
+    """
+    Keyword arguments for `create_async_engine` of the database `name` (label of its pool metrics),
+    read from the environment:
+
+        DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING,
+        DB_STATEMENT_CACHE_SIZE - asyncpg prepared statement cache per connection,
+        DB_PGBOUNCER - PgBouncer in transaction mode: server-side prepared statements are not reused.
+    """
+    statement_cache_size = _env_int("DB_STATEMENT_CACHE_SIZE", 100)
+    connect_args = {
+        "statement_cache_size": statement_cache_size,
+        "prepared_statement_cache_size": statement_cache_size,
+    }
+    if _env_bool("DB_PGBOUNCER", False):
+        # Соединение с сервером меняется между транзакциями, поэтому кэш выключен,
+        # а имена подготовленных выражений уникальны
+        connect_args = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+
+    return {
+        "echo": False,
+        "poolclass": InstrumentedQueuePool,
+        "pool_logging_name": name,
+        "pool_size": _env_int("DB_POOL_SIZE", 5),
+        "max_overflow": _env_int("DB_MAX_OVERFLOW", 10),
+        "pool_timeout": _env_int("DB_POOL_TIMEOUT", 30),
+        "pool_recycle": _env_int("DB_POOL_RECYCLE", 1800),
+        "pool_pre_ping": _env_bool("DB_POOL_PRE_PING", True),
+        "connect_args": connect_args,
+    }
+
+
+def install_pool_metrics(engine: AsyncEngine):
+    """Exports pool usage of this worker: connections in use and total capacity, labelled like the pool."""
+    pool = engine.sync_engine.pool
+    label = pool.logging_name or "primary"
+    in_use = db_pool_connections_in_use.labels(label)
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        db_pool_capacity.labels(label).set(pool.size() + pool._max_overflow)
+
+    @event.listens_for(pool, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        in_use.inc()
+
+    @event.listens_for(pool, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        in_use.dec()
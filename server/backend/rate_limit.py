@@ -0,0 +1,184 @@
+import logging
+import os
+import time
+from typing import NamedTuple
+
+from redis.exceptions import RedisError
+
+from server.backend.metrics import rate_limit_redis_calls_total
+from server.backend.redis import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_REDIS_DB = int(os.getenv("RATE_LIMIT_REDIS_DB", "2"))
+# Доля лимита, которую воркер забирает из Redis за один раз и тратит локально
+RATE_LIMIT_LOCAL_SHARE = float(os.getenv("RATE_LIMIT_LOCAL_SHARE", "0.1"))
+RATE_LIMIT_LEASE_SECONDS = float(os.getenv("RATE_LIMIT_LEASE_SECONDS", "1"))
+# Пока Redis недоступен, лимитер пропускает запросы и не ходит в него столько секунд
+RATE_LIMIT_REDIS_BACKOFF = float(os.getenv("RATE_LIMIT_REDIS_BACKOFF", "5"))
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "10000"))
+RATE_LIMIT_KEY_PREFIX = "rate_limit:"
+
+# "<METHOD> <route template>=<limit>/<seconds>/<ip|user>", через запятую; RATE_LIMITS переопределяет отдельные маршруты
+DEFAULT_RATE_LIMITS = (
+    "POST /api/auth/login=10/60/ip,"
+    "POST /api/auth/register=5/60/ip,"
+    "POST /api/avatar/upload=10/60/user,"
+    "GET /api/seat=60/60/user"
+)
+
+# Token bucket: емкость `capacity`, пополнение `rate` токенов в секунду.
+# Выдает до ARGV[3] токенов сразу (аренда для локального счетчика воркера) и время до следующего токена;
+# ARGV[4] - неистраченный остаток прошлой аренды, он возвращается в бакет.
+# Время берется у Redis, чтобы часы воркеров не влияли на лимит.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local returned = tonumber(ARGV[4])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate + returned)
+local granted = math.min(requested, math.floor(tokens))
+tokens = tokens - granted
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate * 1000) + 1000)
+local retry_after = 0
+if granted == 0 then
+    retry_after = (1 - tokens) / rate
+end
+return {granted, tostring(retry_after)}
+"""
+
+
+class RateLimit(NamedTuple):
+    limit: int
+    period: float
+    key: str = "user"
+
+    @property
+    def rate(self) -> float:
+        return self.limit / self.period
+
+
+class Decision(NamedTuple):
+    allowed: bool
+    retry_after: float = 0.0
+    # local | redis | fail_open
+    source: str = "local"
+
+
+def parse_rate_limits(spec: str) -> dict[tuple[str, str], RateLimit]:
+    """{(method, route template): RateLimit} from "POST /api/auth/login=10/60/ip,..."; a zero limit disables the route"""
+    limits = {}
+    for entry in filter(None, (entry.strip() for entry in spec.split(","))):
+        try:
+            route, value = entry.rsplit("=", 1)
+            method, path = route.split()
+            limit, period, *key = value.split("/")
+            rate_limit = RateLimit(int(limit), float(period), *key)
+        except (ValueError, TypeError):
+            raise ValueError(f"Invalid rate limit {entry!r}, expected '<METHOD> <route>=<limit>/<seconds>[/ip|user]'")
+        if rate_limit.key not in ("ip", "user") or rate_limit.period <= 0:
+            raise ValueError(f"Invalid rate limit {entry!r}")
+        limits[(method.upper(), path)] = rate_limit
+    return {route: rate_limit for route, rate_limit in limits.items() if rate_limit.limit > 0}
+
+
+RATE_LIMITS = {**parse_rate_limits(DEFAULT_RATE_LIMITS), **parse_rate_limits(os.getenv("RATE_LIMITS", ""))}
+
+
+class _LocalBucket:
+    __slots__ = ("tokens", "expires", "blocked_until")
+
+    def __init__(self):
+        self.tokens = 0
+        self.expires = 0.0
+        self.blocked_until = 0.0
+
+
+class RateLimiter:
+    """
+    Token bucket shared by all workers through a Lua script in Redis.
+    A worker leases `local_share` of the limit in one round trip and spends it locally for `lease_seconds`,
+    so steady allowed traffic hits Redis once per lease. A rejection is remembered until Retry-After:
+    repeated requests of a throttled client are rejected without Redis.
+    Tokens left over from an expired lease go back to the bucket with the next call for the key, so slow
+    traffic costs one token per request; only while a lease is live other workers see it as spent.
+    """
+
+    def __init__(self, client=None, local_share: float = RATE_LIMIT_LOCAL_SHARE,
+                 lease_seconds: float = RATE_LIMIT_LEASE_SECONDS, backoff: float = RATE_LIMIT_REDIS_BACKOFF,
+                 max_keys: int = RATE_LIMIT_MAX_KEYS):
+        # from_url не подключается к Redis: соединение открывается при первом запросе
+        self.client = client if client is not None else get_redis_client(RATE_LIMIT_REDIS_DB)
+        self.script = self.client.register_script(TOKEN_BUCKET_SCRIPT)
+        self.local_share = local_share
+        self.lease_seconds = lease_seconds
+        self.backoff = backoff
+        self.max_keys = max_keys
+        self._local: dict[str, _LocalBucket] = {}
+        self._redis_down_until = 0.0
+
+    def lease_size(self, rate_limit: RateLimit) -> int:
+        return max(1, int(rate_limit.limit * self.local_share))
+
+    def _bucket(self, key: str, now: float) -> _LocalBucket:
+        bucket = self._local.get(key)
+        if bucket is None:
+            if len(self._local) >= self.max_keys:
+                self._local = {key: bucket for key, bucket in self._local.items()
+                               if bucket.expires > now or bucket.blocked_until > now}
+                if len(self._local) >= self.max_keys:
+                    self._local.clear()
+            bucket = self._local[key] = _LocalBucket()
+        return bucket
+
+    async def acquire(self, key: str, rate_limit: RateLimit) -> Decision:
+        now = time.monotonic()
+        bucket = self._local.get(key)
+        if bucket is not None:
+            if bucket.blocked_until > now:
+                return Decision(False, bucket.blocked_until - now, "local")
+            if bucket.tokens and bucket.expires > now:
+                bucket.tokens -= 1
+                return Decision(True)
+        if now < self._redis_down_until:
+            return Decision(True, source="fail_open")
+
+        returned = 0
+        if bucket is not None and bucket.expires <= now:
+            # Остаток истекшей аренды забирает только один запрос, даже если несколько ждут Redis
+            returned, bucket.tokens = bucket.tokens, 0
+        try:
+            granted, retry_after = await self.script(
+                keys=[RATE_LIMIT_KEY_PREFIX + key],
+                args=[rate_limit.limit, rate_limit.rate, self.lease_size(rate_limit), returned]
+            )
+        except (RedisError, OSError) as e:
+            # Лимитер не должен ронять API вместе с Redis
+            rate_limit_redis_calls_total.labels("error").inc()
+            logger.warning("Rate limiter: Redis is unavailable, allowing requests for %ss: %s", self.backoff, e)
+            self._redis_down_until = now + self.backoff
+            return Decision(True, source="fail_open")
+
+        granted, retry_after = int(granted), float(retry_after)
+        now = time.monotonic()
+        bucket = self._bucket(key, now)
+        if not granted:
+            rate_limit_redis_calls_total.labels("rejected").inc()
+            bucket.tokens = 0
+            bucket.blocked_until = now + retry_after
+            return Decision(False, retry_after, "redis")
+
+        rate_limit_redis_calls_total.labels("allowed").inc()
+        if bucket.expires <= now:
+            bucket.tokens = 0
+        # Одновременные промахи одного ключа складывают свои аренды
+        bucket.tokens += granted - 1
+        bucket.expires = now + self.lease_seconds
+        return Decision(True, source="redis")
@@ -0,0 +1,71 @@
+import itertools
+import logging
+import os
+import time
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+# После записи клиент читает с мастера, пока реплики не догонят его изменения
+PRIMARY_STICKY_COOKIE = "db_primary_until"
+PRIMARY_STICKY_SECONDS = float(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+
+# Реплика, которая проиграла весь полученный WAL, отстает на 0 секунд, даже если на мастере давно не было записей
+REPLICA_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class ReplicaRouter:
+    """
+    Round-robin over read replicas. Replication lag of each replica is measured at most
+    once per `check_interval` seconds; replicas lagging more than `max_lag` seconds
+    or unreachable are skipped until the next check.
+    """
+
+    def __init__(self, engines: list[AsyncEngine], max_lag: float = 5.0, check_interval: float = 5.0):
+        self.engines = engines
+        self.sessionmakers = [async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+                              for engine in engines]
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.lag = [0.0] * len(engines)
+        self.checked_at = [float("-inf")] * len(engines)
+        self._order = itertools.cycle(range(len(engines)))
+
+    async def measure_lag(self, index: int) -> float:
+        try:
+            async with self.engines[index].connect() as connection:
+                lag = (await connection.execute(REPLICA_LAG_SQL)).scalar()
+        except (SQLAlchemyError, OSError) as e:
+            logger.warning("Read replica %s is unavailable: %s", self.engines[index].url.host, e)
+            return float("inf")
+        return float(lag or 0)
+
+    async def is_fresh(self, index: int) -> bool:
+        now = time.monotonic()
+        if now - self.checked_at[index] >= self.check_interval:
+            self.checked_at[index] = now
+            self.lag[index] = await self.measure_lag(index)
+        return self.lag[index] <= self.max_lag
+
+    async def pick(self) -> Optional[async_sessionmaker]:
+        """Session factory of the next fresh replica, or None when the primary has to serve the read."""
+        for _ in range(len(self.engines)):
+            index = next(self._order)
+            if await self.is_fresh(index):
+                return self.sessionmakers[index]
+        return None
+
+
+def wrote_recently(cookies: dict) -> bool:
+    """True while the client is inside the read-your-writes window set by `ReadYourWritesMiddleware`."""
+    try:
+        return float(cookies.get(PRIMARY_STICKY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
@@ -0,0 +1,56 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Awaitable, Callable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from server.backend.metrics import startup_dependency_seconds
+from server.backend.redis import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+STARTUP_RETRY_INTERVAL = float(os.getenv("STARTUP_RETRY_INTERVAL", "5"))
+
+# {зависимость: секунды от старта воркера до первого ответа}; зависимости нет в словаре, пока она не ответила
+startup_timings: dict[str, float] = {}
+
+
+async def wait_ready(dependency: str, check: Callable[[], Awaitable], errors: tuple[type[Exception], ...],
+                     retry_interval: float = STARTUP_RETRY_INTERVAL) -> float:
+    """
+    Background startup check: retries `check` every `retry_interval` seconds while it raises one of `errors`.
+    Records and logs how long `dependency` took to become ready, so a slow or missing dependency
+    shows up in the logs and in startup_dependency_seconds instead of blocking the worker boot.
+    """
+    start = time.perf_counter()
+    attempt = 1
+    while True:
+        try:
+            await check()
+            break
+        except errors as e:
+            logger.warning("Startup: %s is not ready (attempt %d): %s", dependency, attempt, e)
+            attempt += 1
+            await asyncio.sleep(retry_interval)
+
+    elapsed = time.perf_counter() - start
+    startup_timings[dependency] = elapsed
+    startup_dependency_seconds.labels(dependency).set(elapsed)
+    logger.info("Startup: %s ready in %.3fs", dependency, elapsed)
+    return elapsed
+
+
+async def check_database(engine: AsyncEngine):
+    async with engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+
+async def check_redis():
+    client = get_redis_client(1)
+    try:
+        await client.ping()
+    finally:
+        await client.aclose()
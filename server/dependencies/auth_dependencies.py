@@ -1,9 +1,9 @@
 import os
 from fastapi import Depends, HTTPException, Request
 import jwt
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from server.backend.database import get_session
+from server.backend.database import get_session, read_sessionmaker
 from server.repositories.user import UserRepository
 from server.schemas.user import UserOut
 
@@ -11,12 +11,9 @@ JWT_SECRET = os.getenv("JWT_SECRET")
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM")
 
 
-async def get_current_user_from_cookie(
-        request: Request,
-        db: AsyncSession = Depends(get_session)
-) -> UserOut:
+def get_user_id_from_token(request: Request) -> str:
     """
-    Get the current user from the access token cookie or Authorization header.
+    Get the user id from the access token cookie or Authorization header.
     If no valid token is provided, raises a 401 Unauthorized exception.
     """
     access_token = request.cookies.get("access_token")
@@ -44,10 +41,36 @@ async def get_current_user_from_cookie(
             detail=f"Invalid authentication credentials: {str(e)}",
             headers={"WWW-Authenticate": "Bearer"}
         )
+    return user_id
+
 
-    user_repo = UserRepository(db)
-    user = await user_repo.get_by_id(user_id)
+async def get_user_or_404(db: AsyncSession, user_id: str) -> UserOut:
+    user = await UserRepository(db).get_by_id(user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-
     return user
+
+
+async def get_current_user_from_cookie(
+        request: Request,
+        db: AsyncSession = Depends(get_session)
+) -> UserOut:
+    """
+    Get the current user from the access token cookie or Authorization header.
+    If no valid token is provided, raises a 401 Unauthorized exception.
+    """
+    return await get_user_or_404(db, get_user_id_from_token(request))
+
+
+async def get_current_user_read(
+        request: Request,
+        session_factory: async_sessionmaker = Depends(read_sessionmaker)
+) -> UserOut:
+    """
+    Same as `get_current_user_from_cookie` for the endpoints routed by `read_sessionmaker`:
+    the user is read where the endpoint reads, so these requests never hold a primary connection.
+    """
+    user_id = get_user_id_from_token(request)
+    # Своя короткая сессия: выгрузки стримят ответ дольше, чем нужна проверка пользователя
+    async with session_factory() as db:
+        return await get_user_or_404(db, user_id)
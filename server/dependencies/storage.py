@@ -0,0 +1,13 @@
+from fastapi import Request
+
+from server.services.image_storage import ImageStorage
+from server.services.reservation_archive import ReservationArchive
+
+
+def get_image_storage(request: Request) -> ImageStorage:
+    """One ImageStorage per worker, created in the app lifespan"""
+    return request.app.state.image_storage
+
+
+def get_reservation_archive(request: Request) -> ReservationArchive:
+    return request.app.state.reservation_archive
@@ -0,0 +1,71 @@
+import time
+
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from server.backend.metrics import (
+    http_request_duration_seconds,
+    http_requests_in_progress,
+    http_response_size_bytes
+)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def get_route_template(scope: Scope) -> str:
+    """
+    Returns the path template of the route that will handle the request
+    (e.g. "/api/seat/{seat_id}"), so that metric labels do not grow with raw paths.
+    """
+    app = scope.get("app")
+    if app is None:
+        return UNMATCHED_ROUTE
+
+    partial = None
+    for route in app.router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+        if match == Match.PARTIAL and partial is None:
+            partial = route.path
+    return partial or UNMATCHED_ROUTE
+
+
+class PrometheusMiddleware:
+    """
+    ASGI middleware that records latency, in-flight requests and response size
+    for every HTTP request, labelled by method, route template and status code.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = get_route_template(scope)
+        status_code = 500
+        response_size = 0
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code, response_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
+
+        in_progress = http_requests_in_progress.labels(method=method, route=route)
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start
+            in_progress.dec()
+            status = str(status_code)
+            http_request_duration_seconds.labels(method=method, route=route, status=status).observe(duration)
+            http_response_size_bytes.labels(method=method, route=route, status=status).observe(response_size)
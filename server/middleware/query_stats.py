@@ -0,0 +1,58 @@
+import logging
+import os
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from server.backend.metrics import db_queries_per_request, db_time_per_request_seconds
+from server.backend.query_stats import track_queries
+from server.middleware.metrics import get_route_template
+
+logger = logging.getLogger(__name__)
+
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "10"))
+
+
+class QueryStatsMiddleware:
+    """
+    Counts SQL statements and DB time of every HTTP request, exports them as metrics
+    and as a `Server-Timing: db;desc="N queries";dur=ms` header, and logs a warning
+    when the same statement runs more than N_PLUS_ONE_THRESHOLD times.
+    """
+
+    def __init__(self, app: ASGIApp, threshold: int = N_PLUS_ONE_THRESHOLD):
+        self.app = app
+        self.threshold = threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+            async def send_wrapper(message: Message):
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers.append(
+                        "Server-Timing",
+                        f'db;desc="{stats.count} queries";dur={stats.total_time * 1000:.2f}'
+                    )
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                self.report(scope, stats)
+
+    def report(self, scope: Scope, stats):
+        method = scope["method"]
+        route = get_route_template(scope)
+        db_queries_per_request.labels(method=method, route=route).observe(stats.count)
+        db_time_per_request_seconds.labels(method=method, route=route).observe(stats.total_time)
+
+        statement, repeats = stats.most_repeated()
+        if repeats > self.threshold:
+            logger.warning(
+                "Possible N+1 in %s %s: statement executed %d times (%d queries total): %s",
+                method, route, repeats, stats.count, " ".join(statement.split())
+            )
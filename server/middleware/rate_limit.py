@@ -0,0 +1,86 @@
+import math
+
+import jwt
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from server.backend.metrics import rate_limited_requests_total
+from server.backend.rate_limit import RATE_LIMITS, RateLimit, RateLimiter
+from server.dependencies.auth_dependencies import JWT_ALGORITHM, JWT_SECRET
+from server.middleware.metrics import get_route_template
+
+TOO_MANY_REQUESTS_BODY = '{"detail":"Слишком много запросов"}'.encode()
+
+
+def client_ip(scope: Scope) -> str:
+    # За прокси адрес клиента подставляет uvicorn из X-Forwarded-For, только если прокси есть в FORWARDED_ALLOW_IPS
+    # (gunicorn.conf.py); иначе здесь адрес прокси. Заголовкам клиента не верим
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def user_id(connection: HTTPConnection) -> str | None:
+    """`sub` of the access token from the cookie or the Authorization header, the same token get_current_user reads"""
+    token = connection.cookies.get("access_token")
+    if not token:
+        authorization = connection.headers.get("authorization", "")
+        if authorization.startswith("Bearer "):
+            token = authorization[len("Bearer "):]
+    if not token:
+        return None
+    try:
+        return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM]).get("sub")
+    except jwt.PyJWTError:
+        return None
+
+
+def limit_key(scope: Scope, method: str, route: str, rate_limit: RateLimit) -> str:
+    """Bucket of the request: the route plus the user, or the client IP for anonymous requests and per-IP limits"""
+    identity = None
+    if rate_limit.key == "user":
+        identity = user_id(HTTPConnection(scope))
+    identity = f"user:{identity}" if identity else f"ip:{client_ip(scope)}"
+    return f"{method} {route}:{identity}"
+
+
+class RateLimitMiddleware:
+    """
+    Rejects requests over the limit of their route with 429 and Retry-After before they reach
+    the endpoint, its dependencies and the database. Routes without a limit pass untouched.
+    """
+
+    def __init__(self, app: ASGIApp, limits: dict[tuple[str, str], RateLimit] = RATE_LIMITS,
+                 limiter: RateLimiter | None = None):
+        self.app = app
+        self.limits = limits
+        self.methods = {method for method, _ in limits}
+        self.limiter = limiter if limiter is not None else RateLimiter()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] not in self.methods:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = get_route_template(scope)
+        rate_limit = self.limits.get((method, route))
+        if rate_limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        decision = await self.limiter.acquire(limit_key(scope, method, route, rate_limit), rate_limit)
+        if decision.allowed:
+            await self.app(scope, receive, send)
+            return
+
+        rate_limited_requests_total.labels(method=method, route=route, source=decision.source).inc()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(TOO_MANY_REQUESTS_BODY)).encode()),
+                (b"retry-after", str(max(1, math.ceil(decision.retry_after))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": TOO_MANY_REQUESTS_BODY})
@@ -1,19 +1,68 @@
 import uuid
-from datetime import datetime
-from sqlalchemy import Column, String, ForeignKey, DateTime
+from datetime import date, datetime, timedelta
+from sqlalchemy import CheckConstraint, Column, String, ForeignKey, DateTime, Index, and_, event, text
 from sqlalchemy.dialects.postgresql import UUID
 from server.backend.database import Base
+from server.backend.partitions import (PARTITIONS_AHEAD, create_default_partition_sql, create_partition_sql, month_start,
+                                       months_between)
+from server.schemas.reservation import RESERVATION_MAX_DURATION
 
 
 class Reservation(Base):
     __tablename__ = "reservations"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, unique=True, nullable=False)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     seat_id = Column(UUID(as_uuid=True), ForeignKey("seats.id"), nullable=False)
-    start = Column(DateTime, nullable=False)
+    # Ключ партиционирования, поэтому входит в первичный ключ таблицы
+    start = Column(DateTime, primary_key=True, nullable=False)
     end = Column(DateTime, nullable=False)
     status = Column(String, nullable=False, default="future")
-    
+
+    __table_args__ = (
+        # SeatsManager.is_available, наличие броней у места в SeatRepository.list_with_availability
+        Index("ix_reservations_seat_id_start_end", "seat_id", "start", "end"),
+        # История броней пользователя
+        Index("ix_reservations_user_id_start", "user_id", "start"),
+        # Текущая бронь пользователя: ReservationManager.does_user_have_active_reservation
+        Index("ix_reservations_user_id_end_not_closed", "user_id", "end", postgresql_where=(status != "closed")),
+        # Ближайшая чужая бронь (get_maximum_available_time), выгрузка по интервалу
+        Index("ix_reservations_start", "start"),
+        # Брони, пересекающиеся с окном: end > начала окна отсекает всю историю (SeatRepository.get_all)
+        Index("ix_reservations_end", "end"),
+        # Просроченные брони для update_statuses: в индексе только брони со статусом future
+        Index("ix_reservations_end_future", "end", postgresql_where=(status == "future")),
+        # На длине брони держится starts_near: более длинная бронь выпала бы из проверки пересечений
+        CheckConstraint(f"\"end\" - start <= interval '{RESERVATION_MAX_DURATION.days} days'",
+                        name="ck_reservations_max_duration"),
+        {"postgresql_partition_by": "RANGE (start)"},
+    )
+    # Для ORM бронь по-прежнему определяется одним id
+    __mapper_args__ = {"primary_key": [id]}
+
     def __repr__(self):
         return f"<Reservation id={self.id} seat_id={self.seat_id} start={self.start} end={self.end}>"
+
+
+# Бронь, пересекающая окно, начинается не раньше чем за RESERVATION_MAX_DURATION до него.
+# Запас в сутки покрывает расхождение UTC и московского времени в наивных датах.
+RESERVATION_LOOKBACK = RESERVATION_MAX_DURATION + timedelta(days=1)
+
+
+def starts_near(start: datetime, end: datetime):
+    """
+    Bound on Reservation.start for reservations that may overlap [start, end).
+    Redundant for the result, but lets Postgres skip the partitions of other months.
+    """
+    return and_(Reservation.start >= start - RESERVATION_LOOKBACK, Reservation.start < end + timedelta(days=1))
+
+
+def _create_partitions(table, connection, **kw):
+    # Для схем из metadata.create_all (бенчмарки); в базе приложения партиции создают миграция и maintain_partitions
+    today = date.today()
+    for month in months_between(today, month_start(today, PARTITIONS_AHEAD)):
+        connection.execute(text(create_partition_sql(month)))
+    connection.execute(text(create_default_partition_sql()))
+
+
+event.listen(Reservation.__table__, "after_create", _create_partitions)
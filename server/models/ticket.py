@@ -1,8 +1,8 @@
 import datetime
 import uuid
-from sqlalchemy import Column, ForeignKey, String, DateTime
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, ForeignKey, String, DateTime, Index, DDL, and_, event, or_
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import deferred, relationship
 from server.backend.database import Base
 
 
@@ -19,3 +19,53 @@ class Ticket(Base):
     status = Column(String, default="active")
 
     made_on = Column(DateTime, default=datetime.datetime.now)
+
+    # Админ, взявший тикет в работу, и до какого момента (время сервера БД) действует захват
+    claimed_by = Column(UUID(as_uuid=True), nullable=True)
+    claimed_until = Column(DateTime, nullable=True)
+
+    # Заполняется триггером tickets_search_vector_update, см. TICKET_SEARCH_FUNCTION
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
+
+    __table_args__ = (
+        # Очередь тикетов в админке: keyset-пагинация по (made_on, id) с фильтрами
+        Index("ix_tickets_made_on_id", "made_on", "id"),
+        # Тикеты пользователя
+        Index("ix_tickets_user_id_made_on", "user_id", "made_on"),
+        Index("ix_tickets_status_made_on_id", "status", "made_on", "id"),
+        Index("ix_tickets_theme_made_on_id", "theme", "made_on", "id"),
+        Index("ix_tickets_unanswered_made_on_id", "made_on", "id",
+              postgresql_where=or_(status.is_(None), status == "active")),
+        Index("ix_tickets_answered_made_on_id", "made_on", "id",
+              postgresql_where=and_(status.is_not(None), status != "active")),
+        Index("ix_tickets_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
+
+# Тикет без ответа: статус ещё не проставлен или "active"
+TICKET_UNANSWERED = or_(Ticket.status.is_(None), Ticket.status == "active")
+TICKET_ANSWERED = and_(Ticket.status.is_not(None), Ticket.status != "active")
+
+# Сообщения пишут по-русски; латиницу (темы из TicketThemeEnum) эта конфигурация стеммит как английский
+TICKET_SEARCH_CONFIG = "russian"
+
+TICKET_SEARCH_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION tickets_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('{TICKET_SEARCH_CONFIG}', coalesce(NEW.theme, '')), 'A') ||
+        setweight(to_tsvector('{TICKET_SEARCH_CONFIG}', coalesce(NEW.message, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+TICKET_SEARCH_TRIGGER = """
+CREATE TRIGGER tickets_search_vector_update
+    BEFORE INSERT OR UPDATE OF theme, message ON tickets
+    FOR EACH ROW EXECUTE FUNCTION tickets_search_vector_update()
+"""
+
+# Для таблиц, созданных через metadata.create_all (бенчмарки), а не миграциями
+for statement in (TICKET_SEARCH_FUNCTION, TICKET_SEARCH_TRIGGER):
+    event.listen(Ticket.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
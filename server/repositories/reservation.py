@@ -1,5 +1,7 @@
 import datetime
-from sqlalchemy import select
+from typing import AsyncIterator
+
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from server.utils.datetime_utils import MOSCOW_TZ
@@ -7,9 +9,10 @@ from server.utils.exceptions import SeatIsNotAvailableError
 from server.models.reservation import Reservation
 from server.models.seat import Seat
 from server.schemas.reservation import ReservationCreate
-from server.schemas.reservation import ReservationUpdate
+from server.schemas.reservation import ReservationUpdate, check_reservation_duration
 from server.services.seats_manager import SeatsManager
 from server.utils.datetime_utils import make_timezone_naive
+from server.utils.rows import fetch_dicts, stream_dicts
 
 from uuid import UUID
 
@@ -92,7 +95,11 @@ class ReservationRepository:
         
         if 'end' in update_data and update_data['end'] is not None:
             update_data['end'] = make_timezone_naive(update_data['end'])
-            
+
+        # Схема проверяет длину, только если пришли оба конца; здесь - с сохраненным вторым
+        check_reservation_duration(update_data.get('start') or reservation.start,
+                                   update_data.get('end') or reservation.end)
+
         for field, value in update_data.items():
             setattr(reservation, field, value)
             
@@ -101,13 +108,13 @@ class ReservationRepository:
         return reservation
 
     async def update_statuses(self):
-        result = await self.db.execute(select(Reservation))
-        reservations = result.scalars().all()
+        """Marks ended `future` reservations as `did_not_come`: one UPDATE over the partial index ix_reservations_end_future"""
         now = datetime.datetime.now(tz=MOSCOW_TZ).replace(tzinfo=None)
-        for reservation in reservations:
-            print(reservation.end, now)
-            if reservation.status == "future" and reservation.end < now:
-                reservation.status = "did_not_come"
+        await self.db.execute(
+            update(Reservation)
+            .where(Reservation.status == "future", Reservation.end < now)
+            .values(status="did_not_come")
+        )
         await self.db.commit()
         return True
 
@@ -115,4 +122,41 @@ class ReservationRepository:
         """Retrieve all reservations"""
         result = await self.db.execute(select(Reservation))
         reservations = result.scalars().all()
-        return reservations
\ No newline at end of file
+        return reservations
+
+    @staticmethod
+    def _with_seat_names():
+        return select(
+            Reservation.id, Reservation.user_id, Reservation.seat_id,
+            Reservation.start, Reservation.end, Reservation.status,
+            Seat.name.label("seat_name")
+        ).join(Seat, Seat.id == Reservation.seat_id)
+
+    async def list_with_seat_names(self, user_id: UUID | None = None) -> list[dict]:
+        """Reservations joined with seat names as plain rows with the fields of ReservationOut"""
+        query = self._with_seat_names()
+        if user_id is not None:
+            query = query.where(Reservation.user_id == user_id)
+
+        return await fetch_dicts(self.db, query)
+
+    async def count_by_seat(self, user_id: UUID) -> dict[UUID, int]:
+        """{seat_id: reservations} of `user_id`, without the ones the user did not come to"""
+        result = await self.db.execute(
+            select(Reservation.seat_id, func.count())
+            .where(Reservation.user_id == user_id, Reservation.status != "did_not_come")
+            .group_by(Reservation.seat_id)
+        )
+        return dict(result.all())
+
+    async def stream_with_seat_names(self, start: datetime.datetime | None = None,
+                                     end: datetime.datetime | None = None) -> AsyncIterator[list[dict]]:
+        """Batches of reservations starting within [start, end), read through a server-side cursor"""
+        query = self._with_seat_names()
+        if start is not None:
+            query = query.where(Reservation.start >= make_timezone_naive(start))
+        if end is not None:
+            query = query.where(Reservation.start < make_timezone_naive(end))
+
+        async for batch in stream_dicts(self.db, query):
+            yield batch
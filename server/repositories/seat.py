@@ -1,14 +1,20 @@
 from uuid import UUID
 from datetime import datetime
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, exists
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from server.models.seat import Seat
-from server.models.reservation import Reservation
+from server.models.reservation import Reservation, starts_near
 from server.schemas.seat import SeatCreate
 from server.schemas.seat import SeatUpdate
 from server.services.seats_manager import SeatsManager
 from server.utils.datetime_utils import make_timezone_naive
+from server.utils.rows import fetch_dicts
+
+SEAT_COLUMNS = (
+    Seat.id, Seat.name, Seat.type, Seat.x, Seat.y,
+    Seat.has_computer, Seat.has_water, Seat.has_kitchen, Seat.has_smart_desk, Seat.is_quite, Seat.is_talk_room,
+)
 
 
 class SeatRepository:
@@ -73,7 +79,8 @@ class SeatRepository:
         print(f"Naive start: {start_naive}, end: {end_naive}")
         
         res_result = await self.db.execute(
-            select(Reservation).filter(Reservation.end > start_naive, Reservation.start < end_naive)
+            select(Reservation).filter(Reservation.end > start_naive, Reservation.start < end_naive,
+                                       starts_near(start_naive, end_naive))
         )
         scalars_res = res_result.scalars()
         reservations = scalars_res.all()
@@ -82,3 +89,47 @@ class SeatRepository:
         for seat in seats:
             seat.is_available = seat.id not in occupied_seat_ids
         return seats
+
+    async def list_with_availability(self, start: datetime, end: datetime) -> list[dict]:
+        """
+        Same as `get_all`, but in one query and without ORM objects:
+        returns plain rows with the fields of SeatOut.
+        """
+        occupied = exists().where(Reservation.seat_id == Seat.id, *_occupying(start, end))
+        return await fetch_dicts(self.db, select(*SEAT_COLUMNS, (~occupied).label("is_available")))
+
+    async def list_catalog(self) -> list[dict]:
+        """Every seat with the fields of SeatOut, in a stable order"""
+        return await fetch_dicts(self.db, select(*SEAT_COLUMNS).order_by(Seat.id))
+
+    async def get_occupied_seat_ids(self, start: datetime, end: datetime) -> list[UUID]:
+        """Seats with a future or active reservation overlapping [start, end)"""
+        result = await self.db.execute(select(Reservation.seat_id).where(*_occupying(start, end)).distinct())
+        return list(result.scalars())
+
+    async def get_user_seat_id(self, user_id: UUID, start: datetime, end: datetime) -> UUID | None:
+        """Seat that `user_id` has booked for a part of [start, end)"""
+        result = await self.db.execute(
+            select(Reservation.seat_id).where(Reservation.user_id == user_id, *_occupying(start, end))
+            .order_by(Reservation.start).limit(1)
+        )
+        return result.scalar()
+
+    async def get_seat_ids_of_users(self, user_ids: list[UUID], start: datetime, end: datetime) -> list[UUID]:
+        """Seats booked by any of `user_ids` for a part of [start, end)"""
+        result = await self.db.execute(
+            select(Reservation.seat_id).where(Reservation.user_id.in_(user_ids), *_occupying(start, end)).distinct()
+        )
+        return list(result.scalars())
+
+
+def _occupying(start: datetime, end: datetime) -> tuple:
+    """Conditions of a reservation that takes its seat for a part of [start, end)"""
+    start_naive = make_timezone_naive(start)
+    end_naive = make_timezone_naive(end)
+    return (
+        Reservation.end > start_naive,
+        Reservation.start < end_naive,
+        starts_near(start_naive, end_naive),
+        Reservation.status.in_(("future", "active")),
+    )
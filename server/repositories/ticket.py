@@ -1,11 +1,26 @@
-from sqlalchemy import select
+import os
+from datetime import datetime, timedelta
+from typing import AsyncIterator
+from uuid import UUID
+
+from sqlalchemy import select, func, tuple_, update, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from server.utils.datetime_utils import make_timezone_naive
+from server.utils.rows import fetch_dicts, stream_dicts
 
-from server.models.ticket import Ticket
+from server.models.ticket import Ticket, TICKET_ANSWERED, TICKET_SEARCH_CONFIG, TICKET_UNANSWERED
 from server.schemas.ticket import TicketCreate
 
 
+TICKET_COLUMNS = (
+    Ticket.id, Ticket.user_id, Ticket.reservation_id, Ticket.seat_id, Ticket.seat_name,
+    Ticket.theme, Ticket.message, Ticket.status, Ticket.made_on
+)
+
+
+TICKET_CLAIM_LEASE = timedelta(seconds=int(os.getenv("TICKET_CLAIM_LEASE_SECONDS", "600")))
+
+
 class TicketRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
@@ -34,14 +49,126 @@ class TicketRepository:
     async def get_tickets(self):
         return await self.db.execute(select(Ticket))
 
+    async def stream_tickets(self, start: datetime | None = None,
+                             end: datetime | None = None) -> AsyncIterator[list[dict]]:
+        """Batches of tickets created within [start, end), read through a server-side cursor"""
+        # Имя места хранится в тикете с момента создания, join с seats не нужен
+        query = select(*TICKET_COLUMNS)
+        if start is not None:
+            query = query.where(Ticket.made_on >= make_timezone_naive(start))
+        if end is not None:
+            query = query.where(Ticket.made_on < make_timezone_naive(end))
+
+        async for batch in stream_dicts(self.db, query):
+            yield batch
+
     async def update_ticket_status(self, ticket_id, status):
         ticket = await self.get_ticket_by_id(ticket_id)
         ticket.status = status
+        ticket.claimed_by = None
+        ticket.claimed_until = None
         await self.db.commit()
         return ticket
 
+    async def claim_next(self, admin_id: UUID, count: int, lease: timedelta = TICKET_CLAIM_LEASE) -> list[dict]:
+        """
+        Claims up to `count` oldest unanswered tickets for `admin_id` until the lease expires.
+        Rows locked by a concurrent claim are skipped, so admins get disjoint batches without waiting
+        for each other. Tickets already claimed by `admin_id` are returned again with the lease renewed.
+        """
+        now = func.localtimestamp()
+        claimable = (
+            select(Ticket.id)
+            .where(TICKET_UNANSWERED,
+                   or_(Ticket.claimed_until.is_(None), Ticket.claimed_until < now, Ticket.claimed_by == admin_id))
+            .order_by(Ticket.made_on, Ticket.id)
+            .limit(count)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.db.execute(
+            update(Ticket)
+            .where(Ticket.id.in_(claimable.scalar_subquery()))
+            .values(claimed_by=admin_id, claimed_until=now + lease)
+            .returning(*TICKET_COLUMNS, Ticket.claimed_by, Ticket.claimed_until)
+            .execution_options(synchronize_session=False)
+        )
+        rows = [dict(row) for row in result.mappings()]
+        await self.db.commit()
+        return sorted(rows, key=lambda row: (row["made_on"], row["id"]))
+
+    async def release_claim(self, ticket_id: UUID, admin_id: UUID) -> bool:
+        """Returns the ticket to the queue, only the admin holding the claim can release it"""
+        result = await self.db.execute(
+            update(Ticket)
+            .where(Ticket.id == ticket_id, Ticket.claimed_by == admin_id)
+            .values(claimed_by=None, claimed_until=None)
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+        return result.rowcount > 0
+
     async def get_user_tickets(self, user_id):
         return await self.db.execute(select(Ticket).where(Ticket.user_id == user_id))
 
-    async def get_unanswered_tickets(self):
-        return await self.db.execute(select(Ticket).where(Ticket.status == None))
+    @staticmethod
+    def _page(query, limit: int | None, before: tuple[datetime, UUID] | None):
+        """Keyset page ordered by (made_on, id) descending, `before` is the last (made_on, id) of the previous page"""
+        if before is not None:
+            query = query.where(tuple_(Ticket.made_on, Ticket.id) < before)
+        return query.order_by(Ticket.made_on.desc(), Ticket.id.desc()).limit(limit)
+
+    async def get_tickets_page(self, limit: int, before: tuple[datetime, UUID] | None = None,
+                               status: str | None = None, theme: str | None = None,
+                               answered: bool | None = None) -> list[dict]:
+        query = select(*TICKET_COLUMNS)
+        if status is not None:
+            query = query.where(Ticket.status == status)
+        if theme is not None:
+            query = query.where(Ticket.theme == theme)
+        if answered is not None:
+            query = query.where(TICKET_ANSWERED if answered else TICKET_UNANSWERED)
+        return await fetch_dicts(self.db, self._page(query, limit, before))
+
+    async def search(self, text: str, limit: int, offset: int = 0, status: str | None = None,
+                     theme: str | None = None) -> list[dict]:
+        """
+        Full-text search over theme and message (websearch syntax: "фраза", or, -слово),
+        most relevant first. Uses the GIN index on search_vector.
+        """
+        tsquery = func.websearch_to_tsquery(TICKET_SEARCH_CONFIG, text)
+        rank = func.ts_rank_cd(Ticket.search_vector, tsquery)
+        query = select(*TICKET_COLUMNS, rank.label("rank")).where(Ticket.search_vector.op("@@")(tsquery))
+        if status is not None:
+            query = query.where(Ticket.status == status)
+        if theme is not None:
+            query = query.where(Ticket.theme == theme)
+        query = query.order_by(rank.desc(), Ticket.made_on.desc(), Ticket.id.desc()).limit(limit).offset(offset)
+        return await fetch_dicts(self.db, query)
+
+    async def get_unanswered_tickets(self, limit: int | None = None, before: tuple[datetime, UUID] | None = None,
+                                     theme: str | None = None):
+        query = select(*TICKET_COLUMNS).where(TICKET_UNANSWERED)
+        if theme is not None:
+            query = query.where(Ticket.theme == theme)
+        return await self.db.execute(self._page(query, limit, before))
+
+    async def get_inbox_page(self, limit: int, before: tuple[datetime, UUID] | None = None, answered: bool = False,
+                             theme: str | None = None) -> tuple[list[dict], tuple[bool, datetime, UUID] | None]:
+        """
+        Unanswered tickets first, then the answered ones, both newest first.
+        Returns the page and the (answered, made_on, id) position to continue from, None on the last page.
+        """
+        rows = []
+        if not answered:
+            result = await self.get_unanswered_tickets(limit + 1, before, theme)
+            rows = [dict(row) for row in result.mappings()]
+            if len(rows) > limit:
+                rows = rows[:limit]
+                return rows, (False, rows[-1]["made_on"], rows[-1]["id"])
+            answered, before = True, None
+
+        rows += await self.get_tickets_page(limit - len(rows) + 1, before, theme=theme, answered=True)
+        if len(rows) > limit:
+            rows = rows[:limit]
+            return rows, (True, rows[-1]["made_on"], rows[-1]["id"])
+        return rows, None
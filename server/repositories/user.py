@@ -5,6 +5,7 @@ from uuid import UUID
 
 from server.models.user import User
 from server.schemas.user import UserCreate
+from server.utils.rows import fetch_dicts
 
 
 class UserRepository:
@@ -79,3 +80,7 @@ class UserRepository:
     async def get_all_admins(self):
         result = await self.db.execute(select(User).filter(User.role == "admin"))
         return result.scalars().all()
+
+    async def list_users(self) -> list[dict]:
+        """All users as plain rows with the fields of UserOut"""
+        return await fetch_dicts(self.db, select(User.id, User.email, User.first_name, User.role, User.verified))
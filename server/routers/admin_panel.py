@@ -1,30 +1,37 @@
-from typing import Annotated, List
+from datetime import datetime
+from typing import Annotated, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Response, Body, Path, File, UploadFile
+from fastapi import APIRouter, Depends, HTTPException, Response, Body, Path, File, UploadFile, Query, Request
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
-from server.models.seat import Seat
 from server.models.user import User
 from server.repositories.reservation import ReservationRepository
 from server.repositories.ticket import TicketRepository
 from server.repositories.user import UserRepository
-from server.schemas.ticket import TicketStatusUpdate, TicketBase
+from server.schemas.ticket import (TicketStatusUpdate, TicketBase, TicketStatusEnum, TicketThemeEnum, TicketSearchResult,
+                                   TicketClaim, TicketExport)
 from server.schemas.user import UserOut, UserBase, UserUpdateAdmin
-from server.backend.database import get_session
-from server.dependencies.auth_dependencies import get_current_user_from_cookie
+from server.backend.database import get_session, get_read_session, read_sessionmaker
+from server.dependencies.auth_dependencies import get_current_user_from_cookie, get_current_user_read
+from server.dependencies.storage import get_image_storage
 
 from server.models.reservation import Reservation
-from server.schemas.reservation import ReservationUpdate, ReservationBase, ReservationCreate, ReservationOut
+from server.schemas.reservation import (ReservationUpdate, ReservationBase, ReservationCreate, ReservationOut,
+                                        check_reservation_duration)
 from server.services.image_storage import ImageStorage
 from server.services.reservation import ReservationManager
+from server.services.seat_recommendation import seat_recommender
 from server.utils.datetime_utils import make_timezone_naive
+from server.utils.export import ExportFormat, export_response, session_batches
+from server.utils.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from server.utils.responses import ModelListResponse
 
 import uuid
 
 from server.utils.exceptions import SeatIsNotAvailableError
-from server.utils.exceptions import UserAlreadyHasActiveReservationError
+from server.utils.exceptions import ReservationTooLongError, UserAlreadyHasActiveReservationError
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -110,10 +117,15 @@ async def update_reservation(reservation_id: Annotated[uuid.UUID, Path()],
     if reservation_db is None:
         raise HTTPException(status_code=404, detail="Бронь не найдена")
 
-    if reservation.start is not None:
-        reservation_db.start = make_timezone_naive(reservation.start)
-    if reservation.end is not None:
-        reservation_db.end = make_timezone_naive(reservation.end)
+    start = make_timezone_naive(reservation.start) if reservation.start is not None else reservation_db.start
+    end = make_timezone_naive(reservation.end) if reservation.end is not None else reservation_db.end
+    try:
+        check_reservation_duration(start, end)
+    except ReservationTooLongError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    reservation_db.start = start
+    reservation_db.end = end
     if reservation.status is not None:
         reservation_db.status = reservation.status
 
@@ -136,6 +148,7 @@ async def create_reservation(reservation: Annotated[ReservationCreate, Body()],
         new_reservation = await ReservationManager(db).create_reservation(
             str(reservation.user_id), reservation.start, reservation.end, str(reservation.seat_id)
         )
+        seat_recommender.record(reservation.user_id, reservation.seat_id)
         return new_reservation
     except SeatIsNotAvailableError:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Seat is not available")
@@ -169,65 +182,56 @@ async def get_all_reservations(current_user: UserOut = Depends(get_current_user_
     if current_user.role != 'admin':
         raise HTTPException(status_code=403, detail="Доступ запрещен")
 
-    all_reservations = await db.execute(select(Reservation))
-    all_reservations = all_reservations.scalars().all()
+    answer = await ReservationRepository(db).list_with_seat_names()
+    return ModelListResponse(ReservationOut, reversed(answer))
 
-    answer = []
-    for reservation in all_reservations:
-        seat = await db.execute(select(Seat).where(Seat.id == reservation.seat_id))
-        seat = seat.scalars().first()
-        reservation.seat_name = seat.name
-        answer.append(reservation)
 
-    return reversed(answer)
-
-
-@router.get("/tickets", response_model=List[TicketBase], summary="Получение всех тикетов (для админа)")
+@router.get("/tickets", response_model=List[TicketBase], summary="Получение тикетов постранично (для админа)")
 async def get_all_tickets(
-        current_user: UserOut = Depends(get_current_user_from_cookie),
-        db: AsyncSession = Depends(get_session)
+        current_user: UserOut = Depends(get_current_user_read),
+        db: AsyncSession = Depends(get_read_session),
+        ticket_status: Annotated[Optional[TicketStatusEnum], Query(alias="status")] = None,
+        theme: Annotated[Optional[TicketThemeEnum], Query()] = None,
+        unanswered_first: Annotated[bool, Query(description="Сначала тикеты без ответа")] = False,
+        cursor: Annotated[Optional[str], Query(description=f"Значение заголовка {NEXT_CURSOR_HEADER}")] = None,
+        limit: Annotated[int, Query(ge=1, le=500)] = 50
 ):
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Доступ запрещен")
-    ticket_repo = TicketRepository(db)
-    result = await ticket_repo.get_tickets()
-    tickets = result.scalars().all()
-
-    answer = []
-    for ticket in tickets:
-        seat = await db.execute(select(Seat).where(Seat.id == ticket.seat_id))
-        seat = seat.scalars().first()
-        if seat:
-            seat_name = seat.name
-        else:
-            seat_name = "Test name"
-        d = {
-            "id": ticket.id,
-            "user_id": ticket.user_id,
-            "reservation_id": ticket.reservation_id,
-            "seat_id": ticket.seat_id,
-            "theme": ticket.theme,
-            "message": ticket.message,
-            "status": ticket.status,
-            "made_on": ticket.made_on,
-            "seat_name": seat_name
-        }
-        answer.append(d)
-
-    return reversed(answer)
+
+    before, answered = None, False
+    if cursor is not None:
+        try:
+            made_on, ticket_id, phase = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Некорректный курсор")
+        before, answered = (made_on, ticket_id), bool(phase)
+
+    repo = TicketRepository(db)
+    headers = {}
+    if unanswered_first and ticket_status is None:
+        rows, position = await repo.get_inbox_page(limit, before, answered, theme)
+        if position is not None:
+            answered, made_on, ticket_id = position
+            headers[NEXT_CURSOR_HEADER] = encode_cursor(made_on, ticket_id, int(answered))
+    else:
+        rows = await repo.get_tickets_page(limit + 1, before, ticket_status, theme)
+        if len(rows) > limit:
+            rows = rows[:limit]
+            headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1]["made_on"], rows[-1]["id"])
+
+    return ModelListResponse(TicketBase, rows, headers=headers)
 
 
 @router.get("/users", response_model=List[UserOut], summary="Получение всех пользователей (для админа)")
 async def get_all_users(
-        current_user: UserOut = Depends(get_current_user_from_cookie),
-        db: AsyncSession = Depends(get_session)
+        current_user: UserOut = Depends(get_current_user_read),
+        db: AsyncSession = Depends(get_read_session)
 ):
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Доступ запрещен")
 
-    all_users = await db.execute(select(User))
-    all_users = all_users.scalars().all()
-    return all_users
+    return ModelListResponse(UserOut, await UserRepository(db).list_users())
 
 
 @router.patch("/user/{user_id}", response_model=UserOut, summary="Редактирование пользователя (для админа)")
@@ -275,13 +279,90 @@ async def update_ticket_status(
 @router.post("/default_avatar", summary="Загрузка аватара по умолчанию админом")
 async def upload_default_avatar(
         image: UploadFile = File(...),
-        current_user: UserOut = Depends(get_current_user_from_cookie)
+        current_user: UserOut = Depends(get_current_user_from_cookie),
+        image_storage: ImageStorage = Depends(get_image_storage)
 ):
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Доступ запрещен")
-    image_storage = ImageStorage()
     try:
         file_name = image_storage.upload_default_avatar(image)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     return {"image_id": file_name, "url": image_storage.get_image_url(file_name)}
+
+
+@router.get("/export/reservations", summary="Потоковая выгрузка броней в NDJSON или CSV (для админа)")
+async def export_reservations(
+        request: Request,
+        export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+        start: Optional[datetime] = Query(None, description="Брони, начинающиеся не раньше"),
+        end: Optional[datetime] = Query(None, description="Брони, начинающиеся раньше"),
+        current_user: UserOut = Depends(get_current_user_read)
+):
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Доступ запрещен")
+
+    batches = session_batches(await read_sessionmaker(request),
+                              lambda db: ReservationRepository(db).stream_with_seat_names(start, end))
+    return export_response(ReservationOut, batches, export_format, "reservations")
+
+
+@router.get("/export/tickets", summary="Потоковая выгрузка тикетов в NDJSON или CSV (для админа)")
+async def export_tickets(
+        request: Request,
+        export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+        start: Optional[datetime] = Query(None, description="Тикеты, созданные не раньше"),
+        end: Optional[datetime] = Query(None, description="Тикеты, созданные раньше"),
+        current_user: UserOut = Depends(get_current_user_read)
+):
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Доступ запрещен")
+
+    batches = session_batches(await read_sessionmaker(request),
+                              lambda db: TicketRepository(db).stream_tickets(start, end))
+    return export_response(TicketExport, batches, export_format, "tickets")
+
+
+@router.get("/tickets/search", response_model=List[TicketSearchResult],
+            summary="Полнотекстовый поиск по тикетам (для админа)")
+async def search_tickets(
+        q: Annotated[str, Query(min_length=1, max_length=256, description='Например: розетка -кухня, "не работает"')],
+        current_user: UserOut = Depends(get_current_user_read),
+        db: AsyncSession = Depends(get_read_session),
+        ticket_status: Annotated[Optional[TicketStatusEnum], Query(alias="status")] = None,
+        theme: Annotated[Optional[TicketThemeEnum], Query()] = None,
+        limit: Annotated[int, Query(ge=1, le=100)] = 20,
+        offset: Annotated[int, Query(ge=0, le=10_000)] = 0
+):
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Доступ запрещен")
+
+    rows = await TicketRepository(db).search(q, limit, offset, ticket_status, theme)
+    return ModelListResponse(TicketSearchResult, rows)
+
+
+@router.post("/tickets/claim", response_model=List[TicketClaim],
+             summary="Взять в работу следующие тикеты без ответа (для админа)")
+async def claim_tickets(
+        count: Annotated[int, Query(ge=1, le=100)] = 10,
+        current_user: UserOut = Depends(get_current_user_from_cookie),
+        db: AsyncSession = Depends(get_session)
+):
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Доступ запрещен")
+
+    return ModelListResponse(TicketClaim, await TicketRepository(db).claim_next(current_user.id, count))
+
+
+@router.delete("/ticket/{ticket_id}/claim", status_code=status.HTTP_204_NO_CONTENT,
+               summary="Вернуть тикет в очередь (для админа)")
+async def release_ticket_claim(
+        ticket_id: Annotated[uuid.UUID, Path()],
+        current_user: UserOut = Depends(get_current_user_from_cookie),
+        db: AsyncSession = Depends(get_session)
+):
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Доступ запрещен")
+
+    if not await TicketRepository(db).release_claim(ticket_id, current_user.id):
+        raise HTTPException(status_code=404, detail="Тикет не найден или взят в работу другим админом")
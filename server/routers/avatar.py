@@ -4,18 +4,19 @@ from typing import Optional
 
 from server.backend.database import get_session
 from server.dependencies.auth_dependencies import get_current_user_from_cookie
+from server.dependencies.storage import get_image_storage
 from server.models.user import User
 from server.services.image_storage import ImageStorage
 
 router = APIRouter(tags=["avatar"], prefix="/avatar")
-image_storage = ImageStorage()
 
 
 @router.post("/upload", status_code=status.HTTP_200_OK)
 async def upload_avatar(
         file: UploadFile = File(...),
         current_user: User = Depends(get_current_user_from_cookie),
-        db: Session = Depends(get_session)
+        db: Session = Depends(get_session),
+        image_storage: ImageStorage = Depends(get_image_storage)
 ):
     """Upload a new avatar for the current user"""
     try:
@@ -45,7 +46,8 @@ async def upload_avatar(
 
 
 @router.get("", status_code=status.HTTP_200_OK)
-async def get_avatar(user: User = Depends(get_current_user_from_cookie)):
+async def get_avatar(user: User = Depends(get_current_user_from_cookie),
+                     image_storage: ImageStorage = Depends(get_image_storage)):
     try:
         image_id = user.avatar_id
         image_data = image_storage.get_image(image_id)
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Request, status
+from fastapi.responses import JSONResponse
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+@router.get("/live", summary="Liveness: процесс жив и event loop отвечает")
+async def live():
+    return {"status": "alive"}
+
+
+@router.get("/ready", summary="Readiness: Postgres, Redis, S3 и telegram-сервис")
+async def ready(request: Request):
+    """
+    Проверяет зависимости параллельно с таймаутом на каждую, результат кешируется на HEALTH_CACHE_TTL секунд.
+    503, если недоступна обязательная зависимость; отказ S3 или telegram-сервиса дает 200 со статусом degraded.
+    """
+    report = await request.app.state.health.report()
+    code = status.HTTP_503_SERVICE_UNAVAILABLE if report["status"] == "not_ready" else status.HTTP_200_OK
+    return JSONResponse(report, status_code=code)
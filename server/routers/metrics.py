@@ -6,12 +6,21 @@ router = APIRouter(tags=["simulation"])
 
 from fastapi import APIRouter, Response, Request, status
 import asyncio
+import os
+import time
 from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
+from starlette.concurrency import run_in_threadpool
+from server.backend.metrics import metrics_registry
 from server.schemas.metrics import SimulationControl
 from server.services.metrics import simulate_day_and_metrics
 
 router = APIRouter(tags=["simulation"])
 
+METRICS_CACHE_TTL = float(os.getenv("METRICS_CACHE_TTL", "1"))
+
+_metrics_lock = asyncio.Lock()
+_metrics_cache = {"data": b"", "generated_at": 0.0}
+
 
 @router.post("/simulation/control", status_code=status.HTTP_200_OK)
 async def control_simulation(control: SimulationControl, request: Request):
@@ -37,6 +46,12 @@ async def control_simulation(control: SimulationControl, request: Request):
 async def metrics_endpoint():
     """
     Экспортирует метрики в формате Prometheus.
+    В multiprocess-режиме собирает значения всех воркеров; чтение файлов выполняется
+    в пуле потоков, а результат кешируется на METRICS_CACHE_TTL секунд.
     """
-    data = generate_latest()
+    async with _metrics_lock:
+        if time.monotonic() - _metrics_cache["generated_at"] >= METRICS_CACHE_TTL:
+            _metrics_cache["data"] = await run_in_threadpool(generate_latest, metrics_registry)
+            _metrics_cache["generated_at"] = time.monotonic()
+        data = _metrics_cache["data"]
     return Response(content=data, media_type=CONTENT_TYPE_LATEST)
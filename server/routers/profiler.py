@@ -0,0 +1,70 @@
+import asyncio
+import os
+from enum import Enum
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from server.dependencies.auth_dependencies import get_current_user_from_cookie
+from server.schemas.user import UserOut
+from server.services.profiler import MemoryTracer, ProfilerBusyError, SamplingProfiler
+
+router = APIRouter(prefix="/admin/profile", tags=["admin"])
+
+
+class ProfileFormat(str, Enum):
+    COLLAPSED = "collapsed"
+    SPEEDSCOPE = "speedscope"
+
+
+@router.post("", summary="Профилирование текущего воркера (для админа)")
+async def profile_worker(
+        seconds: float = Query(10, gt=0, le=60, description="Длительность профилирования"),
+        interval_ms: float = Query(10, ge=1, le=1000, description="Интервал между сэмплами"),
+        profile_format: ProfileFormat = Query(ProfileFormat.COLLAPSED, alias="format"),
+        memory: bool = Query(False, description="Снять diff tracemalloc за то же время: замедляет все аллокации воркера"),
+        current_user: UserOut = Depends(get_current_user_from_cookie)
+):
+    """
+    Сэмплирует стеки всех потоков воркера, обработавшего запрос, в течение `seconds` секунд.
+    Возвращает collapsed-стеки (flamegraph.pl, speedscope) или speedscope JSON,
+    а при memory=true - разницу снимков tracemalloc.
+    """
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Доступ запрещен")
+
+    profiler = SamplingProfiler(interval=interval_ms / 1000)
+    tracer = MemoryTracer() if memory else None
+    try:
+        profiler.start()
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    if tracer:
+        try:
+            # Снимки и их сравнение - секунды на большой куче: не в цикле событий
+            await asyncio.to_thread(tracer.start)
+        except BaseException:
+            # Поток со start не прервать: stop дождется его и выключит tracemalloc, ошибка start не теряется
+            profiler.stop()
+            await asyncio.to_thread(tracer.stop)
+            raise
+
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        profiler.stop()
+        memory_diff = await asyncio.to_thread(tracer.stop) if tracer else None
+
+    if profile_format == ProfileFormat.SPEEDSCOPE:
+        profile = profiler.speedscope()
+    else:
+        profile = profiler.collapsed()
+
+    return {
+        "worker_pid": os.getpid(),
+        "duration": profiler.duration,
+        "samples": profiler.sample_count,
+        "format": profile_format,
+        "profile": profile,
+        "memory": memory_diff
+    }
@@ -1,24 +1,31 @@
+import asyncio
 import threading
 from datetime import datetime
+from typing import Optional
 
+from botocore.exceptions import BotoCoreError, ClientError
 from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from server.backend.database import get_session
-from server.dependencies.auth_dependencies import get_current_user_from_cookie
+from server.dependencies.auth_dependencies import get_current_user_from_cookie, get_current_user_read
+from server.dependencies.storage import get_reservation_archive
 from server.models.reservation import Reservation
 from server.models.seat import Seat
 from server.schemas.reservation import ReservationCreate, ReservationBase, ReservationOut
 from server.repositories.reservation import ReservationRepository
 from server.services.reservation import ReservationManager
+from server.services.reservation_archive import ReservationArchive
+from server.services.seat_recommendation import seat_recommender
 from server.utils.datetime_utils import make_timezone_naive
+from server.utils.responses import ModelListResponse
 from server.utils.exceptions import SeatIsNotAvailableError
 from server.schemas.reservation import ReservationUpdate
 
 from uuid import UUID
 
-from server.utils.exceptions import UserAlreadyHasActiveReservationError
+from server.utils.exceptions import ReservationTooLongError, UserAlreadyHasActiveReservationError
 
 router = APIRouter(prefix="/reservations", tags=["reservations"])
 ads_lock = threading.Lock()
@@ -40,6 +47,7 @@ async def create_reservation(reservation: ReservationCreate, db: AsyncSession =
         new_reservation = await ReservationManager(db).create_reservation(
             str(reservation.user_id), reservation.start, reservation.end, str(reservation.seat_id)
         )
+        seat_recommender.record(reservation.user_id, reservation.seat_id)
         return new_reservation
     except SeatIsNotAvailableError:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Seat is not available")
@@ -50,9 +58,8 @@ async def create_reservation(reservation: ReservationCreate, db: AsyncSession =
 @router.get("", response_model=list[ReservationOut], summary="Получение списка всех бронирований пользователя")
 async def get_reservations(db: AsyncSession = Depends(get_session), current_user=Depends(get_current_user_from_cookie)):
     await ReservationRepository(db).update_statuses()
-    reservation_repo = ReservationRepository(db)
-    reservations = await reservation_repo.get_reservations_by_user_id(current_user.id)
-    return reversed(reservations)
+    reservations = await ReservationRepository(db).list_with_seat_names(current_user.id)
+    return ModelListResponse(ReservationOut, reversed(reservations))
 
 
 @router.get("/active", response_model=ReservationOut, summary="Получение активной брони пользователя")
@@ -67,6 +74,27 @@ async def get_active_reservation(db: AsyncSession = Depends(get_session),
     return reservation
 
 
+@router.get("/archive", response_model=list[ReservationOut],
+            summary="История броней пользователя, перенесенная в архив")
+async def get_archived_reservations(
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        current_user=Depends(get_current_user_read),
+        archive: ReservationArchive = Depends(get_reservation_archive)
+):
+    """
+    Returns only the latest RESERVATION_ARCHIVE_HISTORY_MONTHS archived months of [since, until):
+    older history is requested with an earlier `until`.
+    """
+    since = make_timezone_naive(since) if since else None
+    until = make_timezone_naive(until) if until else None
+    try:
+        reservations = await asyncio.to_thread(archive.user_history, current_user.id, since, until)
+    except (BotoCoreError, ClientError):
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Архив броней недоступен")
+    return ModelListResponse(ReservationOut, reservations)
+
+
 @router.get("/maximum-available-time", response_model=dict,
             summary="Получение максимально доступного времени для переноса брони")
 async def get_maximum_available_time_endpoint(
@@ -108,7 +136,10 @@ async def update_reservation(reservation_id: UUID, reservation: ReservationUpdat
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Reservation not found")
     if reservation_db.user_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You can't update this reservation")
-    updated_reservation = await reservation_repo.update_reservation(reservation_id, reservation)
+    try:
+        updated_reservation = await reservation_repo.update_reservation(reservation_id, reservation)
+    except ReservationTooLongError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     return updated_reservation
 
 
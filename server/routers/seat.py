@@ -1,16 +1,25 @@
-from typing import List
+import math
+from typing import List, Optional
 from uuid import UUID
 from datetime import date, time, datetime
 
-from fastapi import APIRouter, Depends, HTTPException, Response, Query
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, Query
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from server.backend.database import get_session
-from server.dependencies.auth_dependencies import get_current_user_from_cookie
+from server.backend.database import get_session, get_read_session, read_sessionmaker
+from server.backend.replicas import wrote_recently
+from server.dependencies.auth_dependencies import get_current_user_from_cookie, get_current_user_read
 from server.repositories.seat import SeatRepository
-from server.schemas.seat import SeatCreate, SeatOut, SeatUpdate
+from server.schemas.seat import SeatCreate, SeatNearestOut, SeatOut, SeatRecommendationOut, SeatUpdate
 from server.schemas.user import UserOut
+from server.services.seat_availability import seat_availability
+from server.services.seat_catalog import seat_catalog
+from server.services.seat_recommendation import score_seats, seat_recommender, top_seats, wanted_amenities
 from server.utils.datetime_utils import make_timezone_aware
+from server.utils.lazy_imports import lazy_import
+from server.utils.responses import ModelListResponse
+
+np = lazy_import("numpy")
 
 router = APIRouter(prefix="/seat", tags=["seat"])
 
@@ -22,6 +31,7 @@ async def create_seat_endpoint(seat_data: SeatCreate, current_user: UserOut = De
         raise HTTPException(status_code=403, detail="Доступ запрещен")
 
     seat = await SeatRepository(db).create_seat(seat_data)
+    seat_catalog.invalidate()
     return seat
 
 
@@ -35,6 +45,7 @@ async def update_seat_endpoint(seat_id: UUID, seat_data: SeatUpdate,
     seat = await SeatRepository(db).update_seat(seat_id, seat_data)
     if not seat:
         raise HTTPException(status_code=404, detail="Место не найдено")
+    seat_catalog.invalidate()
     return seat
 
 
@@ -47,11 +58,94 @@ async def delete_seat_endpoint(seat_id: UUID, current_user: UserOut = Depends(ge
     success = await SeatRepository(db).delete_seat(seat_id)
     if not success:
         raise HTTPException(status_code=404, detail="Место не найдено")
+    seat_catalog.invalidate()
     return Response(status_code=204)
 
 
+@router.get("/nearest", response_model=List[SeatNearestOut], summary="Ближайшие свободные места")
+async def get_nearest_seats(
+        start: datetime = Query(..., description="Start time (UTC)"),
+        end: datetime = Query(..., description="End time (UTC)"),
+        x: Optional[float] = Query(None, description="Точка на плане"),
+        y: Optional[float] = Query(None, description="Точка на плане"),
+        user_id: Optional[UUID] = Query(None, description="Коллега: места рядом с его бронью на это время"),
+        k: int = Query(5, ge=1, le=50),
+        current_user: UserOut = Depends(get_current_user_read),
+        session_factory: async_sessionmaker = Depends(read_sessionmaker)
+):
+    """
+    Returns the `k` free seats nearest to the point (x, y) or to the seat booked by `user_id`
+    for [start, end). The search runs over the in-memory grid index of the seat catalog.
+    """
+    if (user_id is None) == (x is None or y is None):
+        raise HTTPException(status_code=400, detail="Укажите либо x и y, либо user_id")
+    if x is not None and not (math.isfinite(x) and math.isfinite(y)):
+        raise HTTPException(status_code=400, detail="Некорректная точка")
+    start = make_timezone_aware(start)
+    end = make_timezone_aware(end)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="Начало должно быть раньше конца")
+
+    catalog = await seat_catalog.get(session_factory)
+    async with session_factory() as db:
+        repository = SeatRepository(db)
+        if user_id is not None:
+            seat_id = await repository.get_user_seat_id(user_id, start, end)
+            if seat_id not in catalog.positions:
+                raise HTTPException(status_code=404, detail="У пользователя нет брони на это время")
+            x, y = catalog.coords[catalog.positions[seat_id]].tolist()
+            if not (math.isfinite(x) and math.isfinite(y)):
+                raise HTTPException(status_code=404, detail="Место коллеги не отмечено на плане")
+        occupied = await repository.get_occupied_seat_ids(start, end)
+
+    positions, distances = catalog.index.nearest(x, y, k, allowed=catalog.mask(occupied, False))
+    seats = [{**catalog.rows[position], "is_available": True, "distance": distance}
+             for position, distance in zip(positions.tolist(), distances.tolist())]
+    return ModelListResponse(SeatNearestOut, seats)
+
+
+@router.get("/recommendations", response_model=List[SeatRecommendationOut], summary="Рекомендованные свободные места")
+async def get_recommended_seats(
+        start: datetime = Query(..., description="Start time (UTC)"),
+        end: datetime = Query(..., description="End time (UTC)"),
+        amenities: List[str] = Query([], description="Желаемые удобства: has_computer, is_quite, ..."),
+        teammates: List[UUID] = Query([], max_length=50, description="Коллеги, рядом с которыми хочется сидеть"),
+        k: int = Query(10, ge=1, le=50),
+        current_user: UserOut = Depends(get_current_user_read),
+        session_factory: async_sessionmaker = Depends(read_sessionmaker)
+):
+    """
+    Ranks the free seats of [start, end) for the current user by the wanted amenities and those of
+    the seats they usually book, the distance to the seats booked by `teammates` and their own history.
+    Every seat of the catalog is scored at once with NumPy.
+    """
+    try:
+        wanted = wanted_amenities(amenities)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    start = make_timezone_aware(start)
+    end = make_timezone_aware(end)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="Начало должно быть раньше конца")
+
+    catalog = await seat_catalog.get(session_factory)
+    preferences = await seat_recommender.preferences(session_factory, current_user.id)
+    async with session_factory() as db:
+        repository = SeatRepository(db)
+        occupied = await repository.get_occupied_seat_ids(start, end)
+        team_seats = await repository.get_seat_ids_of_users(teammates, start, end) if teammates else []
+
+    team_coords = catalog.coords[catalog.mask(team_seats)]
+    scores = score_seats(catalog, preferences, wanted, team_coords[np.isfinite(team_coords).all(axis=1)])
+    seats = [{**catalog.rows[position], "is_available": True, "score": scores.total[position],
+              "amenity_score": scores.amenities[position], "team_score": scores.team[position],
+              "history_score": scores.history[position]}
+             for position in top_seats(scores.total, catalog.mask(occupied, False), k).tolist()]
+    return ModelListResponse(SeatRecommendationOut, seats)
+
+
 @router.get("/{seat_id}", response_model=SeatOut, summary="Получение места")
-async def get_seat_endpoint(seat_id: UUID, db: AsyncSession = Depends(get_session)):
+async def get_seat_endpoint(seat_id: UUID, db: AsyncSession = Depends(get_read_session)):
     seat = await SeatRepository(db).get_by_id(seat_id)
     if not seat:
         raise HTTPException(status_code=404, detail="Место не найдено")
@@ -60,16 +154,20 @@ async def get_seat_endpoint(seat_id: UUID, db: AsyncSession = Depends(get_sessio
 
 @router.get("", response_model=List[SeatOut], summary="Получение информации о местах в заданный временной промежуток")
 async def get_seats(
+        request: Request,
         start: datetime = Query(..., description="Start time (UTC)"),
         end: datetime = Query(..., description="End time (UTC)"),
-        db: AsyncSession = Depends(get_session)
+        session_factory: async_sessionmaker = Depends(read_sessionmaker)
 ):
     start = make_timezone_aware(start)
     end = make_timezone_aware(end)
     
     print(f"API received start: {start}, end: {end}")
-    
-    seats = await SeatRepository(db).get_all(start, end)
-    if not seats:
-        return []
-    return seats
+
+    if wrote_recently(request.cookies):
+        # Клиент только что бронировал: общий результат окна мог быть посчитан до его записи
+        async with session_factory() as db:
+            seats = await SeatRepository(db).list_with_availability(start, end)
+    else:
+        seats = await seat_availability.list_with_availability(session_factory, start, end)
+    return ModelListResponse(SeatOut, seats)
@@ -1,5 +1,8 @@
 from fastapi import APIRouter
-import numpy as np
+
+from server.utils.lazy_imports import lazy_import
+
+np = lazy_import("numpy")
 
 router = APIRouter(prefix="/stats", tags=["statistics"])
 
@@ -6,8 +6,8 @@ from server.repositories.reservation import ReservationRepository
 from server.repositories.seat import SeatRepository
 from server.schemas.ticket import TicketCreate, TicketStatusUpdate, TicketOut
 from server.repositories.ticket import TicketRepository
-from server.backend.database import get_session
-from server.dependencies.auth_dependencies import get_current_user_from_cookie
+from server.backend.database import get_session, get_read_session
+from server.dependencies.auth_dependencies import get_current_user_from_cookie, get_current_user_read
 from server.schemas.user import UserOut
 from server.repositories.user import UserRepository
 from server.services.reservation import ReservationManager
@@ -46,8 +46,8 @@ async def create_ticket(
 
 @router.get("/my", response_model=list[TicketOut], summary="Получение тикетов текущего пользователя")
 async def get_user_tickets(
-        current_user: UserOut = Depends(get_current_user_from_cookie),
-        db: AsyncSession = Depends(get_session)
+        current_user: UserOut = Depends(get_current_user_read),
+        db: AsyncSession = Depends(get_read_session)
 ):
     ticket_repo = TicketRepository(db)
     result = await ticket_repo.get_user_tickets(current_user.id)
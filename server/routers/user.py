@@ -5,7 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from server.models.user import User
 from server.schemas.user import UserOut, UserUpdate
 from server.repositories.user import UserRepository
-from server.backend.database import get_session
+from server.backend.database import get_session, get_read_session
 from server.services.auth import Auth
 from server.dependencies.auth_dependencies import get_current_user_from_cookie
 
@@ -58,7 +58,7 @@ async def delete_user(
 
 @router.get("/{user_id}", response_model=UserOut, summary="Получение данных пользователя по id")
 async def get_user_by_id(user_id: UUID,
-                         db: AsyncSession = Depends(get_session)):
+                         db: AsyncSession = Depends(get_read_session)):
     user = await db.execute(select(User).where(User.id == user_id))
     user = user.scalars().first()
 
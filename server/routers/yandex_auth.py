@@ -4,14 +4,16 @@ import logging
 from fastapi import APIRouter, Depends, Request, Response
 from fastapi.responses import RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-import aiohttp
 from yarl import URL
 
 from server.backend.database import get_session
 from server.services.auth import Auth
 from server.repositories.user import UserRepository
 from server.backend.redis import get_redis_client
+from server.utils.lazy_imports import lazy_import
 
+# aiohttp нужен только обмену кода на токен, импорт стоит около 100 мс на воркер
+aiohttp = lazy_import("aiohttp")
 redis_client = get_redis_client(0)
 
 router = APIRouter(prefix="/yandex", tags=["yandex"])
@@ -1,8 +1,21 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from enum import Enum
 from typing import Optional
 from uuid import UUID
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from server.utils.datetime_utils import make_timezone_naive
+from server.utils.exceptions import ReservationTooLongError
+
+# Ограничение длины брони позволяет искать пересечения только в партициях соседних месяцев.
+# То же ограничение стоит CHECK-ом на таблице reservations, поэтому не настраивается
+RESERVATION_MAX_DURATION = timedelta(days=31)
+
+
+def check_reservation_duration(start: Optional[datetime], end: Optional[datetime]):
+    if start is not None and end is not None and \
+            make_timezone_naive(end) - make_timezone_naive(start) > RESERVATION_MAX_DURATION:
+        raise ReservationTooLongError(RESERVATION_MAX_DURATION.days)
 
 
 class ReservationStatusEnum(str, Enum):
@@ -29,6 +42,11 @@ class ReservationCreate(BaseModel):
     end: datetime
     model_config = ConfigDict(from_attributes=True)
 
+    @model_validator(mode="after")
+    def validate_duration(self):
+        check_reservation_duration(self.start, self.end)
+        return self
+
 
 class ReservationUpdate(BaseModel):
     start: Optional[datetime] = None
@@ -37,6 +55,11 @@ class ReservationUpdate(BaseModel):
     
     model_config = ConfigDict(from_attributes=True)
 
+    @model_validator(mode="after")
+    def validate_duration(self):
+        check_reservation_duration(self.start, self.end)
+        return self
+
 
 class ReservationOut(ReservationBase):
     seat_name: str
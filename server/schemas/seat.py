@@ -51,3 +51,16 @@ class SeatUpdate(BaseModel):
 
 class SeatOut(SeatBase):
     model_config = ConfigDict(from_attributes=True)
+
+
+class SeatNearestOut(SeatOut):
+    # Расстояние от точки запроса в координатах плана
+    distance: float
+
+
+class SeatRecommendationOut(SeatOut):
+    # Итоговая оценка и ее составляющие, каждая в [0, 1]
+    score: float
+    amenity_score: float
+    team_score: float
+    history_score: float
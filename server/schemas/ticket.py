@@ -27,6 +27,20 @@ class TicketBase(BaseModel):
     made_on: datetime = Field(default_factory=datetime.now)
 
 
+class TicketSearchResult(TicketBase):
+    rank: float
+
+
+class TicketClaim(TicketBase):
+    claimed_by: UUID
+    claimed_until: datetime
+
+
+class TicketExport(TicketBase):
+    seat_id: Optional[UUID] = None
+    seat_name: Optional[str] = None
+
+
 class TicketCreate(BaseModel):
     theme: TicketThemeEnum = "other"
     message: str
@@ -22,6 +22,8 @@ class UserUpdate(BaseModel):
     role: Optional[str] = Field(examples=["user"], default=None)
 
 class UserOut(UserBase):
+    # Email уже проверен при регистрации; повторная проверка EmailStr в каждом ответе дороже всей сериализации
+    email: str = Field(examples=["user1@example.com"])
     id: UUID
     verified: bool = False
 
@@ -1,7 +1,10 @@
 import os
 from datetime import datetime, timedelta
 import jwt
-from passlib.context import CryptContext
+
+from server.utils.lazy_imports import lazy_import
+
+passlib_context = lazy_import("passlib.context")
 
 # Keep these constants for default expiration time
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
@@ -9,8 +12,14 @@ REFRESH_TOKEN_EXPIRE_DAYS = 30
 
 
 class Auth:
-    def __init__(self):
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    _pwd_context = None
+
+    @property
+    def pwd_context(self):
+        # Один контекст на процесс: passlib и bcrypt загружаются при первом хешировании, а не на каждый Auth()
+        if Auth._pwd_context is None:
+            Auth._pwd_context = passlib_context.CryptContext(schemes=["bcrypt"], deprecated="auto")
+        return Auth._pwd_context
     
     def get_jwt_secret(self):
         return os.environ.get("JWT_SECRET")
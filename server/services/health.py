@@ -0,0 +1,64 @@
+import asyncio
+import os
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
+
+from server.services.s3_bucket import S3Bucket
+
+HEALTH_CHECK_TIMEOUT = float(os.getenv("HEALTH_CHECK_TIMEOUT", "2"))
+HEALTH_CACHE_TTL = float(os.getenv("HEALTH_CACHE_TTL", "5"))
+# Без этих зависимостей API работает частично: их отказ не выводит воркер из балансировки
+HEALTH_OPTIONAL_CHECKS = frozenset(filter(None, os.getenv("HEALTH_OPTIONAL_CHECKS", "s3,telegram").split(",")))
+
+
+async def check_bucket(storage: S3Bucket):
+    if not await asyncio.to_thread(storage.is_bucket_exists):
+        raise LookupError(f"Bucket {storage.bucket_name} does not exist")
+
+
+class HealthChecker:
+    """
+    Readiness of the worker: runs all checks concurrently, each limited by `timeout` seconds,
+    and caches the report for `ttl` seconds, so probes of every worker never add load to the dependencies.
+    """
+
+    def __init__(self, checks: dict[str, Callable[[], Awaitable]], timeout: float = HEALTH_CHECK_TIMEOUT,
+                 ttl: float = HEALTH_CACHE_TTL, optional: frozenset[str] = HEALTH_OPTIONAL_CHECKS):
+        self.checks = checks
+        self.timeout = timeout
+        self.ttl = ttl
+        self.optional = optional
+        self._lock = asyncio.Lock()
+        self._report = None
+        self._checked_at = 0.0
+
+    async def _run(self, name: str, check: Callable[[], Awaitable]) -> dict:
+        start = time.perf_counter()
+        result = {"status": "ok", "critical": name not in self.optional}
+        try:
+            await asyncio.wait_for(check(), self.timeout)
+        except asyncio.TimeoutError:
+            result.update(status="timeout", error=f"No answer in {self.timeout}s")
+        except Exception as e:
+            # Любая ошибка зависимости - это «не готов», а не 500 у пробы
+            result.update(status="error", error=f"{type(e).__name__}: {e}")
+        result["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        return result
+
+    async def report(self) -> dict:
+        """{"status": "ready" | "degraded" | "not_ready", "checks": {name: {...}}, "checked_at": ...}"""
+        # Одновременные пробы ждут одной проверки, а не запускают свою
+        async with self._lock:
+            if self._report is None or time.monotonic() - self._checked_at >= self.ttl:
+                results = await asyncio.gather(*(self._run(name, check) for name, check in self.checks.items()))
+                checks = dict(zip(self.checks, results))
+                failed = [result for result in checks.values() if result["status"] != "ok"]
+                if any(result["critical"] for result in failed):
+                    status = "not_ready"
+                else:
+                    status = "degraded" if failed else "ready"
+                self._report = {"status": status, "checks": checks,
+                                "checked_at": datetime.now(timezone.utc).isoformat()}
+                self._checked_at = time.monotonic()
+            return self._report
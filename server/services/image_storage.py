@@ -1,40 +1,19 @@
 import io
-import os
 import uuid
 
-import boto3
-from PIL import Image
 from botocore.exceptions import ClientError
 from fastapi import UploadFile
 
+from server.services.s3_bucket import S3_ENDPOINT_URL, S3Bucket
+from server.utils.lazy_imports import lazy_import
 
-S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL", "http://s3:8003")
-S3_ACCESS_KEY = os.getenv("S3_ACCESS_KEY", "minioadmin")
-S3_SECRET_KEY = os.getenv("S3_SECRET_KEY", "minioadmin")
+# Pillow нужен только загрузке аватаров
+Image = lazy_import("PIL.Image")
 
 
-class ImageStorage:
-    def __init__(self):
-        self.s3 = boto3.client(
-            's3',
-            endpoint_url=S3_ENDPOINT_URL,
-            aws_access_key_id=S3_ACCESS_KEY,
-            aws_secret_access_key=S3_SECRET_KEY
-        )
-        self.bucket_name = 'images'
-
-        if not self.is_bucket_exists():
-            self.create_bucket()
-
-    def is_bucket_exists(self) -> bool:
-        try:
-            self.s3.head_bucket(Bucket=self.bucket_name)
-            return True
-        except ClientError:
-            return False
-
-    def create_bucket(self):
-        self.s3.create_bucket(Bucket=self.bucket_name)
+class ImageStorage(S3Bucket):
+    def __init__(self, bucket_name: str = 'images'):
+        super().__init__(bucket_name)
 
     def upload_image(self, image: UploadFile) -> str:
         try:
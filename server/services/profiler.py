@@ -0,0 +1,157 @@
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+MAX_STACK_DEPTH = 128
+
+
+class ProfilerBusyError(Exception):
+    def __init__(self):
+        super().__init__("Профилирование уже запущено в этом воркере")
+
+    def __str__(self):
+        return self.args[0]
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler: a daemon thread periodically reads the stacks of all other
+    threads via sys._current_frames(). Nothing is hooked into the interpreter, so the
+    overhead is bounded by the sampling interval.
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.samples = Counter()
+        self.sample_count = 0
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+        self._started_at = 0.0
+
+    def start(self):
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._started_at = time.perf_counter()
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self._started_at
+        self._lock.release()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                self.samples[self._stack(names.get(thread_id, str(thread_id)), frame)] += 1
+            self.sample_count += 1
+
+    @staticmethod
+    def _stack(thread_name: str, frame) -> tuple:
+        stack = []
+        while frame is not None and len(stack) < MAX_STACK_DEPTH:
+            code = frame.f_code
+            stack.append((code.co_name, code.co_filename, frame.f_lineno))
+            frame = frame.f_back
+        stack.append((thread_name, "", 0))
+        return tuple(reversed(stack))
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's collapsed format, accepted by flamegraph.pl and speedscope."""
+        lines = []
+        for stack, count in self.samples.most_common():
+            frames = [stack[0][0]] + [f"{name} ({os.path.basename(file)}:{line})" for name, file, line in stack[1:]]
+            lines.append(f"{';'.join(frames)} {count}")
+        return "\n".join(lines)
+
+    def speedscope(self) -> dict:
+        frames = []
+        frame_index = {}
+        samples = []
+        weights = []
+        for stack, count in self.samples.most_common():
+            indexes = []
+            for frame in stack:
+                if frame not in frame_index:
+                    frame_index[frame] = len(frames)
+                    name, file, line = frame
+                    frames.append({"name": name, "file": file, "line": line} if file else {"name": name})
+                indexes.append(frame_index[frame])
+            samples.append(indexes)
+            weights.append(count * self.interval)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": f"worker {os.getpid()}",
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights
+            }],
+            "exporter": "bookit-sampling-profiler"
+        }
+
+
+class MemoryTracer:
+    """
+    Diff of tracemalloc snapshots taken at the beginning and at the end of profiling.
+    start and stop may run in different threads and in any order: a stop that comes first
+    makes a later start a no-op, a stop during start waits for it and switches tracing off.
+    """
+
+    def __init__(self, frames: int = 1):
+        self.frames = frames
+        self._started_tracing = False
+        self._first = None
+        self._stopped = False
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._stopped:
+                return
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(self.frames)
+                self._started_tracing = True
+            self._first = tracemalloc.take_snapshot()
+
+    def stop(self, limit: int = 20) -> list[dict]:
+        with self._lock:
+            self._stopped = True
+            # start не успел снять первый снимок (упал или запрос отменили): сравнивать не с чем
+            second = tracemalloc.take_snapshot() if self._first is not None else None
+            if self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+        if second is None:
+            return []
+        filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ]
+        stats = second.filter_traces(filters).compare_to(self._first.filter_traces(filters), "lineno")
+        return [
+            {
+                "location": str(stat.traceback),
+                "size_diff": stat.size_diff,
+                "size": stat.size,
+                "count_diff": stat.count_diff,
+            }
+            for stat in stats[:limit]
+        ]
@@ -1,7 +1,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 import datetime
-from server.models.reservation import Reservation
+from server.models.reservation import Reservation, RESERVATION_LOOKBACK
 from server.models.seat import Seat
 from server.utils.exceptions import UserAlreadyHasActiveReservationError
 
@@ -15,6 +15,7 @@ class ReservationManager:
         stmt = select(Reservation).filter(
             Reservation.user_id == user_id,
             Reservation.end > now,
+            Reservation.start >= now - RESERVATION_LOOKBACK,
             Reservation.status != "closed"
         )   
         result = await self.db.execute(stmt)
@@ -35,6 +36,7 @@ class ReservationManager:
         stmt = select(Reservation).filter(
             Reservation.user_id == user_id,
             Reservation.end > now,
+            Reservation.start >= now - RESERVATION_LOOKBACK,
             Reservation.status != "closed"
         )
         result = await self.db.execute(stmt)
@@ -0,0 +1,239 @@
+import asyncio
+import io
+import logging
+import os
+import re
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from time import monotonic
+from uuid import UUID
+
+from botocore.exceptions import BotoCoreError, ClientError
+from sqlalchemy import any_, bindparam, delete, func, select, text
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from server.backend.partitions import DEFAULT_PARTITION, detach_partition, list_partitions, month_start, partition_name
+from server.models.reservation import Reservation
+from server.repositories.reservation import ReservationRepository
+from server.schemas.reservation import ReservationStatusEnum
+from server.services.s3_bucket import S3Bucket
+from server.utils.lazy_imports import lazy_import
+
+np = lazy_import("numpy")
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_BUCKET = os.getenv("RESERVATION_ARCHIVE_BUCKET", "reservations-archive")
+# Завершенные брони старше горизонта уезжают из Postgres целыми месяцами; 0 выключает архивацию
+ARCHIVE_AFTER = timedelta(days=int(os.getenv("RESERVATION_ARCHIVE_AFTER_DAYS", "180")))
+ARCHIVE_INTERVAL = float(os.getenv("RESERVATION_ARCHIVE_INTERVAL", str(24 * 60 * 60)))
+ARCHIVE_CACHE_MONTHS = int(os.getenv("RESERVATION_ARCHIVE_CACHE_MONTHS", "12"))
+# Месяцы добавляются раз в ARCHIVE_INTERVAL: запросы истории не перечисляют бакет каждый раз
+ARCHIVE_LISTING_TTL = float(os.getenv("RESERVATION_ARCHIVE_LISTING_TTL", "300"))
+# Запрос истории читает не больше стольких последних месяцев диапазона, более старые - через until
+ARCHIVE_HISTORY_MONTHS = int(os.getenv("RESERVATION_ARCHIVE_HISTORY_MONTHS", "12"))
+ARCHIVED_STATUSES = (ReservationStatusEnum.CLOSED.value, ReservationStatusEnum.DID_NOT_COME.value)
+
+# Колонки месяца в архиве: UUID - hex-строки, время - datetime64[us]; строки отсортированы по user_id
+ARCHIVE_COLUMNS = ("id", "user_id", "seat_id", "start", "end", "status", "seat_name")
+_UUID_COLUMNS = ("id", "user_id", "seat_id")
+_TIME_COLUMNS = ("start", "end")
+_KEY_PREFIX = "reservations/"
+_KEY = re.compile(rf"^{_KEY_PREFIX}(\d{{4}})-(\d{{2}})\.npz$")
+
+
+class ArchiveConflictError(Exception):
+    def __init__(self, month: date):
+        super().__init__(f"Reservations were added to {month:%Y-%m} while it was being archived")
+
+
+def encode_rows(rows: list[dict]) -> bytes:
+    """Rows of one month as a compressed .npz: an array per column, sorted by user_id"""
+    rows = sorted(rows, key=lambda row: row["user_id"].hex)
+    columns = {}
+    for name in ARCHIVE_COLUMNS:
+        values = [row[name] for row in rows]
+        if name in _UUID_COLUMNS:
+            columns[name] = np.array([value.hex for value in values], dtype="U32")
+        elif name in _TIME_COLUMNS:
+            columns[name] = np.array(values, dtype="datetime64[us]")
+        else:
+            columns[name] = np.array(values, dtype=str)
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **columns)
+    return buffer.getvalue()
+
+
+def decode_rows(data: bytes) -> dict[str, "np.ndarray"]:
+    with np.load(io.BytesIO(data), allow_pickle=False) as archive:
+        return {name: archive[name] for name in ARCHIVE_COLUMNS}
+
+
+def rows_of(columns: dict[str, "np.ndarray"], index: slice = slice(None)) -> list[dict]:
+    values = {name: columns[name][index].tolist() for name in ARCHIVE_COLUMNS}
+    for name in _UUID_COLUMNS:
+        values[name] = [UUID(value) for value in values[name]]
+    return [dict(zip(ARCHIVE_COLUMNS, row)) for row in zip(*values.values())]
+
+
+def user_rows(columns: dict[str, "np.ndarray"], user_id: UUID) -> list[dict]:
+    """Rows of one user: a binary search over the sorted user_id column"""
+    user_ids = columns["user_id"]
+    first = np.searchsorted(user_ids, user_id.hex, side="left")
+    last = np.searchsorted(user_ids, user_id.hex, side="right")
+    return rows_of(columns, slice(first, last))
+
+
+def _month_bounds(month: date) -> tuple[datetime, datetime]:
+    return datetime.combine(month, time()), datetime.combine(month_start(month, 1), time())
+
+
+class ReservationArchive(S3Bucket):
+    """Archived reservations in S3: one compressed columnar object per month of start"""
+
+    def __init__(self, bucket_name: str = ARCHIVE_BUCKET, cache_months: int = ARCHIVE_CACHE_MONTHS,
+                 listing_ttl: float = ARCHIVE_LISTING_TTL):
+        super().__init__(bucket_name)
+        # Объект месяца меняется только повторной архивацией, а вместе с ним и ETag
+        self._load = lru_cache(maxsize=cache_months)(self._download)
+        self.listing_ttl = listing_ttl
+        self._months: dict[date, str] | None = None
+        self._listed_at = 0.0
+
+    @staticmethod
+    def month_key(month: date) -> str:
+        return f"{_KEY_PREFIX}{month:%Y-%m}.npz"
+
+    def list_months(self) -> dict[date, str]:
+        """{month: ETag} of every archived month, listed at most once per `listing_ttl`"""
+        if self._months is None or monotonic() - self._listed_at >= self.listing_ttl:
+            self._months = self._list_objects()
+            self._listed_at = monotonic()
+        return self._months
+
+    def _list_objects(self) -> dict[date, str]:
+        months = {}
+        pages = self.s3.get_paginator("list_objects_v2").paginate(Bucket=self.bucket_name, Prefix=_KEY_PREFIX)
+        for page in pages:
+            for item in page.get("Contents", []):
+                match = _KEY.match(item["Key"])
+                if match:
+                    months[date(int(match[1]), int(match[2]), 1)] = item["ETag"]
+        return months
+
+    def _download(self, month: date, etag: str) -> dict[str, "np.ndarray"]:
+        response = self.s3.get_object(Bucket=self.bucket_name, Key=self.month_key(month))
+        return decode_rows(response["Body"].read())
+
+    def write_month(self, month: date, rows: list[dict]) -> int:
+        """Stores `rows` of `month` merged with the rows already archived for it, e.g. by a run that failed to delete"""
+        try:
+            response = self.s3.get_object(Bucket=self.bucket_name, Key=self.month_key(month))
+            existing = rows_of(decode_rows(response["Body"].read()))
+        except ClientError as e:
+            if e.response["Error"]["Code"] not in ("NoSuchKey", "404"):
+                raise
+            existing = []
+        merged = {row["id"]: row for row in existing + rows}
+        self.s3.put_object(Bucket=self.bucket_name, Key=self.month_key(month), Body=encode_rows(list(merged.values())))
+        self._months = None
+        return len(merged)
+
+    def user_history(self, user_id: UUID, since: datetime | None = None, until: datetime | None = None,
+                     max_months: int = ARCHIVE_HISTORY_MONTHS) -> list[dict]:
+        """
+        Archived reservations of `user_id` starting within [since, until), oldest first.
+        Only the latest `max_months` archived months of the range are read; older ones need an earlier `until`.
+        """
+        months = []
+        for month, etag in sorted(self.list_months().items()):
+            month_begin, month_end = _month_bounds(month)
+            if (since is not None and month_end <= since) or (until is not None and month_begin >= until):
+                continue
+            months.append((month, etag))
+        rows = []
+        for month, etag in months[-max_months:]:
+            rows += user_rows(self._load(month, etag), user_id)
+        rows = [row for row in rows
+                if (since is None or row["start"] >= since) and (until is None or row["start"] < until)]
+        return sorted(rows, key=lambda row: row["start"])
+
+
+async def archive_month(engine: AsyncEngine, archive: ReservationArchive, month: date) -> int:
+    """
+    Moves closed and did_not_come reservations starting in `month` from Postgres to the archive.
+    The object is written before the rows are deleted: after a failure they stay in Postgres and the next run merges.
+    A month left without reservations loses its partition (DETACH + DROP) instead of a DELETE;
+    a month without a partition of its own is archived from the default partition row by row.
+    Rows are read in one short transaction and deleted in another; the S3 write runs outside both.
+    """
+    month_begin, month_end = _month_bounds(month)
+    in_month = (Reservation.start >= month_begin, Reservation.start < month_end)
+    count_in_month = select(func.count()).select_from(Reservation).where(*in_month)
+    async with engine.begin() as lock:
+        # Воркеры приложения архивируют месяц по очереди. Транзакция держит только advisory-блокировку и не трогает
+        # таблиц, поэтому может ждать S3; блокировка сессии не пережила бы PgBouncer в режиме транзакций
+        if not await lock.scalar(text("SELECT pg_try_advisory_xact_lock(hashtext(:key))"),
+                                 {"key": archive.month_key(month)}):
+            return 0
+
+        async with engine.begin() as connection:
+            # Без своей партиции (снята предыдущим запуском или не создавалась) брони месяца лежат в DEFAULT
+            has_partition = partition_name(month) in {p.name for p in await list_partitions(connection)}
+            result = await connection.execute(
+                ReservationRepository._with_seat_names().where(*in_month, Reservation.status.in_(ARCHIVED_STATUSES))
+            )
+            rows = [dict(row._mapping) for row in result]
+            total = await connection.scalar(count_in_month)
+
+        if rows:
+            await asyncio.to_thread(archive.write_month, month, rows)
+
+        async with engine.begin() as connection:
+            # Пока писался архив, в месяц могли добавиться брони: тогда партиция остается, удаляются только записанные
+            if has_partition and len(rows) == total and await connection.scalar(count_in_month) == total:
+                name = await detach_partition(connection, month)
+                # После DETACH в месяц никто не пишет: проверяем, что между подсчетом и DETACH ничего не добавилось
+                if await connection.scalar(text(f"SELECT count(*) FROM {name}")) != total:
+                    raise ArchiveConflictError(month)
+                await connection.execute(text(f"DROP TABLE {name}"))
+            elif rows:
+                ids = bindparam("ids", [row["id"] for row in rows], type_=ARRAY(PG_UUID(as_uuid=True)))
+                await connection.execute(delete(Reservation).where(*in_month, Reservation.id == any_(ids)))
+    return len(rows)
+
+
+async def archive_reservations(engine: AsyncEngine, archive: ReservationArchive, horizon: timedelta = ARCHIVE_AFTER,
+                               today: date | None = None) -> dict[date, int]:
+    """
+    Archives every month of reservations that ended more than `horizon` ago, both monthly partitions
+    and old rows of the default partition. Returns {month: archived rows}
+    """
+    cutoff = month_start((today or date.today()) - horizon)
+    async with engine.connect() as connection:
+        months = {partition.month for partition in await list_partitions(connection) if partition.month < cutoff}
+        result = await connection.execute(
+            text(f"SELECT DISTINCT date_trunc('month', start)::date FROM {DEFAULT_PARTITION} WHERE start < :cutoff"),
+            {"cutoff": datetime.combine(cutoff, time())}
+        )
+        months.update(result.scalars())
+    months = sorted(months)
+    return {month: await archive_month(engine, archive, month) for month in months}
+
+
+async def run_reservation_archival(engine: AsyncEngine, archive: ReservationArchive,
+                                   interval: float = ARCHIVE_INTERVAL):
+    """Background task: `archive_reservations` every `interval` seconds"""
+    while True:
+        try:
+            if not archive.bucket_ready:
+                await asyncio.to_thread(archive.ensure_bucket)
+            archived = await archive_reservations(engine, archive)
+            if any(archived.values()):
+                logger.info("Archived reservations: %s",
+                            ", ".join(f"{month:%Y-%m}: {count}" for month, count in archived.items()))
+        except (SQLAlchemyError, BotoCoreError, ClientError, ArchiveConflictError, OSError) as e:
+            logger.warning("Reservation archival failed: %s", e)
+        await asyncio.sleep(interval)
@@ -0,0 +1,60 @@
+import os
+import threading
+
+from botocore.exceptions import ClientError
+
+from server.utils.lazy_imports import lazy_import
+
+# boto3 нужен только запросам к S3, импорт стоит около 130 мс на воркер
+boto3 = lazy_import("boto3")
+botocore_config = lazy_import("botocore.config")
+
+
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL", "http://s3:8003")
+S3_ACCESS_KEY = os.getenv("S3_ACCESS_KEY", "minioadmin")
+S3_SECRET_KEY = os.getenv("S3_SECRET_KEY", "minioadmin")
+# По умолчанию botocore ждет соединения 60 секунд: недоступный S3 держал бы запросы и проверку бакета
+S3_CONNECT_TIMEOUT = float(os.getenv("S3_CONNECT_TIMEOUT", "3"))
+S3_MAX_ATTEMPTS = int(os.getenv("S3_MAX_ATTEMPTS", "3"))
+
+
+class S3Bucket:
+    """One S3 bucket: a lazily created client and the check that the bucket exists"""
+
+    def __init__(self, bucket_name: str):
+        # Клиент создается при первом обращении, бакет проверяет ensure_bucket в фоне: старт воркера не ждет S3
+        self.bucket_name = bucket_name
+        self.bucket_ready = False
+        self._s3 = None
+        self._lock = threading.Lock()
+
+    @property
+    def s3(self):
+        if self._s3 is None:
+            with self._lock:
+                if self._s3 is None:
+                    self._s3 = boto3.client(
+                        's3',
+                        endpoint_url=S3_ENDPOINT_URL,
+                        aws_access_key_id=S3_ACCESS_KEY,
+                        aws_secret_access_key=S3_SECRET_KEY,
+                        config=botocore_config.Config(connect_timeout=S3_CONNECT_TIMEOUT,
+                                      retries={'max_attempts': S3_MAX_ATTEMPTS, 'mode': 'standard'})
+                    )
+        return self._s3
+
+    def ensure_bucket(self):
+        """Creates the bucket if it is missing; raises BotoCoreError/ClientError while S3 is unavailable"""
+        if not self.is_bucket_exists():
+            self.create_bucket()
+        self.bucket_ready = True
+
+    def is_bucket_exists(self) -> bool:
+        try:
+            self.s3.head_bucket(Bucket=self.bucket_name)
+            return True
+        except ClientError:
+            return False
+
+    def create_bucket(self):
+        self.s3.create_bucket(Bucket=self.bucket_name)
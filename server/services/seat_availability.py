@@ -0,0 +1,79 @@
+import logging
+import os
+import time
+from datetime import datetime
+
+import orjson
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from server.backend.metrics import seat_availability_requests_total
+from server.backend.redis import get_redis_client
+from server.repositories.seat import SeatRepository
+from server.utils.datetime_utils import make_timezone_naive
+from server.utils.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Общий для воркеров кеш ответа в Redis, секунды; 0 оставляет только объединение запросов внутри воркера
+SEAT_AVAILABILITY_CACHE_TTL = float(os.getenv("SEAT_AVAILABILITY_CACHE_TTL", "1"))
+SEAT_AVAILABILITY_REDIS_DB = int(os.getenv("SEAT_AVAILABILITY_REDIS_DB", "3"))
+SEAT_AVAILABILITY_REDIS_BACKOFF = float(os.getenv("SEAT_AVAILABILITY_REDIS_BACKOFF", "5"))
+_KEY_PREFIX = "seat_availability:"
+
+
+class SeatAvailabilityCache:
+    """
+    `SeatRepository.list_with_availability` for the thundering herd at the start of the day:
+    identical windows requested concurrently in a worker share one query (SingleFlight), and its rows
+    are kept in Redis for `ttl` seconds, so other workers asking for the same window skip the database too.
+    Redis errors fall back to the database and pause the cache for `backoff` seconds.
+    """
+
+    def __init__(self, client=None, ttl: float = SEAT_AVAILABILITY_CACHE_TTL,
+                 backoff: float = SEAT_AVAILABILITY_REDIS_BACKOFF):
+        self.ttl = ttl
+        self.backoff = backoff
+        self.client = client if client is not None or not ttl else get_redis_client(SEAT_AVAILABILITY_REDIS_DB)
+        self._flight = SingleFlight()
+        self._redis_down_until = 0.0
+
+    def _redis_available(self) -> bool:
+        return self.client is not None and time.monotonic() >= self._redis_down_until
+
+    def _redis_failed(self, e: Exception):
+        logger.warning("Seat availability cache: Redis is unavailable for %ss: %s", self.backoff, e)
+        self._redis_down_until = time.monotonic() + self.backoff
+
+    async def list_with_availability(self, session_factory: async_sessionmaker, start: datetime,
+                                     end: datetime) -> list[dict]:
+        window = (make_timezone_naive(start), make_timezone_naive(end))
+        source = "shared" if self._flight.in_flight(window) else None
+        rows, loaded_from = await self._flight.do(window, lambda: self._load(session_factory, *window))
+        seat_availability_requests_total.labels(source or loaded_from).inc()
+        return rows
+
+    async def _load(self, session_factory: async_sessionmaker, start: datetime, end: datetime) -> tuple[list[dict], str]:
+        key = f"{_KEY_PREFIX}{start.isoformat()}/{end.isoformat()}"
+        if self._redis_available():
+            try:
+                cached = await self.client.get(key)
+            except (RedisError, OSError) as e:
+                self._redis_failed(e)
+            else:
+                if cached is not None:
+                    return orjson.loads(cached), "cache"
+
+        # Своя сессия, а не сессия первого запроса: ее закрытие не должно обрывать запрос для остальных
+        async with session_factory() as db:
+            rows = await SeatRepository(db).list_with_availability(start, end)
+
+        if self._redis_available():
+            try:
+                await self.client.set(key, orjson.dumps(rows), px=int(self.ttl * 1000))
+            except (RedisError, OSError) as e:
+                self._redis_failed(e)
+        return rows, "db"
+
+
+seat_availability = SeatAvailabilityCache()
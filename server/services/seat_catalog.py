@@ -0,0 +1,187 @@
+import math
+import os
+import time
+from typing import Iterable
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from server.repositories.seat import SeatRepository
+from server.utils.lazy_imports import lazy_import
+from server.utils.single_flight import SingleFlight
+
+np = lazy_import("numpy")
+
+# Каталог мест перечитывается из базы не реже чем раз в SEAT_CATALOG_MAX_AGE секунд;
+# изменения мест в этом воркере сбрасывают его сразу
+SEAT_CATALOG_MAX_AGE = float(os.getenv("SEAT_CATALOG_MAX_AGE", "60"))
+# Среднее число мест в ячейке сетки
+SEAT_INDEX_CELL_SEATS = float(os.getenv("SEAT_INDEX_CELL_SEATS", "2"))
+SEAT_AMENITIES = ("has_computer", "has_water", "has_kitchen", "has_smart_desk", "is_quite", "is_talk_room")
+# Дальше стольких колец ячеек вокруг точки поиск переходит на полный проход
+SEAT_INDEX_MAX_RINGS = 6
+
+
+class SeatIndex:
+    """
+    Uniform grid over seat coordinates. Seats are sorted by cell, so every column of cells
+    is one slice of `order`; a query walks square rings of cells around the point and stops
+    once the k-th nearest allowed seat is closer than anything outside the visited square.
+    Seats without coordinates are not indexed.
+    """
+
+    def __init__(self, coords: "np.ndarray", seats_per_cell: float = SEAT_INDEX_CELL_SEATS):
+        self.coords = coords
+        indexed = np.flatnonzero(np.isfinite(coords).all(axis=1))
+        self.size = len(indexed)
+        points = coords[indexed]
+        self.origin = points.min(axis=0) if self.size else np.zeros(2)
+        extent = points.max(axis=0) - self.origin if self.size else np.zeros(2)
+        # Квадратная ячейка на seats_per_cell мест; для мест в одну линию площадь нулевая, считаем по длине
+        per_cell = seats_per_cell / max(self.size, 1)
+        self.cell_size = max(math.sqrt(extent[0] * extent[1] * per_cell), float(extent.max()) * per_cell) or 1.0
+        self.columns, self.rows = ((extent // self.cell_size).astype(int) + 1).tolist()
+
+        cells = self._cells(points)
+        flat = cells[:, 0] * self.rows + cells[:, 1]
+        by_cell = np.argsort(flat, kind="stable")
+        self.order = indexed[by_cell]
+        # Границы ячеек списком: индексация numpy-массива по одному элементу в цикле запроса дороже
+        self._starts = np.searchsorted(flat[by_cell], np.arange(self.columns * self.rows + 1)).tolist()
+
+    def _cells(self, points: "np.ndarray") -> "np.ndarray":
+        cells = ((points - self.origin) // self.cell_size).astype(int)
+        return np.clip(cells, 0, (self.columns - 1, self.rows - 1))
+
+    def _column(self, column: int, first_row: int, last_row: int) -> tuple[int, int]:
+        """Range of `order` with the seats of cells [first_row, last_row] of `column`, clipped to the grid"""
+        if not 0 <= column < self.columns:
+            return 0, 0
+        first_row, last_row = max(first_row, 0), min(last_row, self.rows - 1)
+        if first_row > last_row:
+            return 0, 0
+        base = column * self.rows
+        return self._starts[base + first_row], self._starts[base + last_row + 1]
+
+    def _ring(self, column: int, row: int, radius: int) -> "np.ndarray":
+        """Seats of the cells exactly `radius` cells away from (column, row)"""
+        if radius == 0:
+            ranges = [self._column(column, row, row)]
+        else:
+            ranges = [self._column(column - radius, row - radius, row + radius),
+                      self._column(column + radius, row - radius, row + radius)]
+            for inner in range(column - radius + 1, column + radius):
+                ranges.append(self._column(inner, row - radius, row - radius))
+                ranges.append(self._column(inner, row + radius, row + radius))
+        return np.concatenate([self.order[first:last] for first, last in ranges if first < last] or [self.order[:0]])
+
+    def nearest(self, x: float, y: float, k: int, allowed: "np.ndarray | None" = None) -> tuple["np.ndarray", "np.ndarray"]:
+        """
+        Positions (in `coords`) of the `k` nearest seats to (x, y) for which `allowed` is True,
+        and their distances, nearest first
+        """
+        point = np.array([x, y], dtype=float)
+        origin_x, origin_y = self.origin.tolist()
+        column = min(max(int((x - origin_x) // self.cell_size), 0), self.columns - 1)
+        row = min(max(int((y - origin_y) // self.cell_size), 0), self.rows - 1)
+        found = []
+        count = 0
+        candidates = distances = None
+        max_radius = max(column, self.columns - 1 - column, row, self.rows - 1 - row)
+        for radius in range(max_radius + 1):
+            if radius > SEAT_INDEX_MAX_RINGS or (2 * radius + 1) ** 2 * 4 > self.columns * self.rows:
+                # Свободных мест рядом мало или точка далеко за планом: один векторный проход по всем местам дешевле колец
+                found = [self.order if allowed is None else self.order[allowed[self.order]]]
+                count = len(found[0])
+                break
+            part = self._ring(column, row, radius)
+            if allowed is not None:
+                part = part[allowed[part]]
+            if part.size:
+                found.append(part)
+                count += part.size
+            if count >= k:
+                candidates = np.concatenate(found)
+                distances = np.hypot(*(self.coords[candidates] - point).T)
+                # Любое место за пределами пройденного квадрата не ближе расстояния до его границы;
+                # за сторонами, упершимися в край сетки, мест нет
+                sides = []
+                if column - radius > 0:
+                    sides.append(x - origin_x - (column - radius) * self.cell_size)
+                if row - radius > 0:
+                    sides.append(y - origin_y - (row - radius) * self.cell_size)
+                if column + radius < self.columns - 1:
+                    sides.append(origin_x + (column + radius + 1) * self.cell_size - x)
+                if row + radius < self.rows - 1:
+                    sides.append(origin_y + (row + radius + 1) * self.cell_size - y)
+                if np.partition(distances, k - 1)[k - 1] <= min(sides, default=math.inf):
+                    break
+        if not found:
+            return self.order[:0], np.empty(0)
+        if candidates is None or len(candidates) != count:
+            candidates = np.concatenate(found)
+            distances = np.hypot(*(self.coords[candidates] - point).T)
+        if len(distances) > k:
+            closest = np.argpartition(distances, k - 1)[:k]
+            candidates, distances = candidates[closest], distances[closest]
+        nearest = np.argsort(distances, kind="stable")
+        return candidates[nearest], distances[nearest]
+
+
+class SeatCatalog:
+    """All seats as rows plus column arrays aligned with them, for vectorized lookups over the whole office"""
+
+    def __init__(self, rows: list[dict]):
+        self.rows = rows
+        self.ids = [row["id"] for row in rows]
+        self.positions = {seat_id: position for position, seat_id in enumerate(self.ids)}
+        self.coords = np.array([(row["x"], row["y"]) for row in rows], dtype=float).reshape(-1, 2)
+        # Удобства места по столбцам SEAT_AMENITIES, 1.0 - есть
+        self.amenities = np.array([[bool(row[name]) for name in SEAT_AMENITIES] for row in rows],
+                                  dtype=float).reshape(-1, len(SEAT_AMENITIES))
+        self.index = SeatIndex(self.coords)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def mask(self, seat_ids: Iterable[UUID], value: bool = True) -> "np.ndarray":
+        """Boolean array over the catalog: `value` for `seat_ids`, the opposite for the rest"""
+        mask = np.full(len(self.rows), not value)
+        positions = [self.positions[seat_id] for seat_id in seat_ids if seat_id in self.positions]
+        mask[positions] = value
+        return mask
+
+
+class SeatCatalogCache:
+    """Catalog shared by the requests of a worker, reloaded at most every `max_age` seconds or after `invalidate`"""
+
+    def __init__(self, max_age: float = SEAT_CATALOG_MAX_AGE):
+        self.max_age = max_age
+        self._catalog = None
+        self._loaded_at = 0.0
+        # Растет при каждом invalidate: загрузка, начатая раньше, не попадает в кэш
+        self._generation = 0
+        self._flight = SingleFlight()
+
+    def invalidate(self):
+        self._generation += 1
+        self._catalog = None
+
+    async def get(self, session_factory: async_sessionmaker) -> SeatCatalog:
+        catalog = self._catalog
+        if catalog is None or time.monotonic() - self._loaded_at >= self.max_age:
+            generation = self._generation
+            # Запросы после invalidate не присоединяются к загрузке, которая могла прочитать места до изменения
+            catalog = await self._flight.do(generation, lambda: self._load(session_factory))
+            if generation == self._generation:
+                self._catalog = catalog
+                self._loaded_at = time.monotonic()
+        return catalog
+
+    @staticmethod
+    async def _load(session_factory: async_sessionmaker) -> SeatCatalog:
+        async with session_factory() as db:
+            return SeatCatalog(await SeatRepository(db).list_catalog())
+
+
+seat_catalog = SeatCatalogCache()
@@ -0,0 +1,151 @@
+import os
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from server.repositories.reservation import ReservationRepository
+from server.services.seat_catalog import SEAT_AMENITIES, SeatCatalog
+from server.utils.lazy_imports import lazy_import
+from server.utils.single_flight import SingleFlight
+
+np = lazy_import("numpy")
+
+# Вклад составляющих в итоговую оценку места, каждая составляющая в [0, 1]
+SEAT_RECOMMENDATION_AMENITY_WEIGHT = float(os.getenv("SEAT_RECOMMENDATION_AMENITY_WEIGHT", "1"))
+SEAT_RECOMMENDATION_TEAM_WEIGHT = float(os.getenv("SEAT_RECOMMENDATION_TEAM_WEIGHT", "1"))
+SEAT_RECOMMENDATION_HISTORY_WEIGHT = float(os.getenv("SEAT_RECOMMENDATION_HISTORY_WEIGHT", "0.5"))
+# Расстояние до ближайшего коллеги в координатах плана, на котором командная оценка падает вдвое
+SEAT_RECOMMENDATION_TEAM_DISTANCE = float(os.getenv("SEAT_RECOMMENDATION_TEAM_DISTANCE", "10"))
+# Предпочтения пользователя перечитываются из базы не реже; брони через этот воркер учитываются сразу
+SEAT_PREFERENCES_MAX_AGE = float(os.getenv("SEAT_PREFERENCES_MAX_AGE", "3600"))
+SEAT_PREFERENCES_CACHE_USERS = int(os.getenv("SEAT_PREFERENCES_CACHE_USERS", "10000"))
+
+
+class SeatScores(NamedTuple):
+    total: "np.ndarray"
+    amenities: "np.ndarray"
+    team: "np.ndarray"
+    history: "np.ndarray"
+
+
+class UserPreferences:
+    """
+    Booking history of a user: reservations per seat, plus the same counts as arrays aligned with
+    a seat catalog (bookings per seat and the sum of amenities of booked seats). The arrays are
+    rebuilt only when the catalog is reloaded; a new reservation updates them in place.
+    """
+
+    def __init__(self, seat_counts: dict[UUID, int]):
+        self.seat_counts = seat_counts
+        self.loaded_at = time.monotonic()
+        self.catalog = None
+        self.history = None
+        self.amenity_sum = None
+
+    def aligned(self, catalog: SeatCatalog) -> "UserPreferences":
+        if self.catalog is not catalog:
+            self.catalog = catalog
+            self.history = np.zeros(len(catalog))
+            for seat_id, count in self.seat_counts.items():
+                if seat_id in catalog.positions:
+                    self.history[catalog.positions[seat_id]] = count
+            self.amenity_sum = self.history @ catalog.amenities
+        return self
+
+    def add(self, seat_id: UUID):
+        self.seat_counts[seat_id] = self.seat_counts.get(seat_id, 0) + 1
+        if self.catalog is not None and seat_id in self.catalog.positions:
+            position = self.catalog.positions[seat_id]
+            self.history[position] += 1
+            self.amenity_sum += self.catalog.amenities[position]
+
+    @property
+    def amenity_preference(self) -> "np.ndarray":
+        """Share of the user's bookings with each amenity"""
+        total = self.history.sum()
+        return self.amenity_sum / total if total else self.amenity_sum
+
+
+def score_seats(catalog: SeatCatalog, preferences: UserPreferences, wanted: "np.ndarray",
+                team_coords: "np.ndarray", team_distance: float = SEAT_RECOMMENDATION_TEAM_DISTANCE) -> SeatScores:
+    """
+    Scores of every seat of the catalog, each part in [0, 1]:
+    amenities - weighted share of the wanted amenities (`wanted` plus the user's history) the seat has;
+    team - 1 / (1 + d / team_distance) for the distance d to the nearest teammate's seat;
+    history - bookings of the seat by the user relative to their favourite seat.
+    """
+    preferences.aligned(catalog)
+    amenity_weights = np.maximum(wanted, preferences.amenity_preference)
+    amenity_total = amenity_weights.sum()
+    amenities = catalog.amenities @ amenity_weights / amenity_total if amenity_total else np.zeros(len(catalog))
+
+    if len(team_coords):
+        # Цикл по коллегам (их единицы), каждый шаг - по всем местам сразу: без временной матрицы мест x коллег
+        xs, ys = catalog.coords.T
+        nearest = np.full(len(catalog), np.inf)
+        for x, y in team_coords.tolist():
+            np.fmin(nearest, (xs - x) ** 2 + (ys - y) ** 2, out=nearest)
+        team = 1 / (1 + np.sqrt(nearest) / team_distance)
+    else:
+        team = np.zeros(len(catalog))
+
+    favourite = preferences.history.max(initial=0)
+    history = preferences.history / favourite if favourite else np.zeros(len(catalog))
+
+    total = (SEAT_RECOMMENDATION_AMENITY_WEIGHT * amenities + SEAT_RECOMMENDATION_TEAM_WEIGHT * team
+             + SEAT_RECOMMENDATION_HISTORY_WEIGHT * history)
+    return SeatScores(total, amenities, team, history)
+
+
+def top_seats(scores: "np.ndarray", allowed: "np.ndarray", k: int) -> "np.ndarray":
+    """Positions of the `k` best allowed seats, best first; equal scores are ordered by catalog position"""
+    candidates = np.flatnonzero(allowed)
+    if len(candidates) > k:
+        # Полная сортировка не нужна: отбираем k лучших за линейное время и сортируем только их
+        best = np.argpartition(-scores[candidates], k - 1)[:k]
+        candidates = np.sort(candidates[best])
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+class SeatRecommender:
+    """Per-user preferences cached in a worker (LRU of `max_users`), reloaded after `max_age` seconds"""
+
+    def __init__(self, max_age: float = SEAT_PREFERENCES_MAX_AGE, max_users: int = SEAT_PREFERENCES_CACHE_USERS):
+        self.max_age = max_age
+        self.max_users = max_users
+        self._preferences: OrderedDict[UUID, UserPreferences] = OrderedDict()
+        self._flight = SingleFlight()
+
+    async def preferences(self, session_factory: async_sessionmaker, user_id: UUID) -> UserPreferences:
+        preferences = self._preferences.get(user_id)
+        if preferences is None or time.monotonic() - preferences.loaded_at >= self.max_age:
+            preferences = await self._flight.do(user_id, lambda: self._load(session_factory, user_id))
+            self._preferences[user_id] = preferences
+            if len(self._preferences) > self.max_users:
+                self._preferences.popitem(last=False)
+        self._preferences.move_to_end(user_id)
+        return preferences
+
+    @staticmethod
+    async def _load(session_factory: async_sessionmaker, user_id: UUID) -> UserPreferences:
+        async with session_factory() as db:
+            return UserPreferences(await ReservationRepository(db).count_by_seat(user_id))
+
+    def record(self, user_id: UUID, seat_id: UUID):
+        """New reservation of `user_id`: updates the cached preferences instead of reloading them"""
+        preferences = self._preferences.get(user_id)
+        if preferences is not None:
+            preferences.add(seat_id)
+
+
+seat_recommender = SeatRecommender()
+
+
+def wanted_amenities(names: list[str]) -> "np.ndarray":
+    unknown = set(names) - set(SEAT_AMENITIES)
+    if unknown:
+        raise ValueError(f"Unknown amenities: {', '.join(sorted(unknown))}")
+    return np.array([name in names for name in SEAT_AMENITIES], dtype=float)
@@ -3,7 +3,8 @@ from uuid import UUID
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from server.models.reservation import Reservation
+from server.models.reservation import Reservation, starts_near
+from server.utils.datetime_utils import make_timezone_naive
 
 
 class SeatsManager:
@@ -14,7 +15,10 @@ class SeatsManager:
         return dt if dt.tzinfo else dt.replace(tzinfo=datetime.timezone.utc)
 
     async def is_available(self, seat_id: UUID, start: datetime.datetime, end: datetime.datetime) -> bool:
-        stmt = select(Reservation).where(Reservation.seat_id == seat_id)
+        stmt = select(Reservation).where(
+            Reservation.seat_id == seat_id,
+            starts_near(make_timezone_naive(start), make_timezone_naive(end))
+        )
         result = await self.db.execute(stmt)
         reservations = result.scalars().all()
         for reservation in reservations:
@@ -26,7 +30,9 @@ class SeatsManager:
         return True
 
     async def get_occupied_seats(self, start: datetime.datetime, end: datetime.datetime) -> list:
-        result = await self.db.execute(select(Reservation))
+        result = await self.db.execute(
+            select(Reservation).where(starts_near(make_timezone_naive(start), make_timezone_naive(end)))
+        )
         reservations = result.scalars().all()
         occupied_seats = set()
         for reservation in reservations:
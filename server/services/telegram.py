@@ -1,11 +1,22 @@
-import httpx
+import os
 
 from server.models.ticket import Ticket
 from server.repositories.user import UserRepository
+from server.utils.lazy_imports import lazy_import
+
+httpx = lazy_import("httpx")
+
+TELEGRAM_SERVICE_URL = os.getenv("TELEGRAM_SERVICE_URL", "http://telegram:8010")
+
+
+async def check_telegram_service(timeout: float = 2):
+    async with httpx.AsyncClient(timeout=timeout) as client:
+        response = await client.get(f"{TELEGRAM_SERVICE_URL}/status")
+        response.raise_for_status()
 
 
 class TelegramSender:
-    def __init__(self, db, endpoint: str = "http://telegram:8010/send_message"):
+    def __init__(self, db, endpoint: str = f"{TELEGRAM_SERVICE_URL}/send_message"):
         self.endpoint = endpoint
         self.db = db
 
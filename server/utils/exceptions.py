@@ -18,3 +18,12 @@ class UserAlreadyHasActiveReservationError(Exception):
 
     def __str__(self):
         return self.args[0]
+
+class ReservationTooLongError(ValueError):
+    def __init__(self, max_days=31):
+        self.max_days = max_days
+        message = f"Бронь не может быть длиннее {max_days} дней"
+        super().__init__(message)
+
+    def __str__(self):
+        return self.args[0]
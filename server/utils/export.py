@@ -0,0 +1,74 @@
+import csv
+import io
+from enum import Enum
+from typing import AsyncIterator, Callable
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from server.utils.responses import list_adapter
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+async def session_batches(session_factory: async_sessionmaker,
+                          read: Callable[[AsyncSession], AsyncIterator[list[dict]]]) -> AsyncIterator[list[dict]]:
+    """
+    Opens its own session for the lifetime of the stream: the session of a `Depends(get_session)`
+    is already closed when StreamingResponse starts iterating the body.
+    """
+    async with session_factory() as db:
+        async for batch in read(db):
+            yield batch
+
+
+async def ndjson_chunks(model: type[BaseModel], batches: AsyncIterator[list[dict]]) -> AsyncIterator[bytes]:
+    """One JSON object per line, a chunk per batch"""
+    adapter = list_adapter(model)
+    to_json = model.__pydantic_serializer__.to_json
+    async for batch in batches:
+        items = adapter.validate_python(batch, from_attributes=True)
+        yield b"".join(to_json(item) + b"\n" for item in items)
+
+
+async def csv_chunks(model: type[BaseModel], batches: AsyncIterator[list[dict]]) -> AsyncIterator[bytes]:
+    """CSV with a header row of the model fields; the header goes out before the first query"""
+    adapter = list_adapter(model)
+    fields = list(model.model_fields)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush() -> bytes:
+        chunk = buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+        return chunk
+
+    # BOM, чтобы Excel открыл кириллицу в UTF-8
+    buffer.write("\ufeff")
+    writer.writerow(fields)
+    yield flush()
+
+    async for batch in batches:
+        items = adapter.dump_python(adapter.validate_python(batch, from_attributes=True), mode="json")
+        writer.writerows([item[field] for field in fields] for item in items)
+        yield flush()
+
+
+def export_response(model: type[BaseModel], batches: AsyncIterator[list[dict]], export_format: ExportFormat,
+                    filename: str) -> StreamingResponse:
+    chunks = csv_chunks(model, batches) if export_format == ExportFormat.CSV else ndjson_chunks(model, batches)
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_MEDIA_TYPES[export_format.value],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format.value}"'}
+    )
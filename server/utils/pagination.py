@@ -0,0 +1,25 @@
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(made_on: datetime, item_id: UUID, phase: int = 0) -> str:
+    """
+    Opaque keyset cursor: position of the last item of a page ordered by (made_on, id) descending.
+    `phase` tells views that concatenate several orderings (e.g. unanswered tickets first) where to resume.
+    """
+    payload = json.dumps([phase, made_on.isoformat(), str(item_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID, int]:
+    """Raises ValueError for a cursor that was not produced by `encode_cursor`"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        phase, made_on, item_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(made_on), UUID(item_id), int(phase)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
@@ -0,0 +1,33 @@
+from functools import cache
+from typing import Any, Iterable
+
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel, TypeAdapter
+
+# Ответ по умолчанию для всего приложения: orjson вместо json.dumps
+FastJSONResponse = ORJSONResponse
+
+
+@cache
+def list_adapter(model: type[BaseModel]) -> TypeAdapter:
+    """TypeAdapter for `list[model]`, the validator and serializer are built once per model."""
+    return TypeAdapter(list[model])
+
+
+class ModelListResponse(Response):
+    """
+    Validates items against `model` and serializes them straight to JSON bytes in pydantic-core,
+    skipping FastAPI's response_model round trip through Python objects.
+
+        return ModelListResponse(ReservationOut, rows)
+    """
+    media_type = "application/json"
+
+    def __init__(self, model: type[BaseModel], content: Iterable[Any], status_code: int = 200,
+                 headers: dict | None = None):
+        self.model = model
+        super().__init__(content, status_code=status_code, headers=headers)
+
+    def render(self, content: Iterable[Any]) -> bytes:
+        adapter = list_adapter(self.model)
+        return adapter.dump_json(adapter.validate_python(content, from_attributes=True))
@@ -0,0 +1,29 @@
+from typing import AsyncIterator
+
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+STREAM_BATCH_SIZE = 1000
+
+
+async def fetch_dicts(db: AsyncSession, query: Select) -> list[dict]:
+    """
+    Runs a Core select on the session's connection, without ORM loading and identity map,
+    and returns rows as dicts. Response models validate dicts several times faster than objects.
+    """
+    connection = await db.connection()
+    result = await connection.execute(query)
+    keys = list(result.keys())
+    return [dict(zip(keys, row)) for row in result]
+
+
+async def stream_dicts(db: AsyncSession, query: Select, batch_size: int = STREAM_BATCH_SIZE) -> AsyncIterator[list[dict]]:
+    """
+    Like `fetch_dicts`, but reads through a server-side cursor and yields batches of `batch_size` rows,
+    so memory does not depend on the size of the result.
+    """
+    connection = await db.connection()
+    result = await connection.stream(query.execution_options(yield_per=batch_size))
+    keys = list(result.keys())
+    async for partition in result.partitions(batch_size):
+        yield [dict(zip(keys, row)) for row in partition]
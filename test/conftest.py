@@ -1,7 +1,64 @@
 import os
 import sys
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
 import pytest
 
 pytest_plugins = ["pytest_asyncio"]
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def assert_query_budget(response, max_queries):
+    """
+    Checks the number of SQL statements reported by the server in the Server-Timing header.
+
+        response = session.get(f"{BASE_URL}/admin/tickets")
+        assert_query_budget(response, 3)
+    """
+    server_timing = response.headers.get("Server-Timing", "")
+    for metric in server_timing.split(","):
+        name, *params = [part.strip() for part in metric.split(";")]
+        if name != "db":
+            continue
+        for param in params:
+            if param.startswith("desc="):
+                queries = int(param[len("desc="):].strip('"').split()[0])
+                assert queries <= max_queries, (
+                    f"{response.request.method} {response.request.url} executed {queries} queries, "
+                    f"budget is {max_queries}"
+                )
+                return queries
+    pytest.fail("Response has no db Server-Timing metric")
+
+
+@pytest.fixture
+def query_budget():
+    return assert_query_budget
+
+
+def make_seat_row(x, y, *amenities):
+    """Row of SeatRepository.list_catalog: a desk at (x, y) with `amenities` and no others"""
+    # conftest грузится и интеграционными тестами, которым окружение сервера не нужно
+    from server.services.seat_catalog import SEAT_AMENITIES
+    return {"id": uuid4(), "name": "A", "type": "desk", "x": x, "y": y,
+            **{name: name in amenities for name in SEAT_AMENITIES}}
+
+
+def make_session_factory():
+    """async_sessionmaker stand-in: `async with factory() as db` yields a MagicMock session"""
+    factory = MagicMock()
+    factory.return_value.__aenter__ = AsyncMock(return_value=MagicMock())
+    factory.return_value.__aexit__ = AsyncMock(return_value=False)
+    return factory
+
+
+@pytest.fixture
+def seat_row():
+    return make_seat_row
+
+
+@pytest.fixture
+def session_factory():
+    return make_session_factory
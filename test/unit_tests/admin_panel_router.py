@@ -1,19 +1,21 @@
+import json
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from fastapi import HTTPException, Response, status
 from fastapi.testclient import TestClient
 from sqlalchemy import select
 from uuid import uuid4, UUID
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 from server.routers.admin_panel import router, get_current_user_from_cookie
 from server.models.user import User
 from server.models.seat import Seat
 from server.models.reservation import Reservation
 from server.schemas.reservation import ReservationCreate, ReservationUpdate
-from server.schemas.ticket import TicketStatusUpdate
+from server.schemas.ticket import TicketStatusUpdate, TicketStatusEnum, TicketThemeEnum
 from server.schemas.user import UserUpdateAdmin, UserOut
 from server.utils.exceptions import SeatIsNotAvailableError, UserAlreadyHasActiveReservationError
+from server.utils.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
 
 
 
@@ -251,6 +253,23 @@ class TestAdminPanel:
         mock_db.refresh.assert_called_once_with(mock_reservation)
         assert result == mock_reservation
 
+    @pytest.mark.asyncio
+    @patch("server.routers.admin_panel.ReservationRepository")
+    async def test_update_reservation_end_only_too_long(self, mock_repo, mock_db, mock_admin_user, mock_reservation):
+        mock_repo.return_value.update_statuses = AsyncMock()
+        result_mock = MagicMock()
+        result_mock.scalars.return_value.first.return_value = mock_reservation
+        mock_db.execute.return_value = result_mock
+        stored_end = mock_reservation.end
+
+        update_data = ReservationUpdate(end=mock_reservation.start + timedelta(days=32))
+        with pytest.raises(HTTPException) as error:
+            await router.routes[3].endpoint(mock_reservation.id, update_data, mock_admin_user, mock_db)
+
+        assert error.value.status_code == 400
+        assert mock_reservation.end == stored_end
+        mock_db.commit.assert_not_called()
+
     @pytest.mark.asyncio
     @patch("server.routers.admin_panel.get_session")
     @patch("server.routers.admin_panel.get_current_user_from_cookie")
@@ -288,22 +307,22 @@ class TestAdminPanel:
 
         mock_repo.return_value.update_statuses = AsyncMock()
 
-        all_reservations_result = MagicMock()
-        all_reservations_result.scalars.return_value.all.return_value = [mock_reservation, MagicMock()]
-        
-        seat_query_result = MagicMock()
-        seat_query_result.scalars.return_value.first.return_value = mock_seat
-
-        mock_db.execute.side_effect = [all_reservations_result, seat_query_result, seat_query_result]
+        rows = [
+            {"id": reservation_id, "user_id": uuid4(), "seat_id": mock_seat.id, "start": mock_reservation.start,
+             "end": mock_reservation.end, "status": "future", "seat_name": mock_seat.name}
+            for reservation_id in (mock_reservation.id, uuid4())
+        ]
+        mock_repo.return_value.list_with_seat_names = AsyncMock(return_value=rows)
 
         result = await router.routes[6].endpoint(mock_admin_user, mock_db)
 
         mock_repo.return_value.update_statuses.assert_called_once()
-        result_list = list(result)
+        mock_repo.return_value.list_with_seat_names.assert_called_once_with()
+        result_list = json.loads(result.body)
         assert len(result_list) == 2
+        assert result_list[-1]["id"] == str(mock_reservation.id)
         for res in result_list:
-            assert hasattr(res, "seat_name")
-            assert res.seat_name == mock_seat.name
+            assert res["seat_name"] == mock_seat.name
 
     @pytest.mark.asyncio
     @patch("server.routers.admin_panel.get_session")
@@ -313,39 +332,120 @@ class TestAdminPanel:
         mock_get_current_user.return_value = mock_admin_user
         mock_get_session.return_value = mock_db
 
-        tickets = [mock_ticket, MagicMock()]
+        tickets = [
+            {"id": mock_ticket.id, "user_id": mock_ticket.user_id, "reservation_id": mock_ticket.reservation_id,
+             "seat_id": mock_seat.id, "theme": mock_ticket.theme, "message": mock_ticket.message,
+             "status": "active", "made_on": mock_ticket.made_on, "seat_name": mock_seat.name},
+            {"id": uuid4(), "user_id": uuid4(), "reservation_id": None, "seat_id": None, "theme": "other",
+             "message": "Test", "status": "closed", "made_on": mock_ticket.made_on, "seat_name": "Test name"},
+        ]
+        mock_ticket_repo.return_value.get_tickets_page = AsyncMock(return_value=tickets)
+
+        response = await router.routes[7].endpoint(mock_admin_user, mock_db)
+        result = json.loads(response.body)
 
-        get_tickets_result = MagicMock()
-        get_tickets_result.scalars.return_value.all.return_value = tickets
-        mock_ticket_repo.return_value.get_tickets = AsyncMock(return_value=get_tickets_result)
+        mock_ticket_repo.return_value.get_tickets_page.assert_called_once_with(51, None, None, None)
+        assert len(result) == len(tickets)
+        assert result[0]["id"] == str(tickets[0]["id"])
+        assert NEXT_CURSOR_HEADER not in response.headers
+
+    @pytest.mark.asyncio
+    @patch("server.routers.admin_panel.TicketRepository")
+    async def test_get_tickets_next_page(self, mock_ticket_repo, mock_db, mock_admin_user):
+        made_on = datetime(2025, 3, 1, 12, 0)
+        tickets = [{"id": uuid4(), "user_id": uuid4(), "reservation_id": None, "seat_id": None, "theme": "wish",
+                    "message": f"Test {i}", "status": "closed", "made_on": made_on - timedelta(minutes=i)}
+                   for i in range(3)]
+        mock_ticket_repo.return_value.get_tickets_page = AsyncMock(return_value=tickets)
 
-        seat_result = MagicMock()
-        seat_result.scalars.return_value.first.return_value = mock_seat
-        mock_db.execute.return_value = seat_result
+        response = await router.routes[7].endpoint(mock_admin_user, mock_db, TicketStatusEnum.CLOSED,
+                                                    TicketThemeEnum.WISH, False, None, 2)
 
-        result = await router.routes[7].endpoint(mock_admin_user, mock_db)
+        mock_ticket_repo.return_value.get_tickets_page.assert_called_once_with(
+            3, None, TicketStatusEnum.CLOSED, TicketThemeEnum.WISH)
+        assert len(json.loads(response.body)) == 2
+        assert decode_cursor(response.headers[NEXT_CURSOR_HEADER]) == (tickets[1]["made_on"], tickets[1]["id"], 0)
 
-        mock_ticket_repo.return_value.get_tickets.assert_called_once()
-        assert len(result) == len(tickets)
-        for ticket in result:
-            assert "seat_name" in ticket
+    @pytest.mark.asyncio
+    @patch("server.routers.admin_panel.TicketRepository")
+    async def test_get_tickets_unanswered_first(self, mock_ticket_repo, mock_db, mock_admin_user, mock_ticket):
+        made_on, ticket_id = datetime(2025, 3, 1, 12, 0), uuid4()
+        ticket = {"id": mock_ticket.id, "user_id": mock_ticket.user_id, "reservation_id": None, "seat_id": None,
+                  "theme": "other", "message": "Test", "status": "active", "made_on": made_on}
+        mock_ticket_repo.return_value.get_inbox_page = AsyncMock(return_value=([ticket], (True, made_on, ticket_id)))
+
+        response = await router.routes[7].endpoint(mock_admin_user, mock_db, None, None, True,
+                                                    encode_cursor(made_on, ticket_id), 1)
+
+        mock_ticket_repo.return_value.get_inbox_page.assert_called_once_with(1, (made_on, ticket_id), False, None)
+        assert decode_cursor(response.headers[NEXT_CURSOR_HEADER]) == (made_on, ticket_id, 1)
+
+    @pytest.mark.asyncio
+    async def test_get_tickets_invalid_cursor(self, mock_db, mock_admin_user):
+        with pytest.raises(HTTPException) as exc:
+            await router.routes[7].endpoint(mock_admin_user, mock_db, cursor="not-a-cursor")
+        assert exc.value.status_code == 400
+
+    @pytest.mark.asyncio
+    @patch("server.routers.admin_panel.TicketRepository")
+    async def test_search_tickets(self, mock_ticket_repo, mock_db, mock_admin_user):
+        search = next(route.endpoint for route in router.routes if route.path == "/admin/tickets/search")
+        ticket = {"id": uuid4(), "user_id": uuid4(), "reservation_id": None, "seat_id": None, "theme": "failure",
+                  "message": "Не работает розетка", "status": "active", "made_on": datetime(2025, 3, 1), "rank": 0.4}
+        mock_ticket_repo.return_value.search = AsyncMock(return_value=[ticket])
+
+        result = json.loads((await search("розетка", mock_admin_user, mock_db, None, TicketThemeEnum.FAILURE)).body)
+
+        mock_ticket_repo.return_value.search.assert_called_once_with("розетка", 20, 0, None, TicketThemeEnum.FAILURE)
+        assert result[0]["rank"] == 0.4 and result[0]["message"] == ticket["message"]
+
+    @pytest.mark.asyncio
+    async def test_search_tickets_forbidden(self, mock_db, mock_regular_user):
+        search = next(route.endpoint for route in router.routes if route.path == "/admin/tickets/search")
+        with pytest.raises(HTTPException) as exc:
+            await search("розетка", mock_regular_user, mock_db)
+        assert exc.value.status_code == 403
+
+    @pytest.mark.asyncio
+    @patch("server.routers.admin_panel.TicketRepository")
+    async def test_claim_tickets(self, mock_ticket_repo, mock_db, mock_admin_user):
+        claim = next(route.endpoint for route in router.routes if route.path == "/admin/tickets/claim")
+        ticket = {"id": uuid4(), "user_id": uuid4(), "reservation_id": None, "seat_id": None, "theme": "failure",
+                  "message": "Test", "status": "active", "made_on": datetime(2025, 3, 1),
+                  "claimed_by": mock_admin_user.id, "claimed_until": datetime(2025, 3, 1, 0, 10)}
+        mock_ticket_repo.return_value.claim_next = AsyncMock(return_value=[ticket])
+
+        result = json.loads((await claim(5, mock_admin_user, mock_db)).body)
+
+        mock_ticket_repo.return_value.claim_next.assert_called_once_with(mock_admin_user.id, 5)
+        assert result[0]["claimed_by"] == str(mock_admin_user.id)
+
+    @pytest.mark.asyncio
+    @patch("server.routers.admin_panel.TicketRepository")
+    async def test_release_ticket_claim_not_owned(self, mock_ticket_repo, mock_db, mock_admin_user):
+        release = next(route.endpoint for route in router.routes if route.path == "/admin/ticket/{ticket_id}/claim")
+        mock_ticket_repo.return_value.release_claim = AsyncMock(return_value=False)
+
+        with pytest.raises(HTTPException) as exc:
+            await release(uuid4(), mock_admin_user, mock_db)
+        assert exc.value.status_code == 404
 
     @pytest.mark.asyncio
     @patch("server.routers.admin_panel.get_session")
     @patch("server.routers.admin_panel.get_current_user_from_cookie")
-    async def test_get_all_users(self, mock_get_current_user, mock_get_session, mock_db, mock_admin_user):
+    @patch("server.routers.admin_panel.UserRepository")
+    async def test_get_all_users(self, mock_user_repo, mock_get_current_user, mock_get_session, mock_db, mock_admin_user):
         mock_get_current_user.return_value = mock_admin_user
         mock_get_session.return_value = mock_db
 
-        result_mock = MagicMock()
-        users = [mock_admin_user, MagicMock(), MagicMock()]
-        result_mock.scalars.return_value.all.return_value = users
-        mock_db.execute.return_value = result_mock
+        users = [{"id": mock_admin_user.id, "email": mock_admin_user.email, "first_name": None, "role": "admin",
+                  "verified": True}]
+        mock_user_repo.return_value.list_users = AsyncMock(return_value=users)
 
         result = await router.routes[8].endpoint(mock_admin_user, mock_db)
 
-        assert result == users
-        mock_db.execute.assert_called_once()
+        assert json.loads(result.body) == [{**users[0], "id": str(mock_admin_user.id)}]
+        mock_user_repo.return_value.list_users.assert_called_once()
 
     @pytest.mark.asyncio
     @patch("server.routers.admin_panel.get_session")
@@ -389,19 +489,17 @@ class TestAdminPanel:
     @pytest.mark.asyncio
     @patch("server.routers.admin_panel.get_session")
     @patch("server.routers.admin_panel.get_current_user_from_cookie")
-    @patch("server.routers.admin_panel.ImageStorage")
-    async def test_upload_default_avatar(self, mock_image_storage_cls, mock_get_current_user, mock_get_session, mock_db, mock_admin_user):
+    async def test_upload_default_avatar(self, mock_get_current_user, mock_get_session, mock_db, mock_admin_user):
         mock_get_current_user.return_value = mock_admin_user
         mock_get_session.return_value = mock_db
 
         mock_image_storage = MagicMock()
-        mock_image_storage_cls.return_value = mock_image_storage
         mock_image_storage.upload_default_avatar.return_value = "avatar123.jpg"
         mock_image_storage.get_image_url.return_value = "http://example.com/avatar123.jpg"
 
         mock_file = MagicMock()
 
-        result = await router.routes[11].endpoint(mock_file, mock_admin_user)
+        result = await router.routes[11].endpoint(mock_file, mock_admin_user, mock_image_storage)
 
         mock_image_storage.upload_default_avatar.assert_called_once_with(mock_file)
         mock_image_storage.get_image_url.assert_called_once_with("avatar123.jpg")
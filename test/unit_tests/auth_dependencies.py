@@ -4,7 +4,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 from fastapi import HTTPException
 from uuid import uuid4
 
-from server.dependencies.auth_dependencies import get_current_user_from_cookie
+from server.dependencies.auth_dependencies import get_current_user_from_cookie, get_current_user_read
 from server.repositories.user import UserRepository
 
 
@@ -157,3 +157,22 @@ async def test_jwt_environment_variables(mock_jwt_decode, MockUserRepo, mock_db,
     await get_current_user_from_cookie(request=mock_request, db=mock_db)
 
     mock_jwt_decode.assert_called_once_with("valid_token", "test_secret", algorithms=["HS256"])
+
+
+@pytest.mark.asyncio
+@patch("server.dependencies.auth_dependencies.UserRepository")
+@patch("server.dependencies.auth_dependencies.jwt.decode")
+async def test_get_current_user_read_uses_read_session(mock_jwt_decode, MockUserRepo, mock_db, mock_user, mock_request):
+    user_id = str(mock_user.id)
+    mock_jwt_decode.return_value = {"sub": user_id}
+    MockUserRepo.return_value.get_by_id = AsyncMock(return_value=mock_user)
+    session_factory = MagicMock()
+    session_factory.return_value.__aenter__.return_value = mock_db
+
+    mock_request.cookies["access_token"] = "valid_token"
+
+    result = await get_current_user_read(request=mock_request, session_factory=session_factory)
+
+    MockUserRepo.assert_called_once_with(mock_db)
+    session_factory.return_value.__aexit__.assert_called_once()
+    assert result == mock_user
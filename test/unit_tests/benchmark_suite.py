@@ -0,0 +1,182 @@
+import json
+import os
+from datetime import datetime
+
+import pytest
+
+from benchmarks.dataset import SIZES, SyntheticOffice
+from benchmarks.results import compare, summarize
+
+
+def generate(seed=42):
+    office = SyntheticOffice(SIZES["tiny"], seed=seed, anchor=datetime(2025, 3, 1))
+    users = list(office.users())
+    seats = list(office.seats())
+    reservations = list(office.reservations())
+    tickets = list(office.tickets())
+    return users, seats, reservations, tickets
+
+
+class TestSyntheticOffice:
+
+    def test_dataset_is_reproducible(self):
+        """The same seed always produces the same rows"""
+        assert generate(seed=1) == generate(seed=1)
+        assert generate(seed=1)[2] != generate(seed=2)[2]
+
+    def test_dataset_size_and_references(self):
+        """Reservations and tickets reference generated users and seats"""
+        users, seats, reservations, tickets = generate()
+        size = SIZES["tiny"]
+
+        assert len(users) == size.users + 1
+        assert len(seats) == size.seats
+        assert len(reservations) == size.reservations
+        assert len(tickets) == size.tickets
+
+        user_ids = {user["id"] for user in users}
+        seat_ids = {seat["id"] for seat in seats}
+        assert all(r["user_id"] in user_ids and r["seat_id"] in seat_ids for r in reservations)
+        assert all(t["seat_id"] in seat_ids for t in tickets)
+        assert all(r["start"] < r["end"] for r in reservations)
+
+    def test_reservation_chunks_match_full_stream(self):
+        """Chunks loaded by parallel workers add up to the same rows"""
+        office = SyntheticOffice(SIZES["tiny"], anchor=datetime(2025, 3, 1))
+        office.RESERVATION_CHUNK = 3_000
+        list(office.users())
+        list(office.seats())
+
+        chunks = [row for chunk in range(office.reservation_chunks()) for row in office.reservations(chunk)]
+
+        assert office.reservation_chunks() == 4
+        assert chunks == list(office.reservations())
+
+    def test_statuses_follow_anchor(self):
+        """Past reservations are closed, future ones are not"""
+        anchor = datetime(2025, 3, 1)
+        _, _, reservations, _ = generate()
+        for r in reservations:
+            if r["end"] <= anchor:
+                assert r["status"] in ("closed", "did_not_come")
+            elif r["start"] > anchor:
+                assert r["status"] == "future"
+
+
+class TestResults:
+
+    def test_summarize(self):
+        stats = summarize([0.3, 0.1, 0.2])
+        assert stats["runs"] == 3
+        assert stats["min"] == 0.1
+        assert stats["median"] == 0.2
+        assert stats["max"] == 0.3
+
+    def test_compare_detects_regression(self):
+        """Only cases slower than the threshold are flagged"""
+        baseline = {"sizes": {"tiny": {"cases": {"a": {"median": 0.1}, "b": {"median": 0.1}}}}}
+        current = {"sizes": {"tiny": {"cases": {"a": {"median": 0.11}, "b": {"median": 0.2}, "c": {"median": 1}}}}}
+
+        rows = {row["case"]: row for row in compare(baseline, current, threshold=0.2)}
+
+        assert set(rows) == {"a", "b"}
+        assert not rows["a"]["regression"]
+        assert rows["b"]["regression"]
+
+
+class TestSerializationBenchmark:
+
+    def test_all_paths_render_the_same_json(self):
+        """The fast path must be a drop-in replacement for FastAPI's response_model serialization"""
+        from benchmarks.serialization import build_cases, build_items
+        from server.schemas.reservation import ReservationOut
+        from server.schemas.ticket import TicketBase
+        from server.schemas.user import UserOut
+
+        for model in (ReservationOut, UserOut, TicketBase):
+            cases = build_cases(model, build_items(model, 20))
+            bodies = {name: json.loads(case()) for name, case in cases.items() if "jsonable_encoder" not in name}
+            assert len(set(json.dumps(body, sort_keys=True) for body in bodies.values())) == 1, model
+
+
+class TestHotQueryPlans:
+
+    def test_seq_scans_are_found_in_nested_nodes(self):
+        from benchmarks.plans import seq_scans
+
+        plan = {"Node Type": "Nested Loop", "Plans": [
+            {"Node Type": "Seq Scan", "Relation Name": "seats"},
+            {"Node Type": "Hash", "Plans": [{"Node Type": "Seq Scan", "Relation Name": "reservations"}]},
+            {"Node Type": "Index Scan", "Relation Name": "tickets"},
+        ]}
+
+        assert seq_scans(plan) == ["reservations"]
+
+    def test_partitions_of_growing_tables_are_checked(self):
+        from benchmarks.plans import partitions, seq_scans
+
+        plan = {"Node Type": "Append", "Plans": [
+            {"Node Type": "Seq Scan", "Relation Name": "reservations_y2025m03"},
+            {"Node Type": "Seq Scan", "Relation Name": "reservations_y2026m01"},
+            {"Node Type": "Index Scan", "Relation Name": "reservations_y2025m04"},
+        ]}
+
+        assert seq_scans(plan) == ["reservations_y2025m03", "reservations_y2026m01"]
+        assert seq_scans(plan, empty=frozenset({"reservations_y2026m01"})) == ["reservations_y2025m03"]
+        assert partitions(plan) == {"reservations_y2025m03", "reservations_y2026m01", "reservations_y2025m04"}
+
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(not os.getenv("BENCHMARK_DATABASE_URL"), reason="BENCHMARK_DATABASE_URL is not set")
+    async def test_hot_queries_use_indexes(self):
+        """Seeds the small office (all tables are recreated) and EXPLAINs the hot queries"""
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        from benchmarks.plans import PRUNED_QUERIES, explain_hot_queries
+        from benchmarks.seed import copy_seed
+        from server.backend.database import Base
+
+        engine = create_async_engine(os.environ["BENCHMARK_DATABASE_URL"])
+        office = SyntheticOffice(SIZES["small"], seed=42)
+        try:
+            async with engine.begin() as connection:
+                await connection.run_sync(Base.metadata.drop_all)
+                await connection.run_sync(Base.metadata.create_all)
+            await copy_seed(engine, office)
+            report = await explain_hot_queries(engine, office)
+        finally:
+            await engine.dispose()
+
+        scans = {name: statement["statement"] for name, statements in report.items()
+                 for statement in statements if statement["seq_scans"]}
+        assert not scans
+        for name, limit in PRUNED_QUERIES.items():
+            assert all(len(statement["partitions"]) <= limit for statement in report[name]), name
+
+
+class TestImportTime:
+
+    def test_importtime_output_is_parsed(self):
+        from benchmarks.imports import by_package, parse_importtime
+
+        output = "\n".join([
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |     sqlalchemy.exc",
+            "import time:      2000 |       2500 |   sqlalchemy",
+            "import time:       300 |       3000 | server.__main__",
+        ])
+
+        timings = parse_importtime(output)
+        assert [(timing.module, timing.depth) for timing in timings] == [
+            ("sqlalchemy.exc", 2), ("sqlalchemy", 1), ("server.__main__", 0)
+        ]
+        assert timings[-1].cumulative_seconds == pytest.approx(0.003)
+        assert by_package(timings) == pytest.approx({"sqlalchemy": 0.00212, "server": 0.0003})
+
+    def test_cold_start_stays_within_budget(self):
+        """Imports the app in a fresh interpreter, as a gunicorn worker does on boot"""
+        from benchmarks.imports import IMPORT_BUDGET_SECONDS, profile_imports
+
+        profile = profile_imports()
+
+        assert profile.deferred_loaded == []
+        assert profile.seconds < IMPORT_BUDGET_SECONDS
@@ -0,0 +1,98 @@
+import os
+import sqlite3
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.util import greenlet_spawn
+
+from server.backend import metrics
+from server.backend.pool import InstrumentedQueuePool, engine_options, install_pool_metrics
+
+
+class TestEngineOptions:
+
+    def test_defaults(self):
+        """Without configuration the pool keeps SQLAlchemy defaults and pre-ping is on"""
+        with patch.dict(os.environ, {}, clear=True):
+            options = engine_options()
+
+        assert options["poolclass"] is InstrumentedQueuePool
+        assert options["pool_size"] == 5
+        assert options["max_overflow"] == 10
+        assert options["pool_timeout"] == 30
+        assert options["pool_pre_ping"] is True
+        assert options["connect_args"]["statement_cache_size"] == 100
+
+    def test_values_from_env(self):
+        """Pool settings are read from the environment"""
+        with patch.dict(os.environ, {"DB_POOL_SIZE": "20", "DB_MAX_OVERFLOW": "0", "DB_POOL_TIMEOUT": "2",
+                                     "DB_POOL_RECYCLE": "600", "DB_POOL_PRE_PING": "false",
+                                     "DB_STATEMENT_CACHE_SIZE": "500"}, clear=True):
+            options = engine_options()
+
+        assert options["pool_size"] == 20
+        assert options["max_overflow"] == 0
+        assert options["pool_timeout"] == 2
+        assert options["pool_recycle"] == 600
+        assert options["pool_pre_ping"] is False
+        assert options["connect_args"]["statement_cache_size"] == 500
+        assert options["connect_args"]["prepared_statement_cache_size"] == 500
+
+    def test_pgbouncer_mode_disables_prepared_statement_cache(self):
+        """Behind PgBouncer prepared statements are not cached and get unique names"""
+        with patch.dict(os.environ, {"DB_PGBOUNCER": "true", "DB_STATEMENT_CACHE_SIZE": "500"}, clear=True):
+            connect_args = engine_options()["connect_args"]
+
+        assert connect_args["statement_cache_size"] == 0
+        assert connect_args["prepared_statement_cache_size"] == 0
+        name_func = connect_args["prepared_statement_name_func"]
+        assert name_func() != name_func()
+
+
+class TestInstrumentedQueuePool:
+
+    @pytest.mark.asyncio
+    async def test_checkout_wait_is_observed(self):
+        """Every checkout reports its wait time"""
+        pool = InstrumentedQueuePool(lambda: sqlite3.connect(":memory:"), pool_size=1, max_overflow=0)
+        histogram = metrics.db_pool_checkout_wait_seconds.labels("primary")
+        before = sum(bucket.get() for bucket in histogram._buckets)
+
+        connection = await greenlet_spawn(pool.connect)
+        connection.close()
+
+        assert sum(bucket.get() for bucket in histogram._buckets) == before + 1
+
+    @pytest.mark.asyncio
+    async def test_exhausted_pool_counts_timeout(self):
+        """A checkout that times out is counted instead of failing silently"""
+        pool = InstrumentedQueuePool(lambda: sqlite3.connect(":memory:"), pool_size=1, max_overflow=0, timeout=0.05)
+        before = metrics.db_pool_checkout_timeouts_total.labels("primary")._value.get()
+
+        connection = await greenlet_spawn(pool.connect)
+        with pytest.raises(PoolTimeoutError):
+            await greenlet_spawn(pool.connect)
+        connection.close()
+
+        assert metrics.db_pool_checkout_timeouts_total.labels("primary")._value.get() == before + 1
+
+    @pytest.mark.asyncio
+    async def test_replica_pool_has_its_own_label(self):
+        """A pool created with pool_logging_name reports checkouts and capacity under that label"""
+        pool = InstrumentedQueuePool(lambda: sqlite3.connect(":memory:"), logging_name="replica1",
+                                     pool_size=2, max_overflow=3)
+        install_pool_metrics(SimpleNamespace(sync_engine=SimpleNamespace(pool=pool)))
+        in_use = metrics.db_pool_connections_in_use.labels("replica1")
+        waits = metrics.db_pool_checkout_wait_seconds.labels("replica1")
+        before = sum(bucket.get() for bucket in waits._buckets)
+
+        connection = await greenlet_spawn(pool.connect)
+        assert in_use._value.get() == 1
+        await greenlet_spawn(connection.close)
+
+        assert in_use._value.get() == 0
+        assert sum(bucket.get() for bucket in waits._buckets) == before + 1
+        assert metrics.db_pool_capacity.labels("replica1")._value.get() == 5
+        assert engine_options("replica1")["pool_logging_name"] == "replica1"
@@ -0,0 +1,89 @@
+import csv
+import io
+import json
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from server.routers.admin_panel import export_reservations
+from server.schemas.reservation import ReservationOut
+from server.utils.export import ExportFormat, csv_chunks, export_response, ndjson_chunks
+from server.utils.rows import stream_dicts
+
+
+def reservation_rows(count):
+    return [{"id": uuid4(), "user_id": uuid4(), "seat_id": uuid4(), "start": datetime(2025, 3, 1, 9),
+             "end": datetime(2025, 3, 1, 18), "status": "future", "seat_name": f"A-{i}"} for i in range(count)]
+
+
+async def batches_of(*batches):
+    for batch in batches:
+        yield batch
+
+
+async def collect(chunks):
+    return [chunk async for chunk in chunks]
+
+
+class TestExport:
+
+    @pytest.mark.asyncio
+    async def test_ndjson_chunk_per_batch(self):
+        first, second = reservation_rows(2), reservation_rows(1)
+
+        chunks = await collect(ndjson_chunks(ReservationOut, batches_of(first, second)))
+
+        assert len(chunks) == 2
+        lines = b"".join(chunks).decode().splitlines()
+        assert [json.loads(line)["seat_name"] for line in lines] == ["A-0", "A-1", "A-0"]
+        assert json.loads(lines[0])["id"] == str(first[0]["id"])
+
+    @pytest.mark.asyncio
+    async def test_csv_header_comes_before_rows(self):
+        """The header is sent before the first batch is read"""
+        rows = reservation_rows(3)
+
+        chunks = await collect(csv_chunks(ReservationOut, batches_of(rows)))
+
+        assert chunks[0].decode("utf-8-sig").strip() == ",".join(ReservationOut.model_fields)
+        table = list(csv.DictReader(io.StringIO(b"".join(chunks).decode("utf-8-sig"))))
+        assert len(table) == 3
+        assert table[2]["seat_name"] == "A-2"
+        assert table[0]["start"] == "2025-03-01T09:00:00"
+
+    def test_response_headers(self):
+        response = export_response(ReservationOut, batches_of(), ExportFormat.CSV, "reservations")
+
+        assert response.media_type.startswith("text/csv")
+        assert response.headers["content-disposition"] == 'attachment; filename="reservations.csv"'
+
+    @pytest.mark.asyncio
+    async def test_stream_dicts_reads_partitions(self):
+        """Rows come from a server-side cursor in batches"""
+        result = MagicMock()
+        result.keys.return_value = ["id", "seat_name"]
+        result.partitions.return_value = batches_of([(1, "A-1"), (2, "A-2")], [(3, "A-3")])
+        connection = AsyncMock()
+        connection.stream.return_value = result
+        db = AsyncMock()
+        db.connection.return_value = connection
+        query = MagicMock()
+
+        batches = await collect(stream_dicts(db, query, batch_size=2))
+
+        query.execution_options.assert_called_once_with(yield_per=2)
+        result.partitions.assert_called_once_with(2)
+        assert batches == [[{"id": 1, "seat_name": "A-1"}, {"id": 2, "seat_name": "A-2"}],
+                           [{"id": 3, "seat_name": "A-3"}]]
+
+    @pytest.mark.asyncio
+    async def test_export_is_admin_only(self):
+        user = MagicMock(role="user")
+
+        with pytest.raises(HTTPException) as exc:
+            await export_reservations(MagicMock(), ExportFormat.NDJSON, None, None, user)
+
+        assert exc.value.status_code == 403
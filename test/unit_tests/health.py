@@ -0,0 +1,90 @@
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from server.routers.health import live, ready
+from server.services.health import HealthChecker
+
+
+def slow_check(seconds):
+    async def check():
+        await asyncio.sleep(seconds)
+    return check
+
+
+class TestHealthChecker:
+
+    @pytest.mark.asyncio
+    async def test_checks_run_concurrently(self):
+        checker = HealthChecker({"database": slow_check(0.2), "redis": slow_check(0.2)}, timeout=1, ttl=5)
+
+        start = time.perf_counter()
+        report = await checker.report()
+
+        assert time.perf_counter() - start < 0.35
+        assert report["status"] == "ready"
+        assert set(report["checks"]) == {"database", "redis"}
+
+    @pytest.mark.asyncio
+    async def test_slow_check_times_out(self):
+        checker = HealthChecker({"database": slow_check(5)}, timeout=0.05, ttl=5, optional=frozenset())
+
+        report = await checker.report()
+
+        assert report["status"] == "not_ready"
+        assert report["checks"]["database"]["status"] == "timeout"
+
+    @pytest.mark.asyncio
+    async def test_optional_failure_is_degraded(self):
+        checks = {"database": AsyncMock(), "telegram": AsyncMock(side_effect=OSError("refused"))}
+        checker = HealthChecker(checks, timeout=1, ttl=5, optional=frozenset({"telegram"}))
+
+        report = await checker.report()
+
+        assert report["status"] == "degraded"
+        assert report["checks"]["telegram"] == {
+            "status": "error", "critical": False, "error": "OSError: refused",
+            "latency_ms": report["checks"]["telegram"]["latency_ms"]
+        }
+
+    @pytest.mark.asyncio
+    async def test_report_is_cached_for_concurrent_and_repeated_probes(self):
+        check = AsyncMock()
+        checker = HealthChecker({"database": check}, timeout=1, ttl=60)
+
+        reports = await asyncio.gather(*(checker.report() for _ in range(10)))
+        await checker.report()
+
+        check.assert_awaited_once()
+        assert all(report is reports[0] for report in reports)
+
+    @pytest.mark.asyncio
+    async def test_report_is_refreshed_after_ttl(self):
+        check = AsyncMock()
+        checker = HealthChecker({"database": check}, timeout=1, ttl=0)
+
+        await checker.report()
+        await checker.report()
+
+        assert check.await_count == 2
+
+
+class TestHealthRouter:
+
+    @pytest.mark.asyncio
+    async def test_live(self):
+        assert await live() == {"status": "alive"}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("status, code", [("ready", 200), ("degraded", 200), ("not_ready", 503)])
+    async def test_ready_status_code(self, status, code):
+        request = MagicMock()
+        request.app.state.health.report = AsyncMock(return_value={"status": status, "checks": {}})
+
+        response = await ready(request)
+
+        assert response.status_code == code
+        assert json.loads(response.body)["status"] == status
@@ -3,34 +3,38 @@ from unittest.mock import patch, MagicMock, mock_open
 import io
 from PIL import Image
 import uuid
-from botocore.exceptions import ClientError
+from botocore.exceptions import ClientError, EndpointConnectionError
 from server.services.image_storage import ImageStorage, S3_ENDPOINT_URL
 
 class TestImageStorage:
-    @patch('server.services.image_storage.boto3.client')
+    @patch('server.services.s3_bucket.boto3.client')
     def test_init_bucket_exists(self, mock_boto_client):
         mock_s3 = MagicMock()
         mock_boto_client.return_value = mock_s3
         mock_s3.head_bucket.return_value = {}
         image_storage = ImageStorage()
+        mock_boto_client.assert_not_called()
+        image_storage.ensure_bucket()
         mock_boto_client.assert_called_once()
         mock_s3.head_bucket.assert_called_once_with(Bucket='images')
         mock_s3.create_bucket.assert_not_called()
         assert image_storage.bucket_name == 'images'
+        assert image_storage.bucket_ready
 
-    @patch('server.services.image_storage.boto3.client')
+    @patch('server.services.s3_bucket.boto3.client')
     def test_init_bucket_doesnt_exist(self, mock_boto_client):
         mock_s3 = MagicMock()
         mock_boto_client.return_value = mock_s3
         mock_s3.head_bucket.side_effect = ClientError({'Error': {'Code': '404', 'Message': 'Not Found'}}, 'head_bucket')
         image_storage = ImageStorage()
+        image_storage.ensure_bucket()
         mock_boto_client.assert_called_once()
         mock_s3.head_bucket.assert_called_once_with(Bucket='images')
         mock_s3.create_bucket.assert_called_once_with(Bucket='images')
 
     @patch('server.services.image_storage.uuid.uuid4')
     @patch('server.services.image_storage.Image.open')
-    @patch('server.services.image_storage.boto3.client')
+    @patch('server.services.s3_bucket.boto3.client')
     def test_upload_image(self, mock_boto_client, mock_image_open, mock_uuid4):
         mock_s3 = MagicMock()
         mock_boto_client.return_value = mock_s3
@@ -52,7 +56,7 @@ class TestImageStorage:
         assert result == "test_file_name_123"
 
     @patch('server.services.image_storage.Image.open')
-    @patch('server.services.image_storage.boto3.client')
+    @patch('server.services.s3_bucket.boto3.client')
     def test_upload_image_invalid_format(self, mock_boto_client, mock_image_open):
         mock_s3 = MagicMock()
         mock_boto_client.return_value = mock_s3
@@ -65,7 +69,7 @@ class TestImageStorage:
             image_storage.upload_image(mock_file)
         assert "Unsupported image format" in str(excinfo.value)
 
-    @patch('server.services.image_storage.boto3.client')
+    @patch('server.services.s3_bucket.boto3.client')
     def test_get_image_url(self, mock_boto_client):
         mock_s3 = MagicMock()
         mock_boto_client.return_value = mock_s3
@@ -74,7 +78,7 @@ class TestImageStorage:
         url = image_storage.get_image_url("test_image_id")
         assert url == f"{S3_ENDPOINT_URL}/images/test_image_id"
 
-    @patch('server.services.image_storage.boto3.client')
+    @patch('server.services.s3_bucket.boto3.client')
     def test_get_image_success(self, mock_boto_client):
         mock_s3 = MagicMock()
         mock_boto_client.return_value = mock_s3
@@ -87,7 +91,7 @@ class TestImageStorage:
         mock_s3.get_object.assert_called_once_with(Bucket='images', Key='test_image_id')
         assert result == b"test image data"
 
-    @patch('server.services.image_storage.boto3.client')
+    @patch('server.services.s3_bucket.boto3.client')
     def test_get_image_failure(self, mock_boto_client):
         mock_s3 = MagicMock()
         mock_boto_client.return_value = mock_s3
@@ -100,7 +104,7 @@ class TestImageStorage:
         assert result is None
 
     @patch('server.services.image_storage.Image.open')
-    @patch('server.services.image_storage.boto3.client')
+    @patch('server.services.s3_bucket.boto3.client')
     def test_upload_default_avatar(self, mock_boto_client, mock_image_open):
         mock_s3 = MagicMock()
         mock_boto_client.return_value = mock_s3
@@ -117,3 +121,16 @@ class TestImageStorage:
         mock_img.convert.assert_called_with("RGB")
         mock_s3.upload_fileobj.assert_called_once()
         assert result == "default_avatar"
+
+    @patch('server.services.s3_bucket.boto3.client')
+    def test_unavailable_s3_does_not_break_construction(self, mock_boto_client):
+        mock_s3 = MagicMock()
+        mock_boto_client.return_value = mock_s3
+        mock_s3.head_bucket.side_effect = EndpointConnectionError(endpoint_url=S3_ENDPOINT_URL)
+        image_storage = ImageStorage()
+        with pytest.raises(EndpointConnectionError):
+            image_storage.ensure_bucket()
+        assert not image_storage.bucket_ready
+        assert image_storage.s3 is image_storage.s3
+        mock_boto_client.assert_called_once()
+
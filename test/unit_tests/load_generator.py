@@ -0,0 +1,129 @@
+import random
+import uuid
+import pytest
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from loadtest.report import format_table, save_html, save_json
+from loadtest.runner import prepare_users, run_closed, run_open
+from loadtest.stats import LoadStats, percentile
+
+
+def fake_api():
+    app = FastAPI()
+    state = {"users": {}, "active": {}}
+
+    @app.post("/auth/register")
+    async def register(body: dict):
+        user_id = str(uuid.uuid4())
+        state["users"][body["email"]] = user_id
+        return {"access_token": user_id, "user": {"id": user_id}}
+
+    @app.post("/auth/login")
+    async def login(body: dict):
+        if body["email"] not in state["users"]:
+            return JSONResponse(status_code=400, content={"detail": "Неверный email"})
+        user_id = state["users"][body["email"]]
+        return {"access_token": user_id, "user": {"id": user_id}}
+
+    @app.get("/seat")
+    async def seats():
+        return [{"id": str(uuid.uuid4()), "is_available": True}, {"id": str(uuid.uuid4()), "is_available": False}]
+
+    @app.post("/reservations", status_code=201)
+    async def book(body: dict):
+        return {"id": str(uuid.uuid4())}
+
+    @app.get("/reservations/active")
+    async def active(request: Request):
+        return {}
+
+    @app.post("/ticket")
+    async def ticket(body: dict):
+        return {}
+
+    @app.patch("/reservations/{reservation_id}")
+    async def cancel(reservation_id: str, body: dict):
+        return {}
+
+    return app
+
+
+@pytest.fixture
+def client():
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=fake_api()), base_url="http://test")
+
+
+class TestStats:
+
+    def test_percentile(self):
+        ordered = [i / 100 for i in range(1, 101)]
+        assert percentile(ordered, 50) == 0.5
+        assert percentile(ordered, 95) == 0.95
+        assert percentile(ordered, 99) == 0.99
+        assert percentile([], 99) == 0.0
+
+    def test_report_groups_by_endpoint(self):
+        stats = LoadStats()
+        stats.start()
+        stats.record("GET /seat", 0.01, 200)
+        stats.record("GET /seat", 0.03, 200)
+        stats.record("POST /reservations", 0.02, 500)
+        stats.record_error("POST /reservations", httpx.ConnectError("boom"))
+        stats.finish()
+
+        report = stats.report({})
+
+        assert report["endpoints"]["GET /seat"]["requests"] == 2
+        assert report["endpoints"]["GET /seat"]["latency_ms"]["p50"] == pytest.approx(10)
+        assert report["endpoints"]["POST /reservations"]["failures"] == 2
+        assert report["total"]["requests"] == 4
+
+
+class TestLoadRunner:
+
+    @pytest.mark.asyncio
+    async def test_closed_model(self, client):
+        """Every virtual user runs the full scenario"""
+        setup_stats = LoadStats()
+        users = await prepare_users(client, setup_stats, 3, seed=1)
+        assert len(users) == 3
+        assert setup_stats.endpoints["POST /auth/register"].statuses[200] == 3
+
+        stats = LoadStats()
+        for user in users:
+            user.stats = stats
+        stats.start()
+        await run_closed(users, stats, duration=0.2, think_time=0.05, ramp_up=0)
+        stats.finish()
+
+        report = stats.report({})
+        assert report["iterations"] >= 3
+        for endpoint in ["GET /seat", "POST /reservations", "GET /reservations/active", "PATCH /reservations/{id}"]:
+            assert report["endpoints"][endpoint]["requests"] >= 3
+
+    @pytest.mark.asyncio
+    async def test_open_model_drops_over_capacity(self, client):
+        """Arrivals beyond the concurrency cap are dropped, not delayed"""
+        users = await prepare_users(client, LoadStats(), 1, seed=1)
+        stats = LoadStats()
+        users[0].stats = stats
+
+        dropped = await run_open(users, stats, duration=0.2, arrival_rate=500, max_in_flight=1, seed=1)
+
+        assert stats.iterations >= 1
+        assert dropped > 0
+
+    def test_exports(self, tmp_path):
+        stats = LoadStats()
+        stats.start()
+        stats.record("GET /seat", 0.01, 200)
+        stats.finish()
+        report = stats.report({"users": 1})
+
+        save_json(report, tmp_path / "report.json")
+        save_html(report, tmp_path / "report.html")
+
+        assert "GET /seat" in (tmp_path / "report.html").read_text(encoding="utf-8")
+        assert "TOTAL" in format_table(report)
@@ -0,0 +1,69 @@
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from server.middleware.metrics import PrometheusMiddleware, UNMATCHED_ROUTE
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(PrometheusMiddleware)
+
+    @app.get("/mw-test/items/{item_id}")
+    async def get_item(item_id: int):
+        return {"item_id": item_id}
+
+    @app.get("/mw-test/fail")
+    async def fail():
+        raise HTTPException(status_code=418, detail="teapot")
+
+    return TestClient(app)
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class TestPrometheusMiddleware:
+
+    def test_latency_labelled_by_route_template(self, client):
+        """Requests to different ids share a single route label"""
+        labels = {"method": "GET", "route": "/mw-test/items/{item_id}", "status": "200"}
+        before = sample("http_request_duration_seconds_count", **labels)
+
+        client.get("/mw-test/items/1")
+        client.get("/mw-test/items/2")
+
+        assert sample("http_request_duration_seconds_count", **labels) == before + 2
+        assert REGISTRY.get_sample_value(
+            "http_request_duration_seconds_count",
+            {"method": "GET", "route": "/mw-test/items/1", "status": "200"}
+        ) is None
+
+    def test_status_and_response_size(self, client):
+        """Status code comes from the response and body size is recorded"""
+        labels = {"method": "GET", "route": "/mw-test/fail", "status": "418"}
+        before_count = sample("http_response_size_bytes_count", **labels)
+        before_sum = sample("http_response_size_bytes_sum", **labels)
+
+        response = client.get("/mw-test/fail")
+
+        assert response.status_code == 418
+        assert sample("http_response_size_bytes_count", **labels) == before_count + 1
+        assert sample("http_response_size_bytes_sum", **labels) == before_sum + len(response.content)
+
+    def test_unmatched_route(self, client):
+        """Unknown paths are collapsed into one label"""
+        labels = {"method": "GET", "route": UNMATCHED_ROUTE, "status": "404"}
+        before = sample("http_request_duration_seconds_count", **labels)
+
+        client.get("/mw-test/does/not/exist")
+
+        assert sample("http_request_duration_seconds_count", **labels) == before + 1
+
+    def test_in_progress_returns_to_zero(self, client):
+        """In-flight gauge is decremented after the response"""
+        client.get("/mw-test/items/3")
+        assert sample("http_requests_in_progress", method="GET", route="/mw-test/items/{item_id}") == 0
@@ -0,0 +1,63 @@
+import os
+import subprocess
+import sys
+import pytest
+from unittest.mock import patch
+from prometheus_client import REGISTRY
+
+from server.backend.metrics import build_registry
+from server.routers import metrics as metrics_router
+
+
+class TestMetricsRegistry:
+
+    def test_default_registry_without_multiproc_dir(self):
+        """Single-process mode exports the default registry"""
+        with patch.dict(os.environ, {}, clear=False):
+            os.environ.pop("PROMETHEUS_MULTIPROC_DIR", None)
+            assert build_registry() is REGISTRY
+
+    def test_multiprocess_registry(self, tmp_path):
+        """Multiprocess mode aggregates metrics from the shared directory"""
+        with patch.dict(os.environ, {"PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}):
+            registry = build_registry()
+        assert registry is not REGISTRY
+        assert list(registry.collect()) == []
+
+    def test_missing_multiproc_dir_is_created(self, tmp_path):
+        """Importing the metrics outside entry.sh must not fail on a missing directory"""
+        path = tmp_path / "prometheus_multiproc"
+        env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(path)}
+        subprocess.run([sys.executable, "-c", "import server.backend.metrics"], env=env, check=True)
+        assert path.is_dir()
+
+
+class TestMetricsEndpoint:
+
+    @pytest.mark.asyncio
+    @patch("server.routers.metrics.generate_latest")
+    async def test_metrics_are_cached(self, mock_generate_latest):
+        """Repeated scrapes within the TTL reuse the generated payload"""
+        mock_generate_latest.return_value = b"metric 1\n"
+        metrics_router._metrics_cache["generated_at"] = 0.0
+
+        with patch.object(metrics_router, "METRICS_CACHE_TTL", 60):
+            first = await metrics_router.metrics_endpoint()
+            second = await metrics_router.metrics_endpoint()
+
+        assert first.body == b"metric 1\n"
+        assert second.body == b"metric 1\n"
+        mock_generate_latest.assert_called_once()
+
+    @pytest.mark.asyncio
+    @patch("server.routers.metrics.generate_latest")
+    async def test_metrics_regenerated_after_ttl(self, mock_generate_latest):
+        """With zero TTL every scrape collects fresh values"""
+        mock_generate_latest.side_effect = [b"a\n", b"b\n"]
+        metrics_router._metrics_cache["generated_at"] = 0.0
+
+        with patch.object(metrics_router, "METRICS_CACHE_TTL", 0):
+            first = await metrics_router.metrics_endpoint()
+            second = await metrics_router.metrics_endpoint()
+
+        assert (first.body, second.body) == (b"a\n", b"b\n")
@@ -0,0 +1,22 @@
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+
+from server.utils.pagination import decode_cursor, encode_cursor
+
+
+class TestCursor:
+
+    def test_round_trip(self):
+        made_on, item_id = datetime(2025, 3, 1, 12, 30, 15, 123456), uuid4()
+
+        cursor = encode_cursor(made_on, item_id, 1)
+
+        assert "=" not in cursor
+        assert decode_cursor(cursor) == (made_on, item_id, 1)
+
+    @pytest.mark.parametrize("cursor", ["", "not-a-cursor", "W10", encode_cursor(datetime.now(), uuid4())[:-4]])
+    def test_invalid(self, cursor):
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
@@ -0,0 +1,71 @@
+import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
+
+from server.backend.partitions import (DEFAULT_PARTITION, Partition, create_partition_sql, ensure_partitions,
+                                       is_partition, month_start, months_between, partition_name)
+from server.models.reservation import RESERVATION_LOOKBACK, Reservation, starts_near
+
+
+class TestPartitions:
+
+    def test_month_start_crosses_years(self):
+        assert month_start(datetime.datetime(2025, 12, 31, 23, 59)) == datetime.date(2025, 12, 1)
+        assert month_start(datetime.date(2025, 12, 15), 1) == datetime.date(2026, 1, 1)
+        assert month_start(datetime.date(2025, 1, 15), -1) == datetime.date(2024, 12, 1)
+        assert month_start(datetime.date(2025, 3, 1), 12) == datetime.date(2026, 3, 1)
+
+    def test_months_between_is_inclusive(self):
+        months = months_between(datetime.date(2025, 11, 20), datetime.datetime(2026, 2, 1))
+        assert months == [datetime.date(2025, 11, 1), datetime.date(2025, 12, 1),
+                          datetime.date(2026, 1, 1), datetime.date(2026, 2, 1)]
+        assert months_between(datetime.date(2025, 3, 5), datetime.date(2025, 3, 6)) == [datetime.date(2025, 3, 1)]
+
+    def test_partition_names(self):
+        name = partition_name(datetime.date(2025, 3, 1))
+        assert name == "reservations_y2025m03"
+        assert is_partition(name)
+        assert not is_partition("reservations")
+        assert not is_partition("reservations_y2025m03_pkey")
+        assert not is_partition("tickets_y2025m03")
+
+    def test_create_partition_sql_covers_one_month(self):
+        sql = create_partition_sql(datetime.date(2025, 12, 1))
+        assert "reservations_y2025m12 PARTITION OF reservations" in sql
+        assert "FROM ('2025-12-01') TO ('2026-01-01')" in sql
+
+    def test_reservations_are_partitioned_by_start(self):
+        ddl = str(CreateTable(Reservation.__table__).compile(dialect=postgresql.dialect()))
+        assert "PARTITION BY RANGE (start)" in ddl
+        assert "PRIMARY KEY (id, start)" in ddl
+        assert "CHECK (\"end\" - start <= interval '31 days')" in ddl
+        assert not is_partition(DEFAULT_PARTITION)
+
+    def test_starts_near_bounds_partition_key(self):
+        start = datetime.datetime(2025, 3, 10, 9)
+        end = datetime.datetime(2025, 3, 10, 18)
+        condition = starts_near(start, end)
+        params = condition.compile(dialect=postgresql.dialect()).params
+        assert sorted(params.values()) == [start - RESERVATION_LOOKBACK, end + datetime.timedelta(days=1)]
+
+
+@pytest.mark.asyncio
+async def test_ensure_partitions_creates_only_missing_months():
+    connection = MagicMock()
+    connection.execute = AsyncMock()
+    existing = [Partition("reservations_y2025m01", datetime.date(2025, 1, 1))]
+    with patch("server.backend.partitions.list_partitions", AsyncMock(return_value=existing)):
+        created = await ensure_partitions(connection, datetime.date(2025, 1, 5), datetime.date(2025, 3, 5))
+
+    assert created == ["reservations_y2025m02", "reservations_y2025m03"]
+    statements = [str(call.args[0]) for call in connection.execute.call_args_list]
+    assert "pg_advisory_xact_lock" in statements[0]
+    assert len(statements) == 7
+    # Брони февраля переезжают из партиции по умолчанию до подключения партиции месяца
+    assert "DELETE FROM reservations_default" in statements[2]
+    assert connection.execute.call_args_list[2].args[1] == {"start": datetime.date(2025, 2, 1),
+                                                            "end": datetime.date(2025, 3, 1)}
+    assert statements[3].startswith("ALTER TABLE reservations ATTACH PARTITION reservations_y2025m02")
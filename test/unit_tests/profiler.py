@@ -0,0 +1,150 @@
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+from fastapi import HTTPException
+
+from server.routers.profiler import profile_worker, ProfileFormat
+from server.services.profiler import SamplingProfiler, MemoryTracer, ProfilerBusyError
+
+
+def busy_function(stop: threading.Event):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+@pytest.fixture
+def busy_thread():
+    stop = threading.Event()
+    thread = threading.Thread(target=busy_function, args=(stop,), name="busy")
+    thread.start()
+    yield thread
+    stop.set()
+    thread.join()
+
+
+class TestSamplingProfiler:
+
+    def test_collapsed_contains_sampled_function(self, busy_thread):
+        """Stacks of other threads are sampled in collapsed format"""
+        profiler = SamplingProfiler(interval=0.005)
+        profiler.start()
+        time.sleep(0.2)
+        profiler.stop()
+
+        assert profiler.sample_count > 0
+        collapsed = profiler.collapsed()
+        busy_lines = [line for line in collapsed.splitlines() if line.startswith("busy;")]
+        assert busy_lines
+        assert "busy_function (profiler.py:" in busy_lines[0]
+        assert int(busy_lines[0].rsplit(" ", 1)[1]) > 0
+
+    def test_speedscope_format(self, busy_thread):
+        """Speedscope profile references only existing frames"""
+        profiler = SamplingProfiler(interval=0.005)
+        profiler.start()
+        time.sleep(0.1)
+        profiler.stop()
+
+        data = profiler.speedscope()
+        frames = data["shared"]["frames"]
+        profile = data["profiles"][0]
+        assert profile["type"] == "sampled"
+        assert len(profile["samples"]) == len(profile["weights"])
+        assert all(0 <= index < len(frames) for sample in profile["samples"] for index in sample)
+        assert any(frame["name"] == "busy_function" for frame in frames)
+
+    def test_only_one_profile_per_worker(self):
+        """A second profiler cannot start while the first is running"""
+        first = SamplingProfiler()
+        first.start()
+        try:
+            with pytest.raises(ProfilerBusyError):
+                SamplingProfiler().start()
+        finally:
+            first.stop()
+
+
+class TestMemoryTracer:
+
+    def test_allocation_diff(self):
+        """Allocations made between snapshots appear in the diff"""
+        tracer = MemoryTracer()
+        tracer.start()
+        data = [bytearray(1024) for _ in range(1000)]
+        diff = tracer.stop()
+
+        assert diff
+        assert diff[0]["size_diff"] >= 1024 * 1000
+        assert "profiler.py" in diff[0]["location"]
+        assert len(data) == 1000
+
+    def test_stop_before_start(self):
+        """A stop that wins the race leaves tracing off and makes the late start a no-op"""
+        import tracemalloc
+        tracer = MemoryTracer()
+
+        assert tracer.stop() == []
+        tracer.start()
+
+        assert not tracemalloc.is_tracing()
+        assert tracer.stop() == []
+
+
+class TestProfilerRouter:
+
+    @pytest.mark.asyncio
+    async def test_not_admin(self):
+        user = MagicMock()
+        user.role = "user"
+        with pytest.raises(HTTPException) as exc:
+            await profile_worker(0.1, 10, ProfileFormat.COLLAPSED, False, user)
+        assert exc.value.status_code == 403
+
+    @pytest.mark.asyncio
+    async def test_profile_worker(self):
+        user = MagicMock()
+        user.role = "admin"
+        result = await profile_worker(0.1, 5, ProfileFormat.SPEEDSCOPE, True, user)
+
+        assert result["samples"] > 0
+        assert result["profile"]["profiles"][0]["type"] == "sampled"
+        assert isinstance(result["memory"], list)
+
+    @pytest.mark.asyncio
+    async def test_failed_tracer_start_is_not_hidden(self):
+        import tracemalloc
+        user = MagicMock()
+        user.role = "admin"
+
+        with patch("tracemalloc.take_snapshot", side_effect=MemoryError("no memory")):
+            with pytest.raises(MemoryError):
+                await profile_worker(0.05, 5, ProfileFormat.COLLAPSED, True, user)
+
+        assert not tracemalloc.is_tracing()
+        # Профилировщик освобожден
+        profiler = SamplingProfiler()
+        profiler.start()
+        profiler.stop()
+
+    @pytest.mark.asyncio
+    async def test_memory_snapshots_run_off_the_event_loop(self):
+        user = MagicMock()
+        user.role = "admin"
+        loop_thread = threading.get_ident()
+        threads = []
+
+        class RecordingTracer(MemoryTracer):
+            def start(self):
+                threads.append(threading.get_ident())
+                super().start()
+
+            def stop(self, limit: int = 20):
+                threads.append(threading.get_ident())
+                return super().stop(limit)
+
+        with patch("server.routers.profiler.MemoryTracer", RecordingTracer):
+            result = await profile_worker(0.05, 5, ProfileFormat.COLLAPSED, True, user)
+
+        assert isinstance(result["memory"], list)
+        assert len(threads) == 2 and loop_thread not in threads
@@ -0,0 +1,82 @@
+import logging
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from server.backend.query_stats import install_query_hooks, track_queries, _current_stats
+from server.middleware.query_stats import QueryStatsMiddleware
+
+
+@pytest.fixture
+def sqlite_engine():
+    engine = create_engine("sqlite://")
+    install_query_hooks(SimpleNamespace(sync_engine=engine))
+    return engine
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware, threshold=3)
+
+    @app.get("/qs-test/loop/{n}")
+    async def loop(n: int):
+        stats = _current_stats.get()
+        for _ in range(n):
+            stats.record("SELECT seats.name FROM seats WHERE seats.id = $1", 0.002)
+        return {"n": n}
+
+    return TestClient(app)
+
+
+class TestQueryStats:
+
+    def test_track_queries_counts_statements(self, sqlite_engine):
+        """Statements executed inside the block are counted"""
+        with track_queries() as stats:
+            with sqlite_engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                conn.execute(text("SELECT 1"))
+                conn.execute(text("SELECT 2"))
+
+        assert stats.count == 3
+        assert stats.total_time > 0
+        assert stats.most_repeated() == ("SELECT 1", 2)
+
+    def test_statements_outside_block_are_ignored(self, sqlite_engine):
+        """Hooks are no-op when nothing is being tracked"""
+        with sqlite_engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        with track_queries() as stats:
+            pass
+        assert stats.count == 0
+
+
+class TestQueryStatsMiddleware:
+
+    def test_server_timing_header(self, client, query_budget):
+        """Query count and DB time are returned in Server-Timing"""
+        response = client.get("/qs-test/loop/2")
+
+        assert response.headers["Server-Timing"] == 'db;desc="2 queries";dur=4.00'
+        assert query_budget(response, 2) == 2
+
+    def test_query_budget_exceeded(self, client, query_budget):
+        """The pytest helper fails when the endpoint exceeds its budget"""
+        response = client.get("/qs-test/loop/3")
+
+        with pytest.raises(AssertionError):
+            query_budget(response, 2)
+
+    def test_n_plus_one_warning(self, client, caplog):
+        """Repeated statements above the threshold are logged with the route"""
+        with caplog.at_level(logging.WARNING, logger="server.middleware.query_stats"):
+            client.get("/qs-test/loop/2")
+            assert not caplog.records
+            client.get("/qs-test/loop/5")
+
+        assert len(caplog.records) == 1
+        assert "/qs-test/loop/{n}" in caplog.records[0].getMessage()
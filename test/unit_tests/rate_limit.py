@@ -0,0 +1,186 @@
+import math
+import runpy
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import jwt
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from redis.exceptions import ConnectionError
+
+from server.backend.rate_limit import (
+    DEFAULT_RATE_LIMITS,
+    RateLimit,
+    RateLimiter,
+    parse_rate_limits,
+)
+from server.dependencies.auth_dependencies import JWT_ALGORITHM, JWT_SECRET
+from server.middleware.rate_limit import RateLimitMiddleware
+
+
+def make_limiter(*results, **kwargs):
+    """RateLimiter whose Lua script returns `results` ([granted, retry_after]) one by one"""
+    client = MagicMock()
+    script = AsyncMock(side_effect=list(results))
+    client.register_script.return_value = script
+    return RateLimiter(client, **kwargs), script
+
+
+class FakeTokenBucket:
+    """TOKEN_BUCKET_SCRIPT in Python on a clock moved by the test"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.buckets = {}
+
+    async def __call__(self, keys, args):
+        capacity, rate, requested, returned = args
+        tokens, ts = self.buckets.get(keys[0], (capacity, self.now))
+        tokens = min(capacity, tokens + (self.now - ts) * rate + returned)
+        granted = min(requested, math.floor(tokens))
+        tokens -= granted
+        self.buckets[keys[0]] = (tokens, self.now)
+        return [granted, str((1 - tokens) / rate if not granted else 0)]
+
+
+class TestParseRateLimits:
+
+    def test_defaults(self):
+        limits = parse_rate_limits(DEFAULT_RATE_LIMITS)
+        assert limits[("POST", "/api/auth/login")] == RateLimit(10, 60.0, "ip")
+        assert limits[("GET", "/api/seat")].key == "user"
+
+    def test_key_defaults_to_user_and_zero_disables(self):
+        limits = parse_rate_limits("get /api/seat/{seat_id}=30/10, POST /api/auth/login=0/60/ip")
+        assert limits == {("GET", "/api/seat/{seat_id}"): RateLimit(30, 10.0, "user")}
+
+    @pytest.mark.parametrize("spec", ["/api/seat=1/1", "GET /api/seat=1", "GET /api/seat=1/1/host", "GET /api/seat=1/0"])
+    def test_invalid(self, spec):
+        with pytest.raises(ValueError):
+            parse_rate_limits(spec)
+
+
+class TestRateLimiter:
+
+    @pytest.mark.asyncio
+    async def test_leased_tokens_are_spent_locally(self):
+        limiter, script = make_limiter([3, "0"], local_share=0.1)
+        rate_limit = RateLimit(30, 60)
+
+        decisions = [await limiter.acquire("key", rate_limit) for _ in range(3)]
+
+        assert all(decision.allowed for decision in decisions)
+        assert [decision.source for decision in decisions] == ["redis", "local", "local"]
+        script.assert_awaited_once()
+        assert script.await_args.kwargs["args"] == [30, 0.5, 3, 0]
+
+    @pytest.mark.asyncio
+    async def test_rejection_is_remembered_until_retry_after(self):
+        limiter, script = make_limiter([0, "12.5"])
+
+        first = await limiter.acquire("key", RateLimit(10, 60))
+        second = await limiter.acquire("key", RateLimit(10, 60))
+
+        assert (first.allowed, first.retry_after, first.source) == (False, 12.5, "redis")
+        assert not second.allowed and second.source == "local" and 0 < second.retry_after <= 12.5
+        script.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_goes_back_to_redis(self):
+        limiter, script = make_limiter([5, "0"], [1, "0"], lease_seconds=0)
+
+        await limiter.acquire("key", RateLimit(50, 60))
+        await limiter.acquire("key", RateLimit(50, 60))
+
+        assert script.await_count == 2
+        # Неистраченные 4 токена первой аренды вернулись в бакет
+        assert script.await_args.kwargs["args"][3] == 4
+
+    @pytest.mark.asyncio
+    async def test_slow_traffic_does_not_drain_bucket(self):
+        """A client polling under the limit for minutes can still burst up to the rest of its bucket"""
+        bucket = FakeTokenBucket()
+        client = MagicMock()
+        client.register_script.return_value = bucket
+        limiter = RateLimiter(client, local_share=0.1, lease_seconds=1)
+        rate_limit = RateLimit(60, 60)
+
+        with patch("server.backend.rate_limit.time", SimpleNamespace(monotonic=lambda: bucket.now)):
+            for _ in range(100):
+                assert (await limiter.acquire("key", rate_limit)).allowed
+                bucket.now += 2
+            burst = [(await limiter.acquire("key", rate_limit)).allowed for _ in range(50)]
+
+        assert all(burst)
+
+    @pytest.mark.asyncio
+    async def test_fails_open_without_redis(self):
+        limiter, script = make_limiter(ConnectionError("refused"), backoff=60)
+
+        first = await limiter.acquire("key", RateLimit(1, 60))
+        second = await limiter.acquire("other", RateLimit(1, 60))
+
+        assert first.allowed and second.allowed
+        assert second.source == "fail_open"
+        script.assert_awaited_once()
+
+
+@pytest.fixture
+def app():
+    app = FastAPI()
+
+    @app.post("/api/auth/login")
+    async def login():
+        return {"ok": True}
+
+    @app.get("/api/seat")
+    async def seats():
+        return []
+
+    return app
+
+
+class TestRateLimitMiddleware:
+
+    def test_429_with_retry_after(self, app):
+        limiter, script = make_limiter([1, "0"], [0, "5.2"])
+        app.add_middleware(RateLimitMiddleware, limits={("POST", "/api/auth/login"): RateLimit(1, 60, "ip")},
+                           limiter=limiter)
+        client = TestClient(app)
+
+        assert client.post("/api/auth/login").status_code == 200
+        response = client.post("/api/auth/login")
+
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "6"
+        assert response.json() == {"detail": "Слишком много запросов"}
+        assert script.await_args.kwargs["keys"] == ["rate_limit:POST /api/auth/login:ip:testclient"]
+
+    def test_routes_without_limit_skip_limiter(self, app):
+        limiter, script = make_limiter()
+        app.add_middleware(RateLimitMiddleware, limits={("POST", "/api/auth/login"): RateLimit(1, 60, "ip")},
+                           limiter=limiter)
+
+        assert TestClient(app).get("/api/seat").status_code == 200
+        script.assert_not_awaited()
+
+    def test_user_key_from_token(self, app):
+        limiter, script = make_limiter([1, "0"], [1, "0"])
+        app.add_middleware(RateLimitMiddleware, limits={("GET", "/api/seat"): RateLimit(60, 60, "user")},
+                           limiter=limiter)
+        client = TestClient(app)
+        token = jwt.encode({"sub": "42"}, JWT_SECRET, algorithm=JWT_ALGORITHM)
+
+        client.get("/api/seat", headers={"Authorization": f"Bearer {token}"})
+        client.get("/api/seat", headers={"Authorization": "Bearer forged"})
+
+        keys = [call.kwargs["keys"][0] for call in script.await_args_list]
+        assert keys == ["rate_limit:GET /api/seat:user:42", "rate_limit:GET /api/seat:ip:testclient"]
+
+    def test_trusted_proxies_come_from_env(self, monkeypatch):
+        """Per-IP limits see the client behind the proxy only when gunicorn trusts the proxy"""
+        monkeypatch.setenv("FORWARDED_ALLOW_IPS", "10.0.0.2,10.0.0.3")
+        config = runpy.run_path(str(Path(__file__).parents[2] / "gunicorn.conf.py"))
+        assert config["forwarded_allow_ips"] == "10.0.0.2,10.0.0.3"
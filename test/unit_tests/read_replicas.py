@@ -0,0 +1,127 @@
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from server.backend import database
+from server.backend.database import get_read_session, get_session, read_sessionmaker
+from server.backend.replicas import PRIMARY_STICKY_COOKIE, ReplicaRouter, wrote_recently
+from server.middleware.read_your_writes import ReadYourWritesMiddleware
+from server.routers import admin_panel, reservation, seat, ticket, user
+
+
+def make_router(lags, check_interval=60.0):
+    router = ReplicaRouter([MagicMock() for _ in lags], max_lag=5.0, check_interval=check_interval)
+    router.measure_lag = AsyncMock(side_effect=lambda index: lags[index])
+    return router
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware, sticky_seconds=3)
+
+    @app.get("/ryw-test")
+    async def read():
+        return {}
+
+    @app.post("/ryw-test")
+    async def write():
+        return {}
+
+    @app.post("/ryw-test/fail", status_code=400)
+    async def failed_write():
+        return {}
+
+    return TestClient(app)
+
+
+class TestReplicaRouter:
+
+    @pytest.mark.asyncio
+    async def test_round_robin(self):
+        """Fresh replicas take reads in turn"""
+        router = make_router([0.0, 0.5])
+
+        picked = [await router.pick() for _ in range(4)]
+
+        assert picked == [router.sessionmakers[0], router.sessionmakers[1]] * 2
+
+    @pytest.mark.asyncio
+    async def test_lagging_replica_is_skipped(self):
+        """A replica behind by more than max_lag gets no reads"""
+        router = make_router([30.0, 0.0])
+
+        assert await router.pick() is router.sessionmakers[1]
+        assert await router.pick() is router.sessionmakers[1]
+
+    @pytest.mark.asyncio
+    async def test_all_replicas_lagging_falls_back_to_primary(self):
+        """None means the read goes to the primary"""
+        router = make_router([30.0, float("inf")])
+
+        assert await router.pick() is None
+
+    @pytest.mark.asyncio
+    async def test_lag_is_measured_once_per_interval(self):
+        """Lag is cached between checks"""
+        router = make_router([0.0])
+
+        for _ in range(5):
+            await router.pick()
+
+        router.measure_lag.assert_called_once_with(0)
+
+
+class TestReadSession:
+
+    def test_wrote_recently(self):
+        assert wrote_recently({PRIMARY_STICKY_COOKIE: str(time.time() + 5)})
+        assert not wrote_recently({PRIMARY_STICKY_COOKIE: str(time.time() - 1)})
+        assert not wrote_recently({PRIMARY_STICKY_COOKIE: "garbage"})
+        assert not wrote_recently({})
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("cookies, expected", [({}, "replica"),
+                                                   ({PRIMARY_STICKY_COOKIE: str(time.time() + 60)}, "primary")])
+    async def test_read_session_routing(self, cookies, expected):
+        """Reads go to a replica unless the client has just written"""
+        sessions = {"primary": MagicMock(), "replica": MagicMock()}
+        for name, session in sessions.items():
+            session.return_value.__aenter__.return_value = name
+        replica_router = MagicMock()
+        replica_router.pick = AsyncMock(return_value=sessions["replica"])
+        request = MagicMock(cookies=cookies)
+
+        with patch.object(database, "replica_router", replica_router), \
+                patch.object(database, "AsyncSessionLocal", sessions["primary"]):
+            generator = database.get_read_session(request)
+            assert await generator.__anext__() == expected
+            await generator.aclose()
+
+    @pytest.mark.parametrize("router", [admin_panel.router, reservation.router, seat.router, ticket.router, user.router])
+    def test_replica_routed_reads_never_open_a_primary_session(self, router):
+        """Neither the endpoint nor the current user lookup of a replica-routed GET depends on get_session"""
+        def calls(dependant):
+            for dependency in dependant.dependencies:
+                yield dependency.call
+                yield from calls(dependency)
+
+        for route in router.routes:
+            dependencies = set(calls(route.dependant))
+            if "GET" in route.methods and dependencies & {get_read_session, read_sessionmaker}:
+                assert get_session not in dependencies, route.path
+
+
+class TestReadYourWritesMiddleware:
+
+    def test_write_sets_sticky_cookie(self, client):
+        response = client.post("/ryw-test")
+
+        assert wrote_recently(response.cookies)
+
+    def test_read_and_failed_write_do_not_stick(self, client):
+        assert PRIMARY_STICKY_COOKIE not in client.get("/ryw-test").cookies
+        assert PRIMARY_STICKY_COOKIE not in client.post("/ryw-test/fail").cookies
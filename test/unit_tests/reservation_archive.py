@@ -0,0 +1,205 @@
+import datetime
+import io
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from botocore.exceptions import ClientError
+
+from server.backend.partitions import Partition
+from server.services.reservation_archive import (ReservationArchive, archive_month, archive_reservations, decode_rows,
+                                                 encode_rows, rows_of, user_rows)
+
+
+def make_rows(users, months=(1, 2)):
+    rows = []
+    for user_id in users:
+        for month in months:
+            rows.append({
+                "id": uuid4(), "user_id": user_id, "seat_id": uuid4(),
+                "start": datetime.datetime(2025, month, 10, 9, 30), "end": datetime.datetime(2025, month, 10, 18),
+                "status": "closed", "seat_name": "Переговорная 1",
+            })
+    return rows
+
+
+@pytest.fixture
+def archive():
+    with patch("server.services.s3_bucket.boto3.client") as mock_boto_client:
+        mock_s3 = MagicMock()
+        mock_boto_client.return_value = mock_s3
+        mock_s3.head_bucket.return_value = {}
+        yield ReservationArchive(bucket_name="archive")
+
+
+class TestReservationArchive:
+
+    def test_rows_survive_encoding(self):
+        rows = make_rows([uuid4(), uuid4()])
+
+        decoded = rows_of(decode_rows(encode_rows(rows)))
+
+        key = lambda row: row["id"]
+        assert sorted(decoded, key=key) == sorted(rows, key=key)
+
+    def test_user_rows_are_found_in_sorted_column(self):
+        users = [uuid4() for _ in range(5)]
+        columns = decode_rows(encode_rows(make_rows(users)))
+
+        assert list(columns["user_id"]) == sorted(columns["user_id"])
+        rows = user_rows(columns, users[2])
+        assert len(rows) == 2 and all(row["user_id"] == users[2] for row in rows)
+        assert user_rows(columns, uuid4()) == []
+
+    def test_write_month_merges_with_archived_rows(self, archive):
+        old, new = make_rows([uuid4()], months=(1,)), make_rows([uuid4()], months=(1,))
+        archive.s3.get_object.return_value = {"Body": io.BytesIO(encode_rows(old))}
+
+        assert archive.write_month(datetime.date(2025, 1, 1), new + old) == 2
+
+        put = archive.s3.put_object.call_args.kwargs
+        assert put["Bucket"] == "archive" and put["Key"] == "reservations/2025-01.npz"
+        assert {row["id"] for row in rows_of(decode_rows(put["Body"]))} == {row["id"] for row in old + new}
+
+    def test_write_first_month(self, archive):
+        archive.s3.get_object.side_effect = ClientError({"Error": {"Code": "NoSuchKey"}}, "get_object")
+
+        assert archive.write_month(datetime.date(2025, 1, 1), make_rows([uuid4()], months=(1,))) == 1
+        archive.s3.put_object.assert_called_once()
+
+    def test_user_history_reads_only_months_in_range(self, archive):
+        user_id = uuid4()
+        objects = {
+            "reservations/2025-01.npz": encode_rows(make_rows([user_id, uuid4()], months=(1,))),
+            "reservations/2025-02.npz": encode_rows(make_rows([user_id, uuid4()], months=(2,))),
+        }
+        archive.s3.get_paginator.return_value.paginate.return_value = [
+            {"Contents": [{"Key": key, "ETag": key} for key in objects] + [{"Key": "reservations/readme", "ETag": ""}]}
+        ]
+        archive.s3.get_object.side_effect = lambda Bucket, Key: {"Body": io.BytesIO(objects[Key])}
+
+        history = archive.user_history(user_id)
+        assert [row["start"].month for row in history] == [1, 2]
+        assert all(row["user_id"] == user_id for row in history)
+
+        archive.s3.get_object.reset_mock()
+        history = archive.user_history(user_id, since=datetime.datetime(2025, 2, 1))
+        assert [row["start"].month for row in history] == [2]
+        # Месяцы уже расшифрованы и лежат в кэше
+        archive.s3.get_object.assert_not_called()
+
+    def test_month_listing_is_cached(self, archive):
+        paginate = archive.s3.get_paginator.return_value.paginate
+        paginate.return_value = [{"Contents": [{"Key": "reservations/2025-01.npz", "ETag": "a"}]}]
+
+        assert archive.list_months() == archive.list_months() == {datetime.date(2025, 1, 1): "a"}
+        paginate.assert_called_once()
+
+        archive.s3.get_object.side_effect = ClientError({"Error": {"Code": "NoSuchKey"}}, "get_object")
+        archive.write_month(datetime.date(2025, 2, 1), make_rows([uuid4()], months=(2,)))
+        archive.list_months()
+        # Свой же новый месяц виден сразу
+        assert paginate.call_count == 2
+
+    def test_user_history_reads_at_most_max_months(self, archive):
+        user_id = uuid4()
+        objects = {f"reservations/2025-0{month}.npz": encode_rows(make_rows([user_id], months=(month,)))
+                   for month in (1, 2, 3)}
+        archive.s3.get_paginator.return_value.paginate.return_value = [
+            {"Contents": [{"Key": key, "ETag": key} for key in objects]}
+        ]
+        archive.s3.get_object.side_effect = lambda Bucket, Key: {"Body": io.BytesIO(objects[Key])}
+
+        history = archive.user_history(user_id, max_months=2)
+        assert [row["start"].month for row in history] == [2, 3]
+        assert archive.s3.get_object.call_count == 2
+
+        history = archive.user_history(user_id, until=datetime.datetime(2025, 2, 1), max_months=2)
+        assert [row["start"].month for row in history] == [1]
+
+    def test_archive_is_not_an_image_storage(self, archive):
+        assert not hasattr(archive, "upload_image") and not hasattr(archive, "get_image")
+
+
+def make_engine(connection, open_transactions=None):
+    open_transactions = [] if open_transactions is None else open_transactions
+
+    @asynccontextmanager
+    async def begin():
+        open_transactions.append(connection)
+        try:
+            yield connection
+        finally:
+            open_transactions.pop()
+
+    engine = MagicMock()
+    engine.begin = begin
+    engine.connect = begin
+    return engine
+
+
+class TestArchiveMonth:
+
+    @pytest.mark.asyncio
+    async def test_object_is_written_outside_data_transactions(self, archive):
+        month = datetime.date(2025, 1, 1)
+        rows = make_rows([uuid4()], months=(1,))
+        open_transactions = []
+
+        connection = MagicMock()
+        # Блокировка взята; затем число броней месяца: при чтении, перед DETACH и в отсоединенной партиции
+        connection.scalar = AsyncMock(side_effect=[True, 1, 1, 1])
+        connection.execute = AsyncMock(return_value=[MagicMock(_mapping=rows[0])])
+        engine = make_engine(connection, open_transactions)
+
+        def write_month(written_month, written_rows):
+            # Открыта только транзакция с advisory-блокировкой
+            assert len(open_transactions) == 1
+            assert written_rows == rows
+
+        with patch("server.services.reservation_archive.list_partitions",
+                   AsyncMock(return_value=[Partition("reservations_y2025m01", month)])), \
+                patch.object(archive, "write_month", side_effect=write_month) as mock_write:
+            assert await archive_month(engine, archive, month) == 1
+
+        mock_write.assert_called_once()
+        statements = [str(call.args[0]) for call in connection.execute.call_args_list]
+        assert "DETACH PARTITION reservations_y2025m01" in statements[1]
+        assert statements[2] == "DROP TABLE reservations_y2025m01"
+
+    @pytest.mark.asyncio
+    async def test_month_without_partition_is_archived_from_default(self, archive):
+        month = datetime.date(2024, 12, 1)
+        rows = make_rows([uuid4()], months=(1,))
+        connection = MagicMock()
+        connection.scalar = AsyncMock(side_effect=[True, 1])
+        connection.execute = AsyncMock(return_value=[MagicMock(_mapping=rows[0])])
+
+        with patch("server.services.reservation_archive.list_partitions",
+                   AsyncMock(return_value=[Partition("reservations_y2025m01", datetime.date(2025, 1, 1))])), \
+                patch.object(archive, "write_month") as mock_write:
+            assert await archive_month(make_engine(connection), archive, month) == 1
+
+        mock_write.assert_called_once_with(month, rows)
+        statements = [str(call.args[0]) for call in connection.execute.call_args_list]
+        assert statements[1].startswith("DELETE FROM reservations")
+        assert not any("DETACH" in statement or "DROP" in statement for statement in statements)
+
+    @pytest.mark.asyncio
+    async def test_old_rows_of_default_partition_are_archived(self, archive):
+        connection = MagicMock()
+        result = MagicMock()
+        result.scalars.return_value = [datetime.date(2024, 12, 1)]
+        connection.execute = AsyncMock(return_value=result)
+        partitions = [Partition(f"reservations_y2025m0{month}", datetime.date(2025, month, 1)) for month in (1, 8)]
+
+        with patch("server.services.reservation_archive.list_partitions", AsyncMock(return_value=partitions)), \
+                patch("server.services.reservation_archive.archive_month", AsyncMock(return_value=1)) as mock_archive:
+            archived = await archive_reservations(make_engine(connection), archive, datetime.timedelta(days=180),
+                                                  today=datetime.date(2025, 9, 15))
+
+        assert list(archived) == [datetime.date(2024, 12, 1), datetime.date(2025, 1, 1)]
+        query = str(connection.execute.call_args.args[0])
+        assert "FROM reservations_default" in query
+        assert connection.execute.call_args.args[1] == {"cutoff": datetime.datetime(2025, 3, 1)}
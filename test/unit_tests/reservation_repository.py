@@ -5,7 +5,7 @@ from uuid import UUID, uuid4
 from server.repositories.reservation import ReservationRepository
 from server.schemas.reservation import ReservationCreate, ReservationUpdate
 from server.schemas.reservation import ReservationStatusEnum
-from server.utils.exceptions import SeatIsNotAvailableError
+from server.utils.exceptions import ReservationTooLongError, SeatIsNotAvailableError
 from server.utils.datetime_utils import MOSCOW_TZ
 
 @pytest.fixture
@@ -153,6 +153,20 @@ class TestReservationRepository:
         result = await repo.update_reservation(reservation_id, update_data)
         assert result == mock_reservation
 
+    @pytest.mark.asyncio
+    @patch("server.repositories.reservation.select")
+    async def test_update_reservation_end_only_is_checked_against_stored_start(self, mock_select, mock_db,
+                                                                                mock_reservation):
+        repo = ReservationRepository(mock_db)
+        mock_db.execute.return_value.scalars.return_value.first.return_value = mock_reservation
+        update_data = ReservationUpdate(end=mock_reservation.start + datetime.timedelta(days=40))
+
+        with pytest.raises(ReservationTooLongError):
+            await repo.update_reservation(uuid4(), update_data)
+
+        mock_db.commit.assert_not_called()
+        assert mock_reservation.end == datetime.datetime(2023, 1, 1, 12, 0)
+
     @pytest.mark.asyncio
     @patch("server.repositories.reservation.select")
     @patch("server.repositories.reservation.Reservation")
@@ -164,4 +178,52 @@ class TestReservationRepository:
         mock_select.assert_called_once()
         mock_db.delete.assert_called_once_with(mock_reservation)
         mock_db.commit.assert_called_once()
-        assert result is True
\ No newline at end of file
+        assert result is True
+    @pytest.mark.asyncio
+    @patch("server.repositories.reservation.fetch_dicts", new_callable=AsyncMock)
+    async def test_list_with_seat_names(self, mock_fetch_dicts, mock_db, mock_reservation, mock_seat):
+        repo = ReservationRepository(mock_db)
+        row = {"id": mock_reservation.id, "user_id": mock_reservation.user_id, "seat_name": mock_seat.name}
+        mock_fetch_dicts.return_value = [row]
+
+        result = await repo.list_with_seat_names(mock_reservation.user_id)
+
+        assert result == [row]
+        query = str(mock_fetch_dicts.call_args[0][1])
+        assert "JOIN seats" in query
+        assert "reservations.user_id =" in query
+
+    @pytest.mark.asyncio
+    async def test_update_statuses_is_one_update(self, mock_db):
+        repo = ReservationRepository(mock_db)
+
+        result = await repo.update_statuses()
+
+        assert result is True
+        mock_db.execute.assert_called_once()
+        query = str(mock_db.execute.call_args[0][0])
+        assert query.startswith("UPDATE reservations SET status=")
+        assert "reservations.status =" in query and "reservations.\"end\" <" in query
+        mock_db.commit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_count_by_seat(self, mock_db):
+        repo = ReservationRepository(mock_db)
+        seat_id = uuid4()
+        mock_db.execute.return_value.all.return_value = [(seat_id, 3)]
+
+        assert await repo.count_by_seat(uuid4()) == {seat_id: 3}
+        query = str(mock_db.execute.call_args[0][0])
+        assert "GROUP BY reservations.seat_id" in query and "reservations.status !=" in query
+
+    def test_reservation_longer_than_max_duration_is_rejected(self):
+        from pydantic import ValidationError
+        from server.schemas.reservation import RESERVATION_MAX_DURATION
+
+        start = datetime.datetime.now(tz=MOSCOW_TZ)
+        with pytest.raises(ValidationError):
+            ReservationCreate(user_id=uuid4(), seat_id=uuid4(), start=start,
+                              end=start + RESERVATION_MAX_DURATION + datetime.timedelta(minutes=1))
+        with pytest.raises(ValidationError):
+            ReservationUpdate(start=start, end=start + RESERVATION_MAX_DURATION + datetime.timedelta(minutes=1))
+        ReservationCreate(user_id=uuid4(), seat_id=uuid4(), start=start, end=start + RESERVATION_MAX_DURATION)
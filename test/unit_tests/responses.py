@@ -0,0 +1,36 @@
+import json
+from datetime import datetime
+from uuid import uuid4
+
+from server.schemas.reservation import ReservationOut
+from server.schemas.ticket import TicketBase
+from server.utils.responses import ModelListResponse, list_adapter
+
+
+class TestModelListResponse:
+
+    def test_renders_items_as_json(self):
+        """Rows are validated against the model and rendered in one pass"""
+        reservation = {"id": uuid4(), "user_id": uuid4(), "seat_id": uuid4(), "start": datetime(2025, 3, 1, 9),
+                       "end": datetime(2025, 3, 1, 18), "status": "future", "seat_name": "A-1"}
+
+        response = ModelListResponse(ReservationOut, [reservation])
+
+        assert response.media_type == "application/json"
+        assert json.loads(response.body) == [{
+            "id": str(reservation["id"]), "user_id": str(reservation["user_id"]),
+            "seat_id": str(reservation["seat_id"]), "start": "2025-03-01T09:00:00", "end": "2025-03-01T18:00:00",
+            "status": "future", "seat_name": "A-1",
+        }]
+
+    def test_fields_outside_model_are_dropped(self):
+        ticket = {"id": uuid4(), "user_id": uuid4(), "theme": "wish", "message": "Больше розеток",
+                  "status": "active", "made_on": datetime(2025, 3, 1), "seat_name": "A-1"}
+
+        body = json.loads(ModelListResponse(TicketBase, reversed([ticket])).body)
+
+        assert "seat_name" not in body[0]
+        assert body[0]["reservation_id"] is None
+
+    def test_adapter_is_built_once(self):
+        assert list_adapter(ReservationOut) is list_adapter(ReservationOut)
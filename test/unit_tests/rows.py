@@ -0,0 +1,28 @@
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+
+from server.models.user import User
+from server.utils.rows import fetch_dicts
+
+
+class TestFetchDicts:
+
+    @pytest.mark.asyncio
+    async def test_rows_become_dicts(self):
+        """Rows are executed on the connection and returned as dicts keyed by column labels"""
+        first, second = uuid4(), uuid4()
+        result = MagicMock()
+        result.keys.return_value = ["id", "email"]
+        result.__iter__.return_value = iter([(first, "a@example.com"), (second, "b@example.com")])
+        connection = AsyncMock()
+        connection.execute.return_value = result
+        db = AsyncMock()
+        db.connection.return_value = connection
+
+        rows = await fetch_dicts(db, select(User.id, User.email))
+
+        assert rows == [{"id": first, "email": "a@example.com"}, {"id": second, "email": "b@example.com"}]
+        db.execute.assert_not_called()
@@ -0,0 +1,123 @@
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import orjson
+import pytest
+from redis.exceptions import ConnectionError
+
+from server.services.seat_availability import SeatAvailabilityCache
+from server.utils.single_flight import SingleFlight
+
+# В базу окно уходит московским временем без зоны (make_timezone_naive): 12:00-21:00
+START = datetime(2025, 3, 3, 9, tzinfo=timezone.utc)
+END = datetime(2025, 3, 3, 18, tzinfo=timezone.utc)
+
+
+def slow_repository(rows, delay=0.01):
+    async def list_with_availability(start, end):
+        await asyncio.sleep(delay)
+        return rows
+
+    repository = MagicMock()
+    repository.return_value.list_with_availability = AsyncMock(side_effect=list_with_availability)
+    return repository
+
+
+class TestSingleFlight:
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_task(self):
+        flight = SingleFlight()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        results = await asyncio.gather(*(flight.do("key", work) for _ in range(20)))
+
+        assert results == [1] * 20
+        assert not flight.in_flight("key")
+        assert await flight.do("key", work) == 2
+
+    @pytest.mark.asyncio
+    async def test_error_is_shared_and_forgotten(self):
+        flight = SingleFlight()
+        work = AsyncMock(side_effect=[ValueError("boom"), "ok"])
+
+        results = await asyncio.gather(flight.do("key", work), flight.do("key", work), return_exceptions=True)
+
+        assert all(isinstance(result, ValueError) for result in results)
+        assert await flight.do("key", work) == "ok"
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        flight = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.02)
+            return "rows"
+
+        first = asyncio.create_task(flight.do("key", work))
+        second = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == "rows"
+
+
+class TestSeatAvailabilityCache:
+
+    @pytest.mark.asyncio
+    async def test_herd_hits_database_once(self, session_factory):
+        rows = [{"id": uuid4(), "name": "A1", "is_available": True}]
+        cache = SeatAvailabilityCache(ttl=0)
+        factory = session_factory()
+
+        with patch("server.services.seat_availability.SeatRepository", slow_repository(rows)) as repository:
+            results = await asyncio.gather(*(cache.list_with_availability(factory, START, END) for _ in range(50)))
+
+        assert all(result is rows for result in results)
+        repository.return_value.list_with_availability.assert_awaited_once_with(
+            datetime(2025, 3, 3, 12), datetime(2025, 3, 3, 21)
+        )
+        factory.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_rows_are_shared_through_redis(self, session_factory):
+        rows = [{"id": uuid4(), "name": "A1", "is_available": False}]
+        client = AsyncMock()
+        client.get.return_value = None
+        cache = SeatAvailabilityCache(client, ttl=1.5)
+
+        with patch("server.services.seat_availability.SeatRepository", slow_repository(rows)):
+            assert await cache.list_with_availability(session_factory(), START, END) == rows
+
+        key, payload = client.set.await_args.args
+        assert key == "seat_availability:2025-03-03T12:00:00/2025-03-03T21:00:00"
+        assert client.set.await_args.kwargs == {"px": 1500}
+
+        client.get.return_value = payload
+        with patch("server.services.seat_availability.SeatRepository") as repository:
+            cached = await cache.list_with_availability(session_factory(), START, END)
+
+        assert cached == orjson.loads(payload)
+        repository.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_redis_errors_fall_back_to_database(self, session_factory):
+        rows = [{"id": uuid4()}]
+        client = AsyncMock()
+        client.get.side_effect = ConnectionError("refused")
+        cache = SeatAvailabilityCache(client, ttl=1, backoff=60)
+
+        with patch("server.services.seat_availability.SeatRepository", slow_repository(rows, delay=0)):
+            assert await cache.list_with_availability(session_factory(), START, END) == rows
+            assert await cache.list_with_availability(session_factory(), START, END) == rows
+
+        client.get.assert_awaited_once()
+        client.set.assert_not_awaited()
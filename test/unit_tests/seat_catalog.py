@@ -0,0 +1,139 @@
+import asyncio
+import math
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from fastapi import HTTPException
+
+from server.routers.seat import get_nearest_seats
+from server.services.seat_catalog import SeatCatalog, SeatCatalogCache, SeatIndex
+
+START = datetime(2025, 3, 3, 9)
+END = datetime(2025, 3, 3, 18)
+
+
+def brute_force(coords, x, y, k, allowed=None):
+    indexed = np.isfinite(coords).all(axis=1)
+    if allowed is not None:
+        indexed &= allowed
+    positions = np.flatnonzero(indexed)
+    distances = np.hypot(*(coords[positions] - (x, y)).T)
+    return np.sort(distances)[:k]
+
+
+class TestSeatIndex:
+
+    @pytest.mark.parametrize("layout", ["uniform", "clusters", "line", "unplaced"])
+    def test_matches_brute_force(self, layout):
+        rng = np.random.default_rng(7)
+        if layout == "clusters":
+            coords = np.concatenate([rng.normal(10, 1, (150, 2)), rng.normal(80, 5, (150, 2))])
+        elif layout == "line":
+            coords = np.stack([rng.uniform(0, 50, 300), np.full(300, 3.0)], axis=1)
+        else:
+            coords = rng.uniform(0, 100, (300, 2))
+            if layout == "unplaced":
+                coords[rng.random(300) < 0.2] = np.nan
+        index = SeatIndex(coords)
+        allowed = rng.random(300) < 0.3
+
+        for x, y in rng.uniform(-20, 120, (30, 2)):
+            positions, distances = index.nearest(x, y, 5, allowed)
+            assert np.allclose(distances, brute_force(coords, x, y, 5, allowed))
+            assert allowed[positions].all()
+            assert np.allclose(index.nearest(x, y, 3)[1], brute_force(coords, x, y, 3))
+
+    def test_fewer_seats_than_k(self):
+        index = SeatIndex(np.array([[0.0, 0.0], [3.0, 4.0], [1.0, 1.0]]))
+
+        positions, distances = index.nearest(0, 0, 10, allowed=np.array([True, True, False]))
+
+        assert positions.tolist() == [0, 1]
+        assert distances.tolist() == [0.0, 5.0]
+
+    def test_empty(self):
+        positions, distances = SeatIndex(np.empty((0, 2))).nearest(1, 1, 5)
+        assert positions.size == 0 and distances.size == 0
+
+
+class TestSeatCatalog:
+
+    def test_mask_and_unplaced_seats(self, seat_row):
+        rows = [seat_row(0, 0), seat_row(None, None), seat_row(1, 0)]
+        catalog = SeatCatalog(rows)
+
+        assert catalog.mask([rows[2]["id"], uuid4()], False).tolist() == [True, True, False]
+        assert math.isnan(catalog.coords[1, 0])
+        assert catalog.index.size == 2
+
+    @pytest.mark.asyncio
+    async def test_cache_reloads_after_invalidate(self, seat_row, session_factory):
+        cache = SeatCatalogCache(max_age=60)
+        with patch("server.services.seat_catalog.SeatRepository") as repository:
+            repository.return_value.list_catalog = AsyncMock(return_value=[seat_row(0, 0)])
+            first = await cache.get(session_factory())
+            assert await cache.get(session_factory()) is first
+            cache.invalidate()
+            assert await cache.get(session_factory()) is not first
+
+        assert repository.return_value.list_catalog.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidate_during_load_is_not_lost(self, seat_row, session_factory):
+        cache = SeatCatalogCache(max_age=60)
+        stale, fresh = [seat_row(0, 0)], [seat_row(0, 0), seat_row(1, 1)]
+        loading = asyncio.Event()
+        release = asyncio.Event()
+
+        async def list_catalog():
+            if not loading.is_set():
+                loading.set()
+                await release.wait()
+                return stale
+            return fresh
+
+        with patch("server.services.seat_catalog.SeatRepository") as repository:
+            repository.return_value.list_catalog = list_catalog
+            first = asyncio.ensure_future(cache.get(session_factory()))
+            await loading.wait()
+            # Место изменили, пока каталог читался
+            cache.invalidate()
+            # Со старым ключом второй запрос ждал бы первую загрузку
+            second = await asyncio.wait_for(cache.get(session_factory()), timeout=1)
+            release.set()
+            assert len(await first) == 1
+
+            assert len(second) == 2
+            assert await cache.get(session_factory()) is second
+
+
+class TestNearestSeatsEndpoint:
+
+    @pytest.mark.asyncio
+    async def test_nearest_free_seats_to_a_colleague(self, seat_row, session_factory):
+        rows = [seat_row(0, 0), seat_row(1, 0), seat_row(2, 0), seat_row(10, 0)]
+        catalog = SeatCatalog(rows)
+        repository = MagicMock()
+        repository.get_user_seat_id = AsyncMock(return_value=rows[0]["id"])
+        repository.get_occupied_seat_ids = AsyncMock(return_value=[rows[0]["id"], rows[1]["id"]])
+
+        with patch("server.routers.seat.seat_catalog.get", AsyncMock(return_value=catalog)), \
+                patch("server.routers.seat.SeatRepository", return_value=repository):
+            response = await get_nearest_seats(START, END, x=None, y=None, user_id=uuid4(), k=2,
+                                               current_user=MagicMock(), session_factory=session_factory())
+
+        seats = response.body.decode()
+        assert str(rows[2]["id"]) in seats and str(rows[3]["id"]) in seats
+        assert str(rows[1]["id"]) not in seats
+        assert '"distance":2.0' in seats
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("point", [{}, {"x": 1.0}, {"x": 1.0, "y": 1.0, "user_id": uuid4()}])
+    async def test_point_or_colleague_required(self, point, session_factory):
+        with pytest.raises(HTTPException) as error:
+            await get_nearest_seats(START, END, **{"x": None, "y": None, "user_id": None, **point}, k=5,
+                                    current_user=MagicMock(), session_factory=session_factory())
+        assert error.value.status_code == 400
@@ -0,0 +1,144 @@
+import json
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from fastapi import HTTPException
+
+from server.routers.seat import get_recommended_seats
+from server.services.seat_catalog import SeatCatalog
+from server.services.seat_recommendation import (
+    SeatRecommender,
+    UserPreferences,
+    score_seats,
+    top_seats,
+    wanted_amenities,
+)
+
+START = datetime(2025, 3, 3, 9)
+END = datetime(2025, 3, 3, 18)
+NO_TEAM = np.empty((0, 2))
+
+
+@pytest.fixture
+def catalog(seat_row):
+    return SeatCatalog([
+        seat_row(0, 0, "has_computer", "is_quite"),
+        seat_row(5, 0, "has_computer"),
+        seat_row(50, 0, "is_talk_room"),
+        seat_row(None, None, "has_computer", "is_quite"),
+    ])
+
+
+class TestScoreSeats:
+
+    def test_wanted_amenities(self, catalog):
+        scores = score_seats(catalog, UserPreferences({}), wanted_amenities(["has_computer", "is_quite"]), NO_TEAM)
+
+        assert scores.amenities.tolist() == [1.0, 0.5, 0.0, 1.0]
+        assert not scores.team.any() and not scores.history.any()
+
+    def test_team_distance(self, catalog):
+        scores = score_seats(catalog, UserPreferences({}), wanted_amenities([]), np.array([[50.0, 0.0], [4.0, 0.0]]),
+                             team_distance=1)
+
+        assert scores.team[2] == 1.0
+        assert scores.team[1] == pytest.approx(0.5)
+        assert scores.team[1] > scores.team[0]
+        assert scores.team[3] == 0.0
+
+    def test_history_and_learned_amenities(self, catalog):
+        preferences = UserPreferences({catalog.ids[2]: 3, catalog.ids[1]: 1})
+
+        scores = score_seats(catalog, preferences, wanted_amenities([]), NO_TEAM)
+
+        assert scores.history.tolist() == [0.0, 1 / 3, 1.0, 0.0]
+        # 3 из 4 броней - переговорная, 1 из 4 - с компьютером
+        assert scores.amenities[2] == pytest.approx(0.75)
+        assert scores.amenities[1] == pytest.approx(0.25)
+
+    def test_incremental_update_matches_reload(self, catalog):
+        preferences = UserPreferences({catalog.ids[0]: 1}).aligned(catalog)
+        preferences.add(catalog.ids[1])
+        preferences.add(catalog.ids[1])
+        reloaded = UserPreferences({catalog.ids[0]: 1, catalog.ids[1]: 2}).aligned(catalog)
+
+        assert preferences.history.tolist() == reloaded.history.tolist()
+        assert preferences.amenity_sum.tolist() == reloaded.amenity_sum.tolist()
+
+    def test_unknown_amenity(self):
+        with pytest.raises(ValueError):
+            wanted_amenities(["has_pool"])
+
+
+class TestTopSeats:
+
+    def test_best_allowed_first(self):
+        scores = np.array([0.1, 0.9, 0.5, 0.9, 0.7])
+
+        assert top_seats(scores, np.array([True, True, True, False, True]), 3).tolist() == [1, 4, 2]
+        assert top_seats(scores, np.ones(5, dtype=bool), 10).tolist() == [1, 3, 4, 2, 0]
+
+
+class TestSeatRecommender:
+
+    @pytest.mark.asyncio
+    async def test_cached_preferences_follow_new_reservations(self, session_factory):
+        recommender = SeatRecommender()
+        user_id, seat_id = uuid4(), uuid4()
+        with patch("server.services.seat_recommendation.ReservationRepository") as repository:
+            repository.return_value.count_by_seat = AsyncMock(return_value={seat_id: 2})
+            preferences = await recommender.preferences(session_factory(), user_id)
+            recommender.record(user_id, seat_id)
+            recommender.record(uuid4(), seat_id)
+
+            assert await recommender.preferences(session_factory(), user_id) is preferences
+
+        assert preferences.seat_counts == {seat_id: 3}
+        repository.return_value.count_by_seat.assert_awaited_once_with(user_id)
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_user_is_evicted(self, session_factory):
+        recommender = SeatRecommender(max_users=2)
+        first, second, third = uuid4(), uuid4(), uuid4()
+        with patch("server.services.seat_recommendation.ReservationRepository") as repository:
+            repository.return_value.count_by_seat = AsyncMock(return_value={})
+            for user_id in (first, second, first, third):
+                await recommender.preferences(session_factory(), user_id)
+
+        assert list(recommender._preferences) == [first, third]
+
+
+class TestRecommendationsEndpoint:
+
+    @pytest.mark.asyncio
+    async def test_ranks_free_seats(self, seat_row, session_factory):
+        catalog = SeatCatalog([seat_row(0, 0, "has_computer"), seat_row(5, 0, "has_computer"),
+                               seat_row(50, 0), seat_row(1000, 0, "has_computer")])
+        repository = MagicMock()
+        repository.get_occupied_seat_ids = AsyncMock(return_value=[catalog.ids[0]])
+        repository.get_seat_ids_of_users = AsyncMock(return_value=[catalog.ids[2]])
+        recommender = MagicMock()
+        recommender.preferences = AsyncMock(return_value=UserPreferences({}))
+
+        with patch("server.routers.seat.seat_catalog.get", AsyncMock(return_value=catalog)), \
+                patch("server.routers.seat.seat_recommender", recommender), \
+                patch("server.routers.seat.SeatRepository", return_value=repository):
+            response = await get_recommended_seats(START, END, amenities=["has_computer"], teammates=[uuid4()], k=2,
+                                                   current_user=MagicMock(), session_factory=session_factory())
+
+        seats = json.loads(response.body)
+        # Занятое место 0 не предлагается; место 1 - компьютер и коллега рядом (1 + 1/5.5),
+        # место 3 - компьютер далеко от коллеги (1 + 1/96), место 2 - у коллеги без компьютера (1.0)
+        assert [seat["id"] for seat in seats] == [str(catalog.ids[1]), str(catalog.ids[3])]
+        assert seats[0]["score"] == pytest.approx(1 + 1 / 5.5)
+        assert seats[1]["team_score"] == pytest.approx(1 / 96)
+
+    @pytest.mark.asyncio
+    async def test_unknown_amenity(self, session_factory):
+        with pytest.raises(HTTPException) as error:
+            await get_recommended_seats(START, END, amenities=["has_pool"], teammates=[], k=2,
+                                        current_user=MagicMock(), session_factory=session_factory())
+        assert error.value.status_code == 400
@@ -348,4 +348,38 @@ class TestSeatRepository:
         # Verify the correct query was made with time range filtering
         filter_call = mock_db.execute.call_args_list[1][0][0]
         # The seat should be marked as unavailable due to the overlapping reservation
-        assert result[0].is_available is False
\ No newline at end of file
+        assert result[0].is_available is False
+    @pytest.mark.asyncio
+    @patch("server.repositories.seat.fetch_dicts", new_callable=AsyncMock)
+    async def test_list_with_availability(self, mock_fetch_dicts, mock_db):
+        """Lean path computes availability in SQL and returns plain rows"""
+        repo = SeatRepository(mock_db)
+        row = {"id": uuid4(), "name": "A1", "type": "desk", "x": 1.0, "y": 2.0, "is_available": False}
+        mock_fetch_dicts.return_value = [row]
+
+        start = datetime(2023, 1, 1, 9, 0, tzinfo=timezone.utc)
+        end = datetime(2023, 1, 1, 11, 0, tzinfo=timezone.utc)
+        result = await repo.list_with_availability(start, end)
+
+        assert result == [row]
+        mock_fetch_dicts.assert_called_once()
+        query = str(mock_fetch_dicts.call_args[0][1])
+        assert "EXISTS" in query
+        assert "reservations.status IN" in query
+
+    @pytest.mark.asyncio
+    async def test_occupied_and_user_seat_queries(self, mock_db):
+        """Both lookups use the same overlap conditions as list_with_availability"""
+        repo = SeatRepository(mock_db)
+        seat_id = uuid4()
+        mock_db.execute.return_value.scalars.return_value = iter([seat_id])
+        mock_db.execute.return_value.scalar.return_value = seat_id
+
+        start = datetime(2023, 1, 1, 9, 0, tzinfo=timezone.utc)
+        end = datetime(2023, 1, 1, 11, 0, tzinfo=timezone.utc)
+        assert await repo.get_occupied_seat_ids(start, end) == [seat_id]
+        assert await repo.get_user_seat_id(uuid4(), start, end) == seat_id
+
+        occupied, user_seat = (str(call.args[0]) for call in mock_db.execute.call_args_list)
+        assert "DISTINCT" in occupied and "reservations.status IN" in occupied
+        assert "reservations.user_id" in user_seat and "LIMIT" in user_seat
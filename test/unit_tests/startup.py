@@ -0,0 +1,31 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from server.backend import startup
+from server.backend.startup import wait_ready
+
+
+class TestStartup:
+
+    @pytest.mark.asyncio
+    async def test_dependency_is_retried_until_ready(self):
+        check = AsyncMock(side_effect=[OSError("refused"), OSError("refused"), None])
+
+        with patch.dict(startup.startup_timings, clear=True), \
+                patch("server.backend.startup.startup_dependency_seconds") as mock_gauge:
+            elapsed = await wait_ready("database", check, (OSError,), retry_interval=0)
+            assert startup.startup_timings == {"database": elapsed}
+
+        assert check.await_count == 3
+        mock_gauge.labels.assert_called_once_with("database")
+        mock_gauge.labels.return_value.set.assert_called_once_with(elapsed)
+
+    @pytest.mark.asyncio
+    async def test_unexpected_errors_are_not_swallowed(self):
+        check = AsyncMock(side_effect=RuntimeError("bug"))
+
+        with patch.dict(startup.startup_timings, clear=True):
+            with pytest.raises(RuntimeError):
+                await wait_ready("redis", check, (OSError,), retry_interval=0)
+            assert "redis" not in startup.startup_timings
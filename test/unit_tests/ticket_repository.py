@@ -1,6 +1,8 @@
 import pytest
-from unittest.mock import AsyncMock, MagicMock
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.asyncio import AsyncSession
 from server.repositories.ticket import TicketRepository
 from server.models.ticket import Ticket
@@ -104,6 +106,7 @@ class TestTicketRepository:
         mock_db.get.assert_called_once_with(Ticket, ticket_id)
         mock_db.commit.assert_called_once()
         assert mock_ticket.status == new_status
+        assert mock_ticket.claimed_by is None and mock_ticket.claimed_until is None
         assert result == mock_ticket
 
     @pytest.mark.asyncio
@@ -129,3 +132,99 @@ class TestTicketRepository:
         
         mock_db.execute.assert_called_once()
         assert result == unanswered_tickets
+
+    @pytest.mark.asyncio
+    async def test_get_tickets_page_is_keyset(self, mock_db):
+        repo = TicketRepository(mock_db)
+        before = (datetime(2025, 3, 1, 12, 0), uuid4())
+
+        with patch("server.repositories.ticket.fetch_dicts", AsyncMock(return_value=[])) as fetch:
+            await repo.get_tickets_page(50, before, status=TicketStatusEnum.CLOSED, theme=TicketThemeEnum.WISH)
+
+        sql = str(fetch.call_args.args[1])
+        assert "(tickets.made_on, tickets.id) <" in sql
+        assert "tickets.status =" in sql and "tickets.theme =" in sql
+        assert "ORDER BY tickets.made_on DESC, tickets.id DESC" in sql
+        assert "OFFSET" not in sql
+
+    @pytest.mark.asyncio
+    async def test_get_inbox_page_moves_on_to_answered(self, mock_db):
+        """When unanswered tickets run out the page is filled with answered ones and the cursor switches phase"""
+        repo = TicketRepository(mock_db)
+        made_on = datetime(2025, 3, 1, 12, 0)
+        unanswered = [{"id": uuid4(), "made_on": made_on, "status": "active"}]
+        answered = [{"id": uuid4(), "made_on": made_on - timedelta(minutes=i), "status": "closed"} for i in range(3)]
+        mock_db.execute.return_value.mappings.return_value = unanswered
+        repo.get_tickets_page = AsyncMock(return_value=answered)
+
+        rows, position = await repo.get_inbox_page(3)
+
+        repo.get_tickets_page.assert_called_once_with(3, None, theme=None, answered=True)
+        assert rows == unanswered + answered[:2]
+        assert position == (True, answered[1]["made_on"], answered[1]["id"])
+
+    @pytest.mark.asyncio
+    async def test_get_inbox_page_last_page(self, mock_db):
+        repo = TicketRepository(mock_db)
+        before = (datetime(2025, 3, 1, 12, 0), uuid4())
+        repo.get_tickets_page = AsyncMock(return_value=[{"id": uuid4(), "made_on": before[0], "status": "closed"}])
+
+        rows, position = await repo.get_inbox_page(3, before, answered=True)
+
+        mock_db.execute.assert_not_called()
+        repo.get_tickets_page.assert_called_once_with(4, before, theme=None, answered=True)
+        assert len(rows) == 1 and position is None
+
+    @pytest.mark.asyncio
+    async def test_search_is_ranked_full_text(self, mock_db):
+        repo = TicketRepository(mock_db)
+
+        with patch("server.repositories.ticket.fetch_dicts", AsyncMock(return_value=[])) as fetch:
+            await repo.search("не работает розетка", 20, 40, theme=TicketThemeEnum.FAILURE)
+
+        sql = str(fetch.call_args.args[1])
+        assert "tickets.search_vector @@ websearch_to_tsquery" in sql
+        assert "ORDER BY ts_rank_cd(tickets.search_vector, websearch_to_tsquery" in sql
+        assert "tickets.theme =" in sql and "tickets.status =" not in sql
+        assert "ILIKE" not in sql.upper()
+
+    @pytest.mark.asyncio
+    async def test_claim_next_skips_locked(self, mock_db):
+        repo = TicketRepository(mock_db)
+        admin_id = uuid4()
+        made_on = datetime(2025, 3, 1, 12, 0)
+        claimed = [{"id": uuid4(), "made_on": made_on}, {"id": uuid4(), "made_on": made_on - timedelta(hours=1)}]
+        mock_db.execute.return_value.mappings.return_value = claimed
+
+        rows = await repo.claim_next(admin_id, 2)
+
+        sql = str(mock_db.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert sql.startswith("UPDATE tickets SET claimed_by=")
+        assert "FOR UPDATE SKIP LOCKED" in sql
+        assert "RETURNING" in sql
+        mock_db.commit.assert_called_once()
+        assert rows == claimed[::-1]
+
+    @pytest.mark.asyncio
+    async def test_release_claim_of_another_admin(self, mock_db, mock_ticket):
+        repo = TicketRepository(mock_db)
+        mock_db.execute.return_value.rowcount = 0
+
+        assert await repo.release_claim(mock_ticket.id, uuid4()) is False
+        assert "tickets.claimed_by =" in str(mock_db.execute.call_args.args[0])
+
+    @pytest.mark.asyncio
+    async def test_stream_tickets_reads_stored_seat_names(self, mock_db):
+        repo = TicketRepository(mock_db)
+        batch = [{"id": uuid4(), "seat_name": "A1"}]
+
+        async def stream(db, query):
+            yield batch
+
+        with patch("server.repositories.ticket.stream_dicts", MagicMock(side_effect=stream)) as stream_dicts:
+            batches = [rows async for rows in repo.stream_tickets(datetime(2025, 3, 1), None)]
+
+        assert batches == [batch]
+        sql = str(stream_dicts.call_args.args[1])
+        assert "tickets.seat_id, tickets.seat_name" in sql
+        assert "JOIN" not in sql and "tickets.made_on >=" in sql